@@ -1,4 +1,18 @@
-from ._internal.exceptions import BlindPayError
+from ._internal.cache_backend import CacheBackend, MemoryCache, SqliteCache
+from ._internal.circuit_breaker import CircuitBreaker
+from ._internal.coalescing import CoalescePolicy
+from ._internal.concurrency import AdaptiveConcurrencyLimiter
+from ._internal.exceptions import BlindPayApiError, BlindPayError
+from ._internal.fx_cache import FxRateCache
+from ._internal.fx_estimator import FxEstimator
+from ._internal.hedging import HedgePolicy
+from ._internal.http_cache import HttpCache
+from ._internal.mirror import LocalMirror
+from ._internal.quote_cache import QuoteCache
+from ._internal.rate_limit import RateLimit, RateLimiter
+from ._internal.reference_cache import ReferenceDataCache
+from ._internal.response_cache import ResponseCache
+from ._internal.retry import RetryPolicy
 from ._version import __version__ as __version__
 from .client import BlindPay, BlindPaySync
 from .types import (
@@ -35,6 +49,24 @@ __all__ = [
     "BlindPay",
     "BlindPaySync",
     "BlindPayError",
+    "BlindPayApiError",
+    "RetryPolicy",
+    "RateLimit",
+    "RateLimiter",
+    "AdaptiveConcurrencyLimiter",
+    "CircuitBreaker",
+    "HedgePolicy",
+    "CoalescePolicy",
+    "LocalMirror",
+    "ReferenceDataCache",
+    "QuoteCache",
+    "FxRateCache",
+    "FxEstimator",
+    "HttpCache",
+    "CacheBackend",
+    "MemoryCache",
+    "SqliteCache",
+    "ResponseCache",
     "AccountClass",
     "AipriseDocumentType",
     "ApprovalRate",
@@ -1,4 +1,4 @@
-from typing import Any, Mapping, Optional, Protocol
+from typing import Any, AsyncIterator, Iterator, Mapping, Optional, Protocol
 
 from ..types import BlindpayApiResponse
 
@@ -13,8 +13,10 @@ class InternalApiClient(Protocol):
         """Make a GET request"""
         ...
 
-    async def post(self, path: str, body: Mapping[str, Any]) -> BlindpayApiResponse[Any]:
-        """Make a POST request"""
+    async def post(
+        self, path: str, body: Mapping[str, Any], idempotency_key: Optional[str] = None
+    ) -> BlindpayApiResponse[Any]:
+        """Make a POST request, sending `idempotency_key` as the Idempotency-Key header when given"""
         ...
 
     async def put(self, path: str, body: Mapping[str, Any]) -> BlindpayApiResponse[Any]:
@@ -29,6 +31,10 @@ class InternalApiClient(Protocol):
         """Make a DELETE request"""
         ...
 
+    def stream(self, path: str) -> AsyncIterator[Any]:
+        """Make a GET request and iterate over the elements of the JSON array it returns as they arrive"""
+        ...
+
 
 class InternalApiClientSync(Protocol):
     """Synchronous version of InternalApiClient"""
@@ -37,8 +43,10 @@ class InternalApiClientSync(Protocol):
         """Make a GET request"""
         ...
 
-    def post(self, path: str, body: Mapping[str, Any]) -> BlindpayApiResponse[Any]:
-        """Make a POST request"""
+    def post(
+        self, path: str, body: Mapping[str, Any], idempotency_key: Optional[str] = None
+    ) -> BlindpayApiResponse[Any]:
+        """Make a POST request, sending `idempotency_key` as the Idempotency-Key header when given"""
         ...
 
     def put(self, path: str, body: Mapping[str, Any]) -> BlindpayApiResponse[Any]:
@@ -52,3 +60,7 @@ class InternalApiClientSync(Protocol):
     def delete(self, path: str, body: Optional[Mapping[str, Any]] = None) -> BlindpayApiResponse[Any]:
         """Make a DELETE request"""
         ...
+
+    def stream(self, path: str) -> Iterator[Any]:
+        """Make a GET request and iterate over the elements of the JSON array it returns as they arrive"""
+        ...
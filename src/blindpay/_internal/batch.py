@@ -0,0 +1,55 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, Iterable, List, TypeVar
+
+from ..types import BlindpayApiResponse
+from .exceptions import BlindPayError
+
+T = TypeVar("T")
+
+# Well under the default pool of 100 connections, so a batch leaves room for other requests.
+DEFAULT_BATCH_CONCURRENCY = 10
+
+
+def _check_concurrency(concurrency: int) -> None:
+    if concurrency < 1:
+        raise BlindPayError("concurrency must be at least 1")
+
+
+async def get_many(
+    get: Callable[[str], Awaitable[BlindpayApiResponse[T]]], ids: Iterable[str], concurrency: int
+) -> List[BlindpayApiResponse[T]]:
+    """
+    Calls `get` once per distinct id, with at most `concurrency` calls in flight.
+
+    Returns:
+        One response per id of `ids`, in the same order; a repeated id gets the same response
+    """
+    _check_concurrency(concurrency)
+    ids = list(ids)
+    pending = iter(dict.fromkeys(ids))
+    results: Dict[str, BlindpayApiResponse[T]] = {}
+
+    # A fixed set of workers pulling ids, rather than a task per id, keeps memory flat for large batches.
+    async def worker() -> None:
+        for id in pending:
+            results[id] = await get(id)
+
+    async with asyncio.TaskGroup() as workers:
+        for _ in range(min(concurrency, len(ids))):
+            workers.create_task(worker())
+    return [results[id] for id in ids]
+
+
+def get_many_sync(
+    get: Callable[[str], BlindpayApiResponse[T]], ids: Iterable[str], concurrency: int
+) -> List[BlindpayApiResponse[T]]:
+    """Sync version of get_many(), calling `get` from a thread pool"""
+    _check_concurrency(concurrency)
+    ids = list(ids)
+    unique = list(dict.fromkeys(ids))
+    if not unique:
+        return []
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(unique)), thread_name_prefix="blindpay-batch") as pool:
+        results = dict(zip(unique, pool.map(get, unique), strict=True))
+    return [results[id] for id in ids]
@@ -0,0 +1,282 @@
+import copy
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Protocol, Tuple, Union
+
+from .exceptions import BlindPayError
+
+
+class CacheBackend(Protocol):
+    """
+    Storage for cached API data, shared by the SDK caches that accept a `backend`.
+
+    Values are JSON-compatible: what the API returned, or lists and dicts of it. None is never stored, so `get()`
+    returning None means a miss.
+    """
+
+    def get(self, key: str) -> Optional[Any]:
+        """The value stored under `key`, or None if there is none or it expired"""
+        ...
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Stores `value` under `key` for `ttl` seconds, or for the backend's default TTL if None"""
+        ...
+
+    def delete(self, key: str) -> None:
+        """Drops the entry of `key`, if there is one"""
+        ...
+
+    def delete_prefix(self, prefix: str) -> None:
+        """Drops every entry whose key starts with `prefix`"""
+        ...
+
+    def clear(self) -> None:
+        """Drops every entry of the backend"""
+        ...
+
+    def stats(self) -> Dict[str, int]:
+        """Counts of hits, misses, evictions and expirations, and the number and total size of the entries"""
+        ...
+
+
+def _encoded_size(value: Any) -> int:
+    return len(json.dumps(value, separators=(",", ":")).encode())
+
+
+def _expires_at(ttl: Optional[float], default_ttl: Optional[float]) -> float:
+    ttl = ttl if ttl is not None else default_ttl
+    return time.time() + ttl if ttl is not None else math.inf
+
+
+class MemoryCache:
+    """
+    In-memory LRU cache backend.
+
+    Entries expire after their TTL. Once there are more than `max_entries`, or their JSON-encoded size exceeds
+    `max_bytes`, the least recently read entries are evicted.
+
+    Args:
+        max_entries: Entries kept at most
+        max_bytes: Total JSON-encoded size of the entries kept at most, or None for no limit
+        default_ttl: Seconds an entry is kept when `set()` is not given a TTL, or None to keep it until evicted
+    """
+
+    def __init__(self, max_entries: int = 1000, max_bytes: Optional[int] = None, default_ttl: Optional[float] = None):
+        if max_entries < 1:
+            raise BlindPayError("Cache max_entries must be at least 1")
+        if max_bytes is not None and max_bytes < 1:
+            raise BlindPayError("Cache max_bytes must be at least 1")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._bytes = 0
+        # key -> (expires_at, encoded size, value)
+        self._entries: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.time():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry[2])
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        size = _encoded_size(value)
+        with self._lock:
+            self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._entries[key] = (_expires_at(ttl, self.default_ttl), size, copy.deepcopy(value))
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+# Seconds between updates of an entry's read time. Reads only take the write lock when it is older than that.
+_READ_AT_RESOLUTION = 60.0
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blindpay_cache (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL,
+    read_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS blindpay_cache_read_at ON blindpay_cache (read_at);
+CREATE INDEX IF NOT EXISTS blindpay_cache_expires_at ON blindpay_cache (expires_at);
+"""
+
+
+class SqliteCache:
+    """
+    Cache backend stored in a SQLite file, which every worker process on a host can open and share.
+
+    The database runs in WAL mode, so reads do not wait for a process writing. Expired entries are purged on
+    writes, and the least recently read entries are evicted once there are more than `max_entries`. The read time
+    of an entry is only updated once it is a minute old, so most hits do not write; the eviction order is that of
+    the last read to within a minute. Hits, misses, evictions and expirations are counted per process; the size
+    is that of the shared file.
+
+    Args:
+        path: File of the cache database, created if missing
+        max_entries: Entries kept at most
+        default_ttl: Seconds an entry is kept when `set()` is not given a TTL, or None to keep it until evicted
+        timeout: Seconds to wait for another process holding a write lock
+    """
+
+    def __init__(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        max_entries: int = 10_000,
+        default_ttl: Optional[float] = None,
+        timeout: float = 5.0,
+    ):
+        if max_entries < 1:
+            raise BlindPayError("Cache max_entries must be at least 1")
+
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        # Autocommit mode, so writes can take the database lock up front with BEGIN IMMEDIATE.
+        self._db = sqlite3.connect(os.fspath(path), timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SQLITE_SCHEMA)
+
+    def __enter__(self) -> "SqliteCache":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, expires_at, read_at FROM blindpay_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[1] is not None and row[1] <= now:
+                self._db.execute("DELETE FROM blindpay_cache WHERE key = ? AND expires_at <= ?", (key, now))
+                self.expirations += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            if now - row[2] >= _READ_AT_RESOLUTION:
+                self._db.execute("UPDATE blindpay_cache SET read_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        encoded = json.dumps(value, separators=(",", ":"))
+        expires_at = _expires_at(ttl, self.default_ttl)
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO blindpay_cache (key, value, size, expires_at, read_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, encoded, len(encoded.encode()), expires_at if expires_at != math.inf else None, now),
+                )
+                purged = self._db.execute("DELETE FROM blindpay_cache WHERE expires_at <= ?", (now,))
+                self.expirations += purged.rowcount
+                evicted = self._db.execute(
+                    "DELETE FROM blindpay_cache WHERE key IN "
+                    "(SELECT key FROM blindpay_cache ORDER BY read_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+                self.evictions += evicted.rowcount
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM blindpay_cache WHERE key = ?", (key,))
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM blindpay_cache WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM blindpay_cache")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            size, total_bytes = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blindpay_cache"
+            ).fetchone()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": size,
+                "bytes": total_bytes,
+            }
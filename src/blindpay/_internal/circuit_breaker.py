@@ -0,0 +1,116 @@
+import threading
+import time
+from typing import Callable, Dict, FrozenSet, Literal, Optional
+
+from .endpoints import path_template
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+CIRCUIT_OPEN_ERROR_CODE = "circuit_open"
+
+# Statuses that say the endpoint itself is unhealthy. 429 and other 4xx are about the caller.
+FAILURE_STATUS_CODES: FrozenSet[int] = frozenset({500, 502, 503, 504})
+
+
+class _Circuit:
+    def __init__(self) -> None:
+        self.state: CircuitState = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to an endpoint that keeps failing, so it cannot tie up connections that
+    healthy endpoints need.
+
+    Each endpoint, keyed by its path template such as `/instances/{id}/payouts/evm`, has its own
+    circuit. After `failure_threshold` consecutive failures (connection errors, timeouts or 5xx
+    responses) the circuit opens and calls fail fast with an error whose `code` is `circuit_open`.
+    Once `reset_timeout` seconds have passed it turns half-open and lets `half_open_max_calls`
+    probe requests through: a success closes it again, a failure reopens it.
+
+    Args:
+        failure_threshold: Consecutive failures that open a circuit
+        reset_timeout: Seconds an open circuit waits before letting probes through
+        half_open_max_calls: Concurrent probe requests allowed while half-open
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._circuits: Dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def _circuit(self, path: str) -> _Circuit:
+        return self._circuits.setdefault(path_template(path), _Circuit())
+
+    def _refresh(self, circuit: _Circuit) -> None:
+        if circuit.state == "open" and self._clock() - circuit.opened_at >= self.reset_timeout:
+            circuit.state = "half_open"
+            circuit.probes = 0
+
+    def state(self, path: str) -> CircuitState:
+        """State of the circuit for `path`, given either as a request path or as its template"""
+        with self._lock:
+            circuit = self._circuit(path)
+            self._refresh(circuit)
+            return circuit.state
+
+    def allow(self, path: str) -> bool:
+        """Whether a request to `path` may be sent; every allowed request must be followed by record()"""
+        with self._lock:
+            circuit = self._circuit(path)
+            self._refresh(circuit)
+            if circuit.state == "closed":
+                return True
+            if circuit.state == "half_open" and circuit.probes < self.half_open_max_calls:
+                circuit.probes += 1
+                return True
+            return False
+
+    def record(self, path: str, success: Optional[bool]) -> None:
+        """
+        Records the outcome of a request allowed by allow().
+
+        Args:
+            path: Request path
+            success: True or False for a healthy or failed endpoint, None for outcomes that say
+                nothing about its health, such as a 4xx response or a cancelled request
+        """
+        with self._lock:
+            circuit = self._circuit(path)
+            if circuit.state == "half_open":
+                circuit.probes = max(0, circuit.probes - 1)
+
+            if success is None:
+                return
+            if success:
+                # An open circuit only closes through a half-open probe, not a straggler from before it opened.
+                if circuit.state != "open":
+                    circuit.state = "closed"
+                    circuit.failures = 0
+                return
+
+            circuit.failures += 1
+            if circuit.state == "half_open" or circuit.failures >= self.failure_threshold:
+                circuit.state = "open"
+                circuit.opened_at = self._clock()
+
+
+def response_health(status_code: int) -> Optional[bool]:
+    """What a response status says about the endpoint's health, as expected by CircuitBreaker.record()"""
+    if status_code in FAILURE_STATUS_CODES:
+        return False
+    if status_code == 429:
+        return None
+    return True
@@ -0,0 +1,23 @@
+from typing import Collection
+
+from .endpoints import path_template
+
+
+class CoalescePolicy:
+    """
+    Lets concurrent identical GETs share one request.
+
+    While a GET is in flight, the same GET (same path and query) from another coroutine waits for it and
+    receives a copy of its result instead of sending a request of its own. A call that starts after the
+    shared request was sent can therefore see a result that predates a write it just made; exclude the
+    endpoints where that matters.
+
+    Args:
+        exclude: Path templates, e.g. "/instances/{id}/customers/{id}", whose GETs are always sent on their own
+    """
+
+    def __init__(self, exclude: Collection[str] = ()):
+        self.exclude = frozenset(exclude)
+
+    def applies_to(self, path: str) -> bool:
+        return path_template(path) not in self.exclude
@@ -0,0 +1,121 @@
+import asyncio
+import time
+from collections import deque
+from typing import Callable, Deque, Optional
+
+from .exceptions import BlindPayError
+
+# Responses that mean the API is shedding load rather than rejecting the request itself.
+OVERLOAD_STATUS_CODES = frozenset({429, 503})
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Caps the number of in-flight requests with a limit that adapts to how the API is coping (AIMD).
+
+    Every healthy response grows the limit additively, by about `increase` per limit's worth of
+    responses. An overloaded response (429, 503, a timeout, or a latency above `latency_tolerance`
+    times the running average) multiplies it by `decrease_factor`. Only requests started after the
+    previous cut can cut again, so one burst of 429s shrinks the limit once.
+
+    Args:
+        initial_limit: Concurrent requests allowed at start
+        min_limit: The limit never drops below this
+        max_limit: The limit never grows above this
+        increase: Additive step, in requests, per round trip of healthy responses
+        decrease_factor: Multiplier applied to the limit on overload
+        latency_tolerance: Multiple of the average latency that counts as a latency spike
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise BlindPayError("Concurrency limits must satisfy 1 <= min_limit <= initial_limit <= max_limit")
+        if not 0 < decrease_factor < 1:
+            raise BlindPayError("decrease_factor must be between 0 and 1")
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self._clock = clock
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+        self._average_latency: Optional[float] = None
+        self._last_decrease_at = float("-inf")
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self) -> float:
+        """Waits for a free slot and returns the time the request started, to be passed to release()"""
+        while self._in_flight >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # A slot handed to a cancelled waiter would otherwise go unused until the next release.
+                if waiter.done() and not waiter.cancelled():
+                    self._wake_waiters()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+        self._in_flight += 1
+        return self._clock()
+
+    def release(self, started_at: float, *, overloaded: Optional[bool] = False) -> None:
+        """
+        Frees the slot taken at `started_at` and adapts the limit to how the request went.
+
+        Args:
+            started_at: What acquire() returned
+            overloaded: Whether the response said the API is overloaded, None for requests that ended without
+                an outcome, such as a cancelled one, which free the slot and leave the limit as it is
+        """
+        self._in_flight -= 1
+        if overloaded is None:
+            self._wake_waiters()
+            return
+        latency = self._clock() - started_at
+
+        average = self._average_latency
+        spike = average is not None and latency > average * self.latency_tolerance
+        if not overloaded:
+            # Spikes still feed the average, so a lasting slowdown becomes the new normal instead of
+            # pinning the limit at its minimum.
+            self._average_latency = latency if average is None else 0.9 * average + 0.1 * latency
+
+        if overloaded or spike:
+            if started_at >= self._last_decrease_at:
+                self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+                self._last_decrease_at = self._clock()
+        else:
+            self._limit = min(float(self.max_limit), self._limit + self.increase / self._limit)
+
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        free = self.limit - self._in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
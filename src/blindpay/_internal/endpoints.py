@@ -0,0 +1,34 @@
+from typing import List
+
+
+def path_segments(path: str) -> List[str]:
+    return [segment for segment in path.split("?", 1)[0].split("/") if segment]
+
+
+def endpoint_family(path: str) -> str:
+    """
+    Groups a request path by the API resource it targets, ignoring the instance prefix.
+
+    `/instances/in_123/payouts/evm` and `/e/payouts/pa_123` both belong to `payouts`,
+    `/instances/in_123/customers/cu_123/bank-accounts` belongs to `customers`.
+    """
+    segments = path_segments(path)
+    if segments and segments[0] == "e":
+        segments = segments[1:]
+    if len(segments) >= 2 and segments[0] == "instances":
+        segments = segments[2:]
+    return segments[0] if segments else "instances"
+
+
+def _is_identifier(segment: str) -> bool:
+    prefix, _, rest = segment.partition("_")
+    return any(c.isdigit() for c in segment) or (prefix.isalpha() and prefix.islower() and rest.isalnum())
+
+
+def path_template(path: str) -> str:
+    """
+    Replaces the identifiers in a request path with `{id}`, so calls to the same endpoint share a key.
+
+    `/instances/in_123/payouts/evm` becomes `/instances/{id}/payouts/evm`.
+    """
+    return "/" + "/".join("{id}" if _is_identifier(segment) else segment for segment in path_segments(path))
@@ -0,0 +1,98 @@
+from typing import Dict, Literal, Optional
+
+# How the API documents each error `code`: "retryable" errors can be retried as is, "terminal" ones never
+# succeed, and "actionable" ones succeed only once the caller fixed something, e.g. funded a balance.
+ErrorRetryClass = Literal["retryable", "terminal", "actionable"]
+
+ERROR_CODE_RETRY_CLASSES: Dict[str, ErrorRetryClass] = {
+    "AUTH_EMAIL_ALREADY_REGISTERED": "terminal",
+    "AUTH_FORBIDDEN": "terminal",
+    "AUTH_IP_BLOCKED": "terminal",
+    "AUTH_RATE_LIMITED": "retryable",
+    "AUTH_SERVICE_UNAVAILABLE": "retryable",
+    "AUTH_TOKEN_INVALID": "actionable",
+    "AUTH_UNAUTHORIZED": "actionable",
+    "BANK_ACCOUNTS_INCOMPLETE": "actionable",
+    "BANK_ACCOUNTS_INVALID_BANK_CODE": "actionable",
+    "BANK_ACCOUNTS_INVALID_ROUTING": "actionable",
+    "BANK_ACCOUNTS_NOT_APPROVED": "actionable",
+    "BANK_ACCOUNTS_NOT_FOUND": "actionable",
+    "BANK_ACCOUNTS_PARTNER_NOT_SUPPORTED": "terminal",
+    "BANK_ACCOUNTS_RTP_NOT_SUPPORTED": "terminal",
+    "BILLING_INVOICE_NOT_FOUND": "actionable",
+    "BILLING_INVOICE_NOT_PAYABLE": "terminal",
+    "BILLING_NOT_AVAILABLE": "terminal",
+    "BLOCKCHAIN_CALL_FAILED": "retryable",
+    "BLOCKCHAIN_NETWORK_NOT_SUPPORTED": "terminal",
+    "BLOCKCHAIN_TOKEN_NOT_SUPPORTED": "actionable",
+    "BLOCKCHAIN_TX_FAILED": "retryable",
+    "COMPLIANCE_RFI_INVALID": "actionable",
+    "COMPLIANCE_RFI_IN_PROGRESS": "actionable",
+    "CUSTOMERS_ALREADY_APPROVED": "terminal",
+    "CUSTOMERS_BUSINESS_ENHANCED_NOT_AVAILABLE": "terminal",
+    "CUSTOMERS_COUNTRY_NOT_SUPPORTED": "terminal",
+    "CUSTOMERS_ENHANCED_KYC_REQUIRED": "actionable",
+    "CUSTOMERS_ID_DOCUMENT_INVALID": "actionable",
+    "CUSTOMERS_INVALID_DATA": "actionable",
+    "CUSTOMERS_INVALID_PHONE": "actionable",
+    "CUSTOMERS_INVALID_TAX_ID": "actionable",
+    "CUSTOMERS_KYC_NOT_APPROVED": "actionable",
+    "CUSTOMERS_NOT_FOUND": "actionable",
+    "CUSTOMERS_ONBOARDING_INCOMPLETE": "actionable",
+    "DATA_INTEGRITY_ERROR": "terminal",
+    "FEES_NOT_FOUND": "actionable",
+    "FEES_PARTNER_FEE_EXCEEDED": "actionable",
+    "FILES_ANALYSIS_FAILED": "retryable",
+    "FILES_EMPTY": "actionable",
+    "FILES_TOO_LARGE": "actionable",
+    "FILES_TYPE_NOT_ALLOWED": "actionable",
+    "FILES_UNREADABLE": "actionable",
+    "INSTANCES_BLOCKED": "terminal",
+    "INSTANCES_LIMIT_REACHED": "terminal",
+    "INSTANCES_NOT_FOUND": "actionable",
+    "INTERNAL_ERROR": "retryable",
+    "LIMITS_AMOUNT_OUT_OF_RANGE": "actionable",
+    "LIMITS_VOLUME_EXCEEDED": "actionable",
+    "PAYINS_ALREADY_TERMINAL": "terminal",
+    "PAYINS_METHOD_NOT_SUPPORTED": "terminal",
+    "PAYINS_NOT_FOUND": "actionable",
+    "PAYINS_TAX_ID_REQUIRED": "actionable",
+    "PAYOUTS_ALLOWANCE_NOT_CONFIRMED": "retryable",
+    "PAYOUTS_AMOUNT_BELOW_MINIMUM": "actionable",
+    "PAYOUTS_DOCUMENTS_NOT_ACCEPTED": "terminal",
+    "PAYOUTS_INSUFFICIENT_BALANCE": "actionable",
+    "PAYOUTS_NOT_FOUND": "actionable",
+    "QUOTES_ALREADY_USED": "actionable",
+    "QUOTES_EXPIRED": "actionable",
+    "QUOTES_INSUFFICIENT_LIQUIDITY": "actionable",
+    "QUOTES_INVALID_STATE": "actionable",
+    "QUOTES_NOT_FOUND": "actionable",
+    "QUOTES_OTC_NOT_SUPPORTED": "actionable",
+    "QUOTES_RATE_UNAVAILABLE": "retryable",
+    "REQUEST_REJECTED": "actionable",
+    "TOS_ALREADY_ACCEPTED": "terminal",
+    "TOS_NOT_ACCEPTED": "actionable",
+    "TOS_NOT_FOUND": "actionable",
+    "TRANSFERS_NOT_ENABLED": "terminal",
+    "VALIDATION_FAILED": "actionable",
+    "VALIDATION_INVALID_REQUEST": "actionable",
+    "VALIDATION_MISSING_BODY": "actionable",
+    "VALIDATION_MISSING_REQUIRED_FIELDS": "actionable",
+    "VIRTUAL_ACCOUNTS_DISABLED": "terminal",
+    "VIRTUAL_ACCOUNTS_DOCUMENTS_REQUIRED": "actionable",
+    "VIRTUAL_ACCOUNTS_NOT_APPROVED": "actionable",
+    "VIRTUAL_ACCOUNTS_NOT_FOUND": "actionable",
+    "VIRTUAL_ACCOUNTS_PROVISION_FAILED": "retryable",
+    "VIRTUAL_ACCOUNTS_REGION_NOT_SUPPORTED": "terminal",
+    "WALLETS_ATTACHED_TO_VIRTUAL_ACCOUNT": "terminal",
+    "WALLETS_BALANCE_UNAVAILABLE": "retryable",
+    "WALLETS_NOT_FOUND": "actionable",
+    "WEBHOOKS_LIMIT_REACHED": "terminal",
+    "WEBHOOKS_SIGNATURE_INVALID": "terminal",
+    "WEBHOOKS_URL_INVALID": "actionable",
+}
+
+
+def error_retry_class(code: Optional[str]) -> Optional[ErrorRetryClass]:
+    """The documented retry class of an error `code`, or None for a missing or unknown code"""
+    return ERROR_CODE_RETRY_CLASSES.get(code) if code is not None else None
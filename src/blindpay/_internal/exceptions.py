@@ -1,6 +1,22 @@
+from ..types import ErrorResponse
+
+
 class BlindPayError(Exception):
     """BlindPay SDK error"""
 
     def __init__(self, message: str):
         super().__init__(message)
         self.name = "BlindpayError"
+
+
+class BlindPayApiError(BlindPayError):
+    """
+    Error result of a request, raised by helpers such as `list_all()` that cannot return it.
+
+    Args:
+        error: The error result, with the same fields as `response["error"]`
+    """
+
+    def __init__(self, error: ErrorResponse):
+        super().__init__(error["message"])
+        self.error = error
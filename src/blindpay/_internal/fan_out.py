@@ -0,0 +1,189 @@
+import asyncio
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Literal,
+    Mapping,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from ..types import BlindpayApiResponse
+from .exceptions import BlindPayApiError, BlindPayError
+
+CustomerResource = Literal[
+    "bank_accounts", "blockchain_wallets", "offramp_wallets", "custodial_wallets", "virtual_accounts"
+]
+
+CUSTOMER_RESOURCES: Tuple[CustomerResource, ...] = (
+    "bank_accounts",
+    "blockchain_wallets",
+    "offramp_wallets",
+    "custodial_wallets",
+    "virtual_accounts",
+)
+
+# Offramp wallets hang off bank accounts, so they are listed once per bank account of the customer.
+NESTED_RESOURCES: Tuple[CustomerResource, ...] = ("offramp_wallets",)
+
+CustomerResourceItems = Tuple[str, CustomerResource, List[Any]]
+
+# A customer as yielded by `customers.list_all()`, or just its id.
+CustomerRef = Union[str, Mapping[str, Any]]
+
+ListForCustomer = Callable[[str], Awaitable[BlindpayApiResponse[Any]]]
+ListForBankAccount = Callable[[str, str], Awaitable[BlindpayApiResponse[Any]]]
+ListForCustomerSync = Callable[[str], BlindpayApiResponse[Any]]
+ListForBankAccountSync = Callable[[str, str], BlindpayApiResponse[Any]]
+
+
+def _customer_id(customer: CustomerRef) -> str:
+    return customer if isinstance(customer, str) else str(customer["id"])
+
+
+def _check_options(resources: Sequence[CustomerResource], concurrency: int) -> None:
+    for resource in resources:
+        if resource not in CUSTOMER_RESOURCES:
+            raise BlindPayError(f"Unknown customer resource {resource!r}, use one of {', '.join(CUSTOMER_RESOURCES)}")
+    if concurrency < 1:
+        raise BlindPayError("concurrency must be at least 1")
+
+
+def _direct_resources(resources: Sequence[CustomerResource]) -> List[CustomerResource]:
+    """Resources listed by customer id, including the bank accounts that nested resources are listed under"""
+    direct = [resource for resource in resources if resource not in NESTED_RESOURCES]
+    if "bank_accounts" not in direct and any(resource in NESTED_RESOURCES for resource in resources):
+        direct.append("bank_accounts")
+    return direct
+
+
+def _items(response: BlindpayApiResponse[Any]) -> List[Any]:
+    if response["error"] is not None:
+        raise BlindPayApiError(response["error"])
+    data = response["data"]
+    # Virtual accounts come wrapped in an object, the other lists come bare.
+    items: List[Any] = data["data"] if isinstance(data, dict) else data
+    return items
+
+
+def _results(
+    customer_id: str, resources: Sequence[CustomerResource], items: Dict[CustomerResource, List[Any]]
+) -> List[CustomerResourceItems]:
+    return [(customer_id, resource, items[resource]) for resource in resources]
+
+
+async def _list_customer(
+    customer_id: str,
+    resources: Sequence[CustomerResource],
+    lists: Mapping[CustomerResource, ListForCustomer],
+    list_offramp_wallets: ListForBankAccount,
+) -> List[CustomerResourceItems]:
+    direct = _direct_resources(resources)
+    responses = await asyncio.gather(*(lists[resource](customer_id) for resource in direct))
+    items = {resource: _items(response) for resource, response in zip(direct, responses, strict=True)}
+    if "offramp_wallets" in resources:
+        wallets = await asyncio.gather(
+            *(list_offramp_wallets(customer_id, bank_account["id"]) for bank_account in items["bank_accounts"])
+        )
+        items["offramp_wallets"] = [wallet for response in wallets for wallet in _items(response)]
+    return _results(customer_id, resources, items)
+
+
+def _list_customer_sync(
+    customer_id: str,
+    resources: Sequence[CustomerResource],
+    lists: Mapping[CustomerResource, ListForCustomerSync],
+    list_offramp_wallets: ListForBankAccountSync,
+) -> List[CustomerResourceItems]:
+    items = {resource: _items(lists[resource](customer_id)) for resource in _direct_resources(resources)}
+    if "offramp_wallets" in resources:
+        items["offramp_wallets"] = [
+            wallet
+            for bank_account in items["bank_accounts"]
+            for wallet in _items(list_offramp_wallets(customer_id, bank_account["id"]))
+        ]
+    return _results(customer_id, resources, items)
+
+
+async def _aiter(customers: Union[AsyncIterable[CustomerRef], Iterable[CustomerRef]]) -> AsyncIterator[CustomerRef]:
+    if isinstance(customers, AsyncIterable):
+        async for customer in customers:
+            yield customer
+    else:
+        for customer in customers:
+            yield customer
+
+
+async def fan_out(
+    customers: Union[AsyncIterable[CustomerRef], Iterable[CustomerRef]],
+    resources: Sequence[CustomerResource],
+    concurrency: int,
+    lists: Mapping[CustomerResource, ListForCustomer],
+    list_offramp_wallets: ListForBankAccount,
+) -> AsyncGenerator[CustomerResourceItems, None]:
+    """
+    Lists `resources` for every customer, with up to `concurrency` customers in flight, and yields
+    `(customer_id, resource, items)` in the order of `customers`.
+
+    Customers are read from `customers` only as slots free up, so memory stays bounded by `concurrency`.
+
+    Raises:
+        BlindPayApiError: If a list cannot be fetched
+    """
+    _check_options(resources, concurrency)
+    in_flight: Deque["asyncio.Future[List[CustomerResourceItems]]"] = deque()
+    try:
+        async for customer in _aiter(customers):
+            in_flight.append(
+                asyncio.ensure_future(_list_customer(_customer_id(customer), resources, lists, list_offramp_wallets))
+            )
+            if len(in_flight) >= concurrency:
+                for result in await in_flight.popleft():
+                    yield result
+        while in_flight:
+            for result in await in_flight.popleft():
+                yield result
+    finally:
+        for pending in in_flight:
+            pending.cancel()
+        # Collects the cancellations, and the errors of lists that failed meanwhile, so none goes unretrieved.
+        await asyncio.gather(*in_flight, return_exceptions=True)
+
+
+def fan_out_sync(
+    customers: Iterable[CustomerRef],
+    resources: Sequence[CustomerResource],
+    concurrency: int,
+    lists: Mapping[CustomerResource, ListForCustomerSync],
+    list_offramp_wallets: ListForBankAccountSync,
+) -> Generator[CustomerResourceItems, None, None]:
+    """Sync version of fan_out(), listing customers from a thread pool"""
+    _check_options(resources, concurrency)
+    in_flight: Deque["Future[List[CustomerResourceItems]]"] = deque()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="blindpay-fan-out") as pool:
+        try:
+            for customer in customers:
+                in_flight.append(
+                    pool.submit(_list_customer_sync, _customer_id(customer), resources, lists, list_offramp_wallets)
+                )
+                if len(in_flight) >= concurrency:
+                    yield from in_flight.popleft().result()
+            while in_flight:
+                yield from in_flight.popleft().result()
+        finally:
+            for pending in in_flight:
+                pending.cancel()
+            # Lets the lists already running finish before the pool shuts down, their errors discarded.
+            wait(in_flight)
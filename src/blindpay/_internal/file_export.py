@@ -0,0 +1,307 @@
+import asyncio
+import csv
+import io
+import json
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    Awaitable,
+    BinaryIO,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    get_args,
+    get_type_hints,
+)
+
+from typing_extensions import is_typeddict
+
+from ..types import BlindpayApiResponse, PaginationLimit
+from .exceptions import BlindPayApiError, BlindPayError
+from .pagination import iter_pages, iter_pages_sync, prefetch_pages, prefetch_pages_sync
+
+ExportFormat = Literal["ndjson", "csv"]
+
+ExportPath = Union[str, "os.PathLike[str]"]
+
+PAGE_LIMITS: Tuple[PaginationLimit, ...] = ("10", "50", "100", "200", "500", "1000")
+
+FetchChunk = Callable[[int, int], Awaitable[BlindpayApiResponse[Any]]]
+FetchChunkSync = Callable[[int, int], BlindpayApiResponse[Any]]
+
+
+def record_columns(record_type: Any) -> List[str]:
+    """
+    Column names of a record TypedDict, with each `tracking_*` sub-object expanded into one column per field,
+    e.g. `tracking_payment` becomes `tracking_payment_step`, `tracking_payment_provider_name`, ...
+    """
+    columns: List[str] = []
+    for key, hint in get_type_hints(record_type).items():
+        nested = next((t for t in (hint, *get_args(hint)) if is_typeddict(t)), None)
+        if key.startswith("tracking_") and nested is not None:
+            columns.extend(f"{key}_{field}" for field in get_type_hints(nested))
+        else:
+            columns.append(key)
+    return columns
+
+
+def flatten_record(record: Mapping[str, Any]) -> Dict[str, Any]:
+    """Moves the fields of each `tracking_*` sub-object up into the record, prefixed with the sub-object's name"""
+    flat: Dict[str, Any] = {}
+    for key, value in record.items():
+        if key.startswith("tracking_") and (value is None or isinstance(value, dict)):
+            for field, field_value in (value or {}).items():
+                flat[f"{key}_{field}"] = field_value
+        else:
+            flat[key] = value
+    return flat
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    return value
+
+
+class ExportFile:
+    """
+    Output file of an export, plus the checkpoint that lets an interrupted export resume where it stopped.
+
+    The checkpoint is a small JSON state file, replaced atomically after every chunk once the chunk is on disk.
+    It records how many records and bytes were written and the cursor to continue from. On resume the output is
+    truncated back to the checkpoint, dropping any chunk that was only partly written.
+    """
+
+    def __init__(
+        self,
+        path: ExportPath,
+        format: ExportFormat,
+        job: Mapping[str, Any],
+        columns: Sequence[str],
+        state_path: Optional[ExportPath] = None,
+    ):
+        if format not in ("ndjson", "csv"):
+            raise BlindPayError(f"Unsupported export format {format!r}, use 'ndjson' or 'csv'")
+
+        self.path = os.fspath(path)
+        self.format = format
+        self.state_path = os.fspath(state_path) if state_path is not None else f"{self.path}.state"
+        self.columns = list(columns)
+        self._job = {**job, "format": format}
+
+        state = self._load_state()
+        self.records: int = state["records"] if state else 0
+        self.starting_after: Optional[str] = state["starting_after"] if state else None
+        self._size: int = state["size"] if state else 0
+        self._file: Optional[BinaryIO] = None
+
+    def __enter__(self) -> "ExportFile":
+        self._file = open(self.path, "r+b" if self._size else "wb")
+        self._file.truncate(self._size)
+        self._file.seek(self._size)
+        if self.format == "csv" and self._size == 0:
+            self._write(self._csv(header=True, rows=[]))
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _load_state(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.state_path) as f:
+                state: Dict[str, Any] = json.load(f)
+        except FileNotFoundError:
+            return None
+        if state.get("job") != self._job:
+            raise BlindPayError(
+                f"{self.state_path} belongs to a different export, delete it to start this one from scratch"
+            )
+        if not os.path.exists(self.path):
+            return None
+        return state
+
+    def _csv(self, *, header: bool, rows: Sequence[Mapping[str, Any]]) -> bytes:
+        text = io.StringIO()
+        writer = csv.DictWriter(text, fieldnames=self.columns, extrasaction="ignore", lineterminator="\n")
+        if header:
+            writer.writeheader()
+        writer.writerows({k: _csv_value(v) for k, v in row.items()} for row in rows)
+        return text.getvalue().encode()
+
+    def _write(self, data: bytes) -> None:
+        if self._file is None:
+            raise BlindPayError("Export file is not open")
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._size = self._file.tell()
+
+    def write(self, records: Sequence[Mapping[str, Any]], starting_after: Optional[str] = None) -> None:
+        """Appends a chunk of records and checkpoints the export past them"""
+        rows = [flatten_record(record) for record in records]
+        if self.format == "csv":
+            self._write(self._csv(header=False, rows=rows))
+        else:
+            self._write(b"".join(json.dumps(row, separators=(",", ":")).encode() + b"\n" for row in rows))
+
+        self.records += len(records)
+        if starting_after is not None:
+            self.starting_after = starting_after
+
+        state = {
+            "job": self._job,
+            "records": self.records,
+            "starting_after": self.starting_after,
+            "size": self._size,
+        }
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def finish(self) -> None:
+        """Removes the checkpoint of a completed export, so the next run starts a new one"""
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
+
+
+def _chunk_records(response: BlindpayApiResponse[Any]) -> List[Any]:
+    if response["error"] is not None:
+        raise BlindPayApiError(response["error"])
+    records: List[Any] = response["data"]
+    return records
+
+
+def _check_options(chunk_size: int, concurrency: int) -> None:
+    if chunk_size < 1:
+        raise BlindPayError("chunk_size must be a positive number of records")
+    if concurrency < 1:
+        raise BlindPayError("concurrency must be at least 1")
+
+
+def _page_limit(chunk_size: int) -> PaginationLimit:
+    limit = str(chunk_size)
+    for allowed in PAGE_LIMITS:
+        if allowed == limit:
+            return allowed
+    raise BlindPayError(f"chunk_size must be one of {', '.join(PAGE_LIMITS)} for an export that pages with a cursor")
+
+
+async def export_by_offset(output: ExportFile, fetch_chunk: FetchChunk, chunk_size: int, concurrency: int) -> int:
+    """
+    Writes every record returned by `fetch_chunk(offset, limit)` to `output`, with up to `concurrency` chunks
+    in flight. Chunks are written in order, and the export ends at the first chunk shorter than `chunk_size`.
+
+    Returns:
+        The number of records in the output
+    """
+    _check_options(chunk_size, concurrency)
+    in_flight: Deque["asyncio.Future[BlindpayApiResponse[Any]]"] = deque()
+    next_offset = output.records
+    with output:
+        try:
+            while True:
+                while len(in_flight) < concurrency:
+                    in_flight.append(asyncio.ensure_future(fetch_chunk(next_offset, chunk_size)))
+                    next_offset += chunk_size
+                records = _chunk_records(await in_flight.popleft())
+                if records:
+                    output.write(records)
+                if len(records) < chunk_size:
+                    break
+        finally:
+            for chunk in in_flight:
+                chunk.cancel()
+    output.finish()
+    return output.records
+
+
+def export_by_offset_sync(output: ExportFile, fetch_chunk: FetchChunkSync, chunk_size: int, concurrency: int) -> int:
+    """Sync version of export_by_offset(), fetching concurrent chunks from a thread pool"""
+    _check_options(chunk_size, concurrency)
+    in_flight: Deque["Future[BlindpayApiResponse[Any]]"] = deque()
+    next_offset = output.records
+    with output, ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="blindpay-export") as pool:
+        try:
+            while True:
+                while len(in_flight) < concurrency:
+                    in_flight.append(pool.submit(fetch_chunk, next_offset, chunk_size))
+                    next_offset += chunk_size
+                records = _chunk_records(in_flight.popleft().result())
+                if records:
+                    output.write(records)
+                if len(records) < chunk_size:
+                    break
+        finally:
+            for chunk in in_flight:
+                chunk.cancel()
+    output.finish()
+    return output.records
+
+
+def _cursor_params(output: ExportFile, params: Optional[Mapping[str, Any]], chunk_size: int) -> Dict[str, Any]:
+    page_params = {**(params or {}), "limit": _page_limit(chunk_size)}
+    if output.starting_after is not None:
+        page_params["starting_after"] = output.starting_after
+    return page_params
+
+
+async def export_by_cursor(
+    output: ExportFile,
+    list_page: Callable[[Any], Awaitable[BlindpayApiResponse[Any]]],
+    params: Optional[Mapping[str, Any]],
+    chunk_size: int,
+    concurrency: int,
+) -> int:
+    """
+    Writes every record of a cursor paginated list to `output`, one page per chunk. Pages depend on each other
+    through the cursor, so concurrency is spent on fetching up to `concurrency - 1` pages ahead.
+
+    Returns:
+        The number of records in the output
+    """
+    _check_options(chunk_size, concurrency)
+    pages = iter_pages(list_page, _cursor_params(output, params, chunk_size))
+    if concurrency > 1:
+        pages = prefetch_pages(pages, concurrency - 1)
+    with output:
+        async for page in pages:
+            if page["data"]:
+                output.write(page["data"], starting_after=page["data"][-1]["id"])
+    output.finish()
+    return output.records
+
+
+def export_by_cursor_sync(
+    output: ExportFile,
+    list_page: Callable[[Any], BlindpayApiResponse[Any]],
+    params: Optional[Mapping[str, Any]],
+    chunk_size: int,
+    concurrency: int,
+) -> int:
+    """Sync version of export_by_cursor()"""
+    _check_options(chunk_size, concurrency)
+    pages = iter_pages_sync(list_page, _cursor_params(output, params, chunk_size))
+    if concurrency > 1:
+        pages = prefetch_pages_sync(pages, concurrency - 1)
+    with output:
+        for page in pages:
+            if page["data"]:
+                output.write(page["data"], starting_after=page["data"][-1]["id"])
+    output.finish()
+    return output.records
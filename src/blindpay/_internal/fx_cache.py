@@ -0,0 +1,201 @@
+import asyncio
+import copy
+import math
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Mapping, Set, Tuple
+
+from ..types import BlindpayApiResponse
+from .exceptions import BlindPayError
+from .fx_estimator import FxEstimator
+from .reference_cache import CacheState
+
+FetchFxRate = Callable[[], Awaitable[BlindpayApiResponse[Any]]]
+FetchFxRateSync = Callable[[], BlindpayApiResponse[Any]]
+
+# The input a rate was fetched with, and the response.
+Fetched = Tuple[Mapping[str, Any], BlindpayApiResponse[Any]]
+
+
+def _for_request(fetched: Mapping[str, Any], data: Any, request: Mapping[str, Any]) -> Any:
+    """
+    A copy of a rate fetched for `fetched`, with `result_amount` estimated for the amount of `request`
+
+    The estimate applies the instance fees of the rate (see `FxEstimator`), so it is exact for the amount the rate
+    was fetched for and an estimate for the others. A rate without a `blindpay_quotation` is returned as is.
+    """
+    data = copy.deepcopy(data)
+    amount = request["request_amount"]
+    if amount != fetched["request_amount"] and data.get("blindpay_quotation") and data.get("result_amount"):
+        data["result_amount"] = FxEstimator(data, fetched).estimate(amount)
+    return data
+
+
+class FxRateCache:
+    """
+    Short-lived cache for `quotes.get_fx_rate` and `payins.quotes.get_fx_rate`.
+
+    Rates are keyed by currency type, currency pair and amount bucket: amounts within `bucket_ratio` of each other
+    (1% by default) share one rate. For another amount than the one fetched, `result_amount` is an estimate that
+    applies the instance fees of the rate to the amount asked for, like `FxEstimator`; set `bucket_ratio` to 0 for
+    exact results. A rate is served for `ttl` seconds; for `stale_ttl` seconds after that it is still served while a
+    refresh runs in the background.
+    Concurrent misses for the same key wait for a single request. Only successful responses are cached.
+
+    Args:
+        ttl: Seconds a rate is served without being refreshed
+        stale_ttl: Seconds past `ttl` a rate is still served while it is refreshed in the background
+        bucket_ratio: Relative width of an amount bucket, 0 to key on the exact amount
+        max_size: Rates kept at most, the oldest are evicted first
+    """
+
+    def __init__(self, ttl: float = 5.0, stale_ttl: float = 0.0, bucket_ratio: float = 0.01, max_size: int = 1000):
+        if ttl < 0 or stale_ttl < 0:
+            raise BlindPayError("FX cache ttl and stale_ttl must not be negative")
+        if bucket_ratio < 0:
+            raise BlindPayError("FX cache bucket_ratio must not be negative")
+        if max_size < 1:
+            raise BlindPayError("FX cache max_size must be at least 1")
+
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.bucket_ratio = bucket_ratio
+        self.max_size = max_size
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        # key -> (stored_at, input the rate was fetched with, response data)
+        self._rates: Dict[str, Tuple[float, Mapping[str, Any], Any]] = {}
+        self._pending: Dict[str, "asyncio.Task[Fetched]"] = {}
+        self._pending_sync: Dict[str, "Future[Fetched]"] = {}
+        self._refreshes: Set["asyncio.Task[Fetched]"] = set()
+        self._lock = threading.Lock()
+
+    def _bucket(self, amount: float) -> str:
+        if self.bucket_ratio == 0 or amount <= 0:
+            return repr(float(amount))
+        return str(math.floor(math.log(amount) / math.log1p(self.bucket_ratio)))
+
+    def key(self, kind: str, data: Mapping[str, Any]) -> str:
+        return ":".join(
+            (kind, data["currency_type"], data["from_currency"], data["to"], self._bucket(data["request_amount"]))
+        )
+
+    def _lookup(self, key: str, request: Mapping[str, Any]) -> Tuple[CacheState, Any]:
+        """Returns "fresh", "stale" or "miss" for `key` and the rate for `request`; call with the lock held"""
+        entry = self._rates.get(key)
+        age = time.time() - entry[0] if entry is not None else math.inf
+        if entry is None or age >= self.ttl + self.stale_ttl:
+            self.misses += 1
+            return "miss", None
+        if age < self.ttl:
+            self.hits += 1
+            state: CacheState = "fresh"
+        else:
+            self.stale_hits += 1
+            state = "stale"
+        return state, _for_request(entry[1], entry[2], request)
+
+    def _store(self, key: str, request: Mapping[str, Any], response: BlindpayApiResponse[Any]) -> None:
+        if response["error"] is not None:
+            return
+        with self._lock:
+            self._rates.pop(key, None)
+            while len(self._rates) >= self.max_size:
+                del self._rates[next(iter(self._rates))]
+            self._rates[key] = (time.time(), dict(request), copy.deepcopy(response["data"]))
+
+    def _answer(
+        self, response: BlindpayApiResponse[Any], fetched: Mapping[str, Any], request: Mapping[str, Any]
+    ) -> BlindpayApiResponse[Any]:
+        if response["error"] is not None:
+            return response
+        return {"data": _for_request(fetched, response["data"], request), "error": None}
+
+    async def _fetch(self, key: str, request: Mapping[str, Any], fetch: FetchFxRate) -> Fetched:
+        try:
+            response = await fetch()
+            self._store(key, request, response)
+            return request, response
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    async def get(self, key: str, request: Mapping[str, Any], fetch: FetchFxRate) -> BlindpayApiResponse[Any]:
+        """The rate for `key` estimated for `request`, calling `fetch` on a miss unless a fetch for `key` is running"""
+        with self._lock:
+            state, data = self._lookup(key, request)
+            pending = self._pending.get(key)
+            if state == "miss" and pending is not None:
+                self.coalesced += 1
+            elif state != "fresh" and pending is None:
+                pending = asyncio.ensure_future(self._fetch(key, request, fetch))
+                self._pending[key] = pending
+                if state == "stale":
+                    # The loop only keeps weak references to tasks.
+                    self._refreshes.add(pending)
+                    pending.add_done_callback(self._refreshes.discard)
+        if state != "miss":
+            return {"data": data, "error": None}
+        assert pending is not None
+        # Shielded so that a cancelled caller does not cancel the request other callers wait for.
+        fetched, response = await asyncio.shield(pending)
+        return self._answer(response, fetched, request)
+
+    def _fetch_sync(
+        self, key: str, request: Mapping[str, Any], fetch: FetchFxRateSync, future: "Future[Fetched]"
+    ) -> None:
+        try:
+            response = fetch()
+            self._store(key, request, response)
+            future.set_result((request, response))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._pending_sync.pop(key, None)
+
+    def get_sync(self, key: str, request: Mapping[str, Any], fetch: FetchFxRateSync) -> BlindpayApiResponse[Any]:
+        """Sync version of get(), refreshing stale rates from a background thread"""
+        with self._lock:
+            state, data = self._lookup(key, request)
+            future = self._pending_sync.get(key)
+            leader = future is None and state != "fresh"
+            if state == "miss" and not leader:
+                self.coalesced += 1
+            if leader:
+                future = Future()
+                self._pending_sync[key] = future
+        if state == "stale":
+            if leader:
+                assert future is not None
+                threading.Thread(
+                    target=self._fetch_sync,
+                    args=(key, request, fetch, future),
+                    name="blindpay-fx-refresh",
+                    daemon=True,
+                ).start()
+            return {"data": data, "error": None}
+        if state == "fresh":
+            return {"data": data, "error": None}
+        assert future is not None
+        if leader:
+            self._fetch_sync(key, request, fetch, future)
+        fetched, response = future.result()
+        return self._answer(response, fetched, request)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rates = {}
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "size": len(self._rates),
+            }
@@ -0,0 +1,77 @@
+import importlib
+from functools import lru_cache
+from typing import Any, Iterable, List, Mapping
+
+from .exceptions import BlindPayError
+
+# Quotations are sent multiplied by 100 (495 is 1 USD = 4.95 BRL) and percentage fees in basis points.
+_QUOTATION_SCALE = 100
+_PERCENTAGE_FEE_SCALE = 10_000
+
+
+@lru_cache(maxsize=None)
+def _numpy() -> Any:
+    """The numpy module, or None if it is not installed"""
+    try:
+        return importlib.import_module("numpy")
+    except ImportError:
+        return None
+
+
+class FxEstimator:
+    """
+    Estimates `get_fx_rate` results for other amounts from one response, e.g. to render a price grid.
+
+    The estimate applies the instance fees and `blindpay_quotation` of `rate`, calibrated so that it matches
+    `result_amount` exactly for the amount the rate was fetched for. Estimates are for display only: the quote from
+    `quotes.create` is what a payout executes at.
+
+    If numpy is installed (`pip install blindpay[numpy]`), `estimate_many()` computes on arrays.
+
+    Args:
+        rate: The data of a `quotes.get_fx_rate` or `payins.quotes.get_fx_rate` response
+        request: The input the rate was fetched with
+    """
+
+    def __init__(self, rate: Mapping[str, Any], request: Mapping[str, Any]):
+        quotation = rate.get("blindpay_quotation")
+        if not quotation:
+            raise BlindPayError("The FX rate has no blindpay_quotation to estimate from")
+
+        self.currency_type = request["currency_type"]
+        self.quotation = quotation / _QUOTATION_SCALE
+        self.flat_fee = rate.get("instance_flat_fee") or 0
+        self.percentage_fee = (rate.get("instance_percentage_fee") or 0) / _PERCENTAGE_FEE_SCALE
+        modelled = self._result(request["request_amount"])
+        self._calibration = rate["result_amount"] / modelled if modelled else 1.0
+
+    def _result(self, amount: Any) -> Any:
+        """Fees are taken from the sender side; `amount` is a float or a numpy array"""
+        if self.currency_type == "sender":
+            return (amount * (1 - self.percentage_fee) - self.flat_fee) * self.quotation
+        return (amount / self.quotation + self.flat_fee) / (1 - self.percentage_fee)
+
+    def estimate(self, amount: float) -> float:
+        """Estimated `result_amount` for `request_amount=amount`"""
+        result: float = self._calibration * self._result(amount)
+        return result
+
+    def estimate_many(self, amounts: Iterable[float]) -> Any:
+        """
+        Estimated `result_amount` for each of `amounts`, in one batched computation
+
+        Returns:
+            A numpy array if `amounts` is one, else a list of floats
+        """
+        np = _numpy()
+        if np is None:
+            return [self.estimate(amount) for amount in amounts]
+        if isinstance(amounts, (list, tuple, np.ndarray)):
+            values = np.asarray(amounts, dtype=float)
+        else:
+            values = np.fromiter(amounts, dtype=float)
+        estimates = self._calibration * self._result(values)
+        if isinstance(amounts, np.ndarray):
+            return estimates
+        result: List[float] = estimates.tolist()
+        return result
@@ -0,0 +1,99 @@
+import math
+import threading
+from collections import deque
+from typing import Collection, Deque, Dict, Optional
+
+from .endpoints import path_template
+from .exceptions import BlindPayError
+
+# Idempotent reads that back user facing status pages.
+DEFAULT_HEDGED_ENDPOINTS = frozenset(
+    {
+        "/e/payouts/{id}",
+        "/e/payins/{id}",
+        "/e/transfers/{id}",
+        "/instances/{id}/customers/{id}",
+    }
+)
+
+
+class HedgePolicy:
+    """
+    Sends a second copy of a slow GET and keeps whichever answer comes back first.
+
+    The hedge fires once the first request has been outstanding longer than the `percentile` of
+    recently observed latencies for that endpoint (or `initial_delay`, until `min_samples`
+    latencies have been seen). Hedges are paid for from a budget that grows by `budget_ratio` per
+    request, up to `max_budget`, so at most about `budget_ratio` of the traffic is duplicated.
+
+    Args:
+        percentile: Latency percentile, between 0 and 100, after which a hedge is sent
+        initial_delay: Hedge delay in seconds used until enough latencies have been observed
+        min_delay: Lower bound in seconds of the hedge delay
+        budget_ratio: Extra requests hedging may send per request
+        max_budget: Hedges that may be saved up for a burst of slow requests
+        endpoints: Path templates to hedge, or None to hedge every GET
+        min_samples: Latencies needed before the percentile is trusted
+        window: Latencies kept per endpoint
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        initial_delay: float = 0.5,
+        min_delay: float = 0.01,
+        budget_ratio: float = 0.05,
+        max_budget: float = 10.0,
+        endpoints: Optional[Collection[str]] = DEFAULT_HEDGED_ENDPOINTS,
+        min_samples: int = 20,
+        window: int = 500,
+    ):
+        if not 0 < percentile < 100:
+            raise BlindPayError("Hedging percentile must be between 0 and 100")
+
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.budget_ratio = budget_ratio
+        self.max_budget = max_budget
+        self.endpoints = frozenset(endpoints) if endpoints is not None else None
+        self.min_samples = min_samples
+        self.window = window
+        self.hedges_sent = 0
+        self._budget = 0.0
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def applies_to(self, path: str) -> bool:
+        return self.endpoints is None or path_template(path) in self.endpoints
+
+    def delay(self, path: str) -> float:
+        """Seconds to wait for the first request to `path` before hedging it"""
+        with self._lock:
+            samples = self._latencies.get(path_template(path))
+            if samples is None or len(samples) < self.min_samples:
+                return self.initial_delay
+            ordered = sorted(samples)
+        index = min(len(ordered) - 1, math.ceil(self.percentile / 100 * len(ordered)) - 1)
+        return max(self.min_delay, ordered[index])
+
+    def record_latency(self, path: str, latency: float) -> None:
+        with self._lock:
+            template = path_template(path)
+            samples = self._latencies.get(template)
+            if samples is None:
+                samples = self._latencies[template] = deque(maxlen=self.window)
+            samples.append(latency)
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._budget = min(self.max_budget, self._budget + self.budget_ratio)
+
+    def try_spend(self) -> bool:
+        """Takes one hedge from the budget, returning False if it is exhausted"""
+        with self._lock:
+            if self._budget < 1:
+                return False
+            self._budget -= 1
+            self.hedges_sent += 1
+            return True
@@ -0,0 +1,85 @@
+import copy
+import threading
+from collections import OrderedDict
+from typing import Any, Collection, Dict, Optional, Tuple
+
+import httpx
+
+from .endpoints import path_template
+from .exceptions import BlindPayError
+
+# A cached GET: its ETag, its Last-Modified date and the decoded body.
+CachedResponse = Tuple[Optional[str], Optional[str], Any]
+
+
+class HttpCache:
+    """
+    Caches GET responses that carry an `ETag` or `Last-Modified` header and revalidates them on every read.
+
+    The next GET of the same path and query is sent with `If-None-Match` / `If-Modified-Since`. When the server
+    answers 304 Not Modified, the cached body is returned without transferring or decoding it again. Every read
+    still asks the server, so a cached body is never served once it changed. Responses marked `no-store` are
+    not cached.
+
+    Args:
+        max_size: Responses kept at most, the least recently read are evicted first
+        exclude: Path templates, e.g. "/instances/{id}/payouts", whose GETs are never cached
+    """
+
+    def __init__(self, max_size: int = 1000, exclude: Collection[str] = ()):
+        if max_size < 1:
+            raise BlindPayError("HTTP cache max_size must be at least 1")
+
+        self.max_size = max_size
+        self.exclude = frozenset(exclude)
+        self.hits = 0
+        self.misses = 0
+        self._responses: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def applies_to(self, path: str) -> bool:
+        return path_template(path) not in self.exclude
+
+    def lookup(self, path: str) -> Optional[CachedResponse]:
+        with self._lock:
+            cached = self._responses.get(path)
+            if cached is not None:
+                self._responses.move_to_end(path)
+            return cached
+
+    def validators(self, cached: CachedResponse) -> Dict[str, str]:
+        """The conditional headers to revalidate `cached` with"""
+        etag, last_modified, _ = cached
+        headers: Dict[str, str] = {}
+        if etag is not None:
+            headers["If-None-Match"] = etag
+        if last_modified is not None:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def not_modified(self, cached: CachedResponse) -> Any:
+        """A copy of the body of `cached`, after the server confirmed it is still current"""
+        with self._lock:
+            self.hits += 1
+        return copy.deepcopy(cached[2])
+
+    def store(self, path: str, response: httpx.Response, data: Any) -> None:
+        with self._lock:
+            self.misses += 1
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if (etag is None and last_modified is None) or "no-store" in response.headers.get("Cache-Control", ""):
+                self._responses.pop(path, None)
+                return
+            self._responses[path] = (etag, last_modified, copy.deepcopy(data))
+            self._responses.move_to_end(path)
+            while len(self._responses) > self.max_size:
+                self._responses.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._responses.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._responses)}
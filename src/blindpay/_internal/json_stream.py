@@ -0,0 +1,127 @@
+import json
+import re
+from typing import Any, List, Literal, Optional
+
+_WHITESPACE = " \t\n\r"
+
+# What ends a number, true, false or null element.
+_SCALAR_END = re.compile(r"[ \t\n\r,\]]")
+# Outside a string, only brackets, braces and quotes change the nesting.
+_STRUCTURE = re.compile(r'[\[\]{}"]')
+# Inside a string, only a quote or an escape matters.
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+_State = Literal["start", "first_value", "value", "element", "after_value", "done"]
+
+
+class JsonArrayParser:
+    """
+    Incremental parser for a JSON array that hands out each element as soon as it is complete.
+
+    Only the element being parsed is buffered, so memory stays flat however long the array is.
+    Each chunk is scanned once, tracking the nesting and strings of the current element, and an
+    element is decoded once it is complete, so a malformed element raises as soon as it has arrived.
+    Feed it text chunks in order with feed(), then call close() once the body has ended.
+    """
+
+    def __init__(self) -> None:
+        self._state: _State = "start"
+        # Text of the current element from earlier chunks.
+        self._parts: List[str] = []
+        self._scalar = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        Adds `chunk` to the input and returns the elements it completed
+
+        Raises:
+            ValueError: If the input is not a JSON array or an element is not valid JSON
+        """
+        items: List[Any] = []
+        pos = 0
+        while pos < len(chunk):
+            if self._state == "element":
+                end = self._scan(chunk, pos)
+                if end is None:
+                    self._parts.append(chunk[pos:])
+                    break
+                items.append(self._decode(chunk[pos:end]))
+                pos = end
+                continue
+
+            char = chunk[pos]
+            if char in _WHITESPACE:
+                pos += 1
+            elif self._state == "start":
+                if char != "[":
+                    raise ValueError(f"Expected a JSON array, got {char!r}")
+                self._state = "first_value"
+                pos += 1
+            elif self._state == "after_value":
+                if char not in ",]":
+                    raise ValueError(f"Expected ',' or ']' after an array element, got {char!r}")
+                self._state = "value" if char == "," else "done"
+                pos += 1
+            elif self._state == "done":
+                raise ValueError("Unexpected data after the end of the JSON array")
+            elif char == "]" and self._state == "first_value":
+                self._state = "done"
+                pos += 1
+            else:
+                self._state = "element"
+                self._scalar = char not in '[{"'
+                self._depth = 0
+        return items
+
+    def _scan(self, chunk: str, pos: int) -> Optional[int]:
+        """Scans the current element from `pos`, returning where it ends in `chunk` or None if it goes on"""
+        if self._scalar:
+            # A number at the very end of the chunk may still have digits to come.
+            match = _SCALAR_END.search(chunk, pos)
+            return match.start() if match is not None else None
+
+        while True:
+            if self._in_string:
+                if self._escaped:
+                    if pos == len(chunk):
+                        return None
+                    pos += 1
+                    self._escaped = False
+                match = _STRING_SPECIAL.search(chunk, pos)
+                if match is None:
+                    return None
+                pos = match.end()
+                if match.group() == "\\":
+                    self._escaped = True
+                    continue
+                self._in_string = False
+                if self._depth == 0:
+                    return pos
+            else:
+                match = _STRUCTURE.search(chunk, pos)
+                if match is None:
+                    return None
+                pos = match.end()
+                char = match.group()
+                if char == '"':
+                    self._in_string = True
+                elif char in "[{":
+                    self._depth += 1
+                else:
+                    self._depth -= 1
+                    if self._depth == 0:
+                        return pos
+
+    def _decode(self, tail: str) -> Any:
+        text = "".join(self._parts) + tail
+        self._parts = []
+        self._state = "after_value"
+        return json.loads(text)
+
+    def close(self) -> None:
+        """Checks that the whole array was received"""
+        if self._state != "done":
+            raise ValueError("JSON array ended before its closing bracket")
@@ -0,0 +1,246 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .exceptions import BlindPayError
+from .pagination import ListPage, ListPageSync, Page, iter_pages, iter_pages_sync
+
+MirroredResource = Literal["payouts", "payins", "transfers", "customers"]
+
+MIRRORED_RESOURCES: Tuple[MirroredResource, ...] = ("payouts", "payins", "transfers", "customers")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS {table} (
+    id TEXT PRIMARY KEY,
+    customer_id TEXT,
+    status TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS {table}_customer_id ON {table} (customer_id);
+CREATE INDEX IF NOT EXISTS {table}_status ON {table} (status);
+CREATE INDEX IF NOT EXISTS {table}_updated_at ON {table} (updated_at);
+"""
+
+# Rows whose record is unchanged are left alone, so the statement's change count is the number of
+# new or changed records.
+_UPSERT = """
+INSERT INTO {table} (id, customer_id, status, created_at, updated_at, data) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    customer_id = excluded.customer_id,
+    status = excluded.status,
+    created_at = excluded.created_at,
+    updated_at = excluded.updated_at,
+    data = excluded.data
+WHERE excluded.updated_at IS NOT {table}.updated_at OR excluded.data IS NOT {table}.data
+"""
+
+
+def _check_resource(resource: str) -> MirroredResource:
+    for mirrored in MIRRORED_RESOURCES:
+        if mirrored == resource:
+            return mirrored
+    raise BlindPayError(f"Unknown mirrored resource {resource!r}, use one of {', '.join(MIRRORED_RESOURCES)}")
+
+
+class LocalMirror:
+    """
+    Local SQLite copy of payouts, payins, transfers and customers, indexed for lookups by id, customer and status.
+
+    Fill and refresh it with `BlindPay.sync_mirror()`; lookups are then answered from disk without a request.
+    Records come back as the dicts the list endpoints returned.
+    """
+
+    def __init__(self, path: Union[str, "os.PathLike[str]"] = ":memory:"):
+        # Autocommit mode, so a sync can hold one explicit transaction across all the pages of a resource.
+        self._db = sqlite3.connect(os.fspath(path), isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        # A sync holds its transaction across awaited page fetches, so syncs of one mirror take turns.
+        self._syncing = asyncio.Lock()
+        self._syncing_sync = threading.Lock()
+        with self._lock:
+            for table in MIRRORED_RESOURCES:
+                self._db.executescript(_SCHEMA.format(table=table))
+            self._db.execute("CREATE TABLE IF NOT EXISTS sync_state (resource TEXT PRIMARY KEY, synced_at TEXT)")
+
+    def __enter__(self) -> "LocalMirror":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _query(self, sql: str, params: Iterable[Any] = ()) -> List[Any]:
+        with self._lock:
+            return self._db.execute(sql, tuple(params)).fetchall()
+
+    def get(self, resource: MirroredResource, id: str) -> Optional[Dict[str, Any]]:
+        """The mirrored record with this id, or None if it is not in the mirror"""
+        rows = self._query(f"SELECT data FROM {_check_resource(resource)} WHERE id = ?", (id,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def by_customer(self, resource: MirroredResource, customer_id: str) -> List[Dict[str, Any]]:
+        """Mirrored records of a customer, newest first"""
+        table = _check_resource(resource)
+        rows = self._query(f"SELECT data FROM {table} WHERE customer_id = ? ORDER BY created_at DESC", (customer_id,))
+        return [json.loads(data) for (data,) in rows]
+
+    def by_status(self, resource: MirroredResource, status: str) -> List[Dict[str, Any]]:
+        """Mirrored records in a status, newest first"""
+        table = _check_resource(resource)
+        rows = self._query(f"SELECT data FROM {table} WHERE status = ? ORDER BY created_at DESC", (status,))
+        return [json.loads(data) for (data,) in rows]
+
+    def count(self, resource: MirroredResource) -> int:
+        count: int = self._query(f"SELECT COUNT(*) FROM {_check_resource(resource)}")[0][0]
+        return count
+
+    def synced_at(self, resource: MirroredResource) -> Optional[str]:
+        """When the last sync of `resource` completed, as an ISO 8601 timestamp, or None if it never did"""
+        rows = self._query("SELECT synced_at FROM sync_state WHERE resource = ?", (_check_resource(resource),))
+        return rows[0][0] if rows else None
+
+    def _updated_through(self, resource: MirroredResource) -> Optional[str]:
+        """The latest `updated_at` in the mirror, every change up to it was seen by a previous sync"""
+        updated_through: Optional[str] = self._query(f"SELECT MAX(updated_at) FROM {resource}")[0][0]
+        return updated_through
+
+    def _begin(self) -> None:
+        with self._lock:
+            self._db.execute("BEGIN")
+
+    def _commit(self, resource: MirroredResource) -> None:
+        synced_at = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO sync_state (resource, synced_at) VALUES (?, ?) "
+                "ON CONFLICT (resource) DO UPDATE SET synced_at = excluded.synced_at",
+                (resource, synced_at),
+            )
+            self._db.execute("COMMIT")
+
+    def _rollback(self) -> None:
+        with self._lock:
+            if self._db.in_transaction:
+                self._db.execute("ROLLBACK")
+
+    def _upsert(self, resource: MirroredResource, records: List[Mapping[str, Any]]) -> int:
+        """Writes a page of records in one batch and returns how many of them were new or changed"""
+        rows = [
+            (
+                record["id"],
+                record["id"] if resource == "customers" else record.get("customer_id"),
+                record.get("status"),
+                record.get("created_at"),
+                record.get("updated_at"),
+                json.dumps(record, sort_keys=True, separators=(",", ":")),
+            )
+            for record in records
+        ]
+        with self._lock:
+            before = self._db.total_changes
+            self._db.executemany(_UPSERT.format(table=resource), rows)
+            return self._db.total_changes - before
+
+
+class _ResourceSync:
+    """Walks one resource newest first and decides when the rest of the list is already mirrored"""
+
+    def __init__(self, mirror: LocalMirror, resource: MirroredResource, full: bool):
+        self.mirror = mirror
+        self.resource = resource
+        # Without a completed sync nothing older can be assumed to be mirrored.
+        self.full = full or mirror.synced_at(resource) is None
+        self.updated_through = mirror._updated_through(resource)
+        self.changed = 0
+
+    def _updated_since_last_sync(self, record: Mapping[str, Any]) -> bool:
+        updated_at = record.get("updated_at")
+        return updated_at is None or self.updated_through is None or updated_at > self.updated_through
+
+    def apply(self, page: Page) -> bool:
+        """Mirrors a page, returns False once a page holds nothing updated since the last sync"""
+        records = page["data"]
+        changed = self.mirror._upsert(self.resource, records) if records else 0
+        self.changed += changed
+        return self.full or changed > 0 or any(self._updated_since_last_sync(record) for record in records)
+
+
+async def _sync_resource(
+    mirror: LocalMirror, resource: MirroredResource, pages: AsyncIterator[Page], full: bool
+) -> int:
+    async with mirror._syncing:
+        sync = _ResourceSync(mirror, resource, full)
+        mirror._begin()
+        try:
+            async for page in pages:
+                if not sync.apply(page):
+                    break
+            mirror._commit(resource)
+        finally:
+            mirror._rollback()
+    return sync.changed
+
+
+def _sync_resource_sync(mirror: LocalMirror, resource: MirroredResource, pages: Iterator[Page], full: bool) -> int:
+    with mirror._syncing_sync:
+        sync = _ResourceSync(mirror, resource, full)
+        mirror._begin()
+        try:
+            for page in pages:
+                if not sync.apply(page):
+                    break
+            mirror._commit(resource)
+        finally:
+            mirror._rollback()
+    return sync.changed
+
+
+async def sync_mirror(
+    mirror: LocalMirror, list_pages: Mapping[MirroredResource, ListPage], full: bool = False
+) -> Dict[MirroredResource, int]:
+    """
+    Brings `mirror` up to date with the lists fetched by `list_pages`, one transaction per resource.
+    Overlapping syncs of one mirror take turns, one resource at a time.
+
+    Lists come newest first by creation, and the API cannot list by `updated_at`. An incremental sync therefore
+    stops at the first page holding no record updated after the latest `updated_at` already mirrored. Records
+    created before that page are not re-read, so a change to an older record, e.g. the refund of a payout completed
+    weeks ago, is only picked up by a `full` sync.
+
+    Returns:
+        The number of new or changed records per resource
+    """
+    changed: Dict[MirroredResource, int] = {}
+    for resource, list_page in list_pages.items():
+        changed[resource] = await _sync_resource(mirror, resource, iter_pages(list_page, None), full)
+    return changed
+
+
+def sync_mirror_sync(
+    mirror: LocalMirror, list_pages: Mapping[MirroredResource, ListPageSync], full: bool = False
+) -> Dict[MirroredResource, int]:
+    """Sync version of sync_mirror()"""
+    changed: Dict[MirroredResource, int] = {}
+    for resource, list_page in list_pages.items():
+        changed[resource] = _sync_resource_sync(mirror, resource, iter_pages_sync(list_page, None), full)
+    return changed
@@ -0,0 +1,274 @@
+import asyncio
+import queue
+import threading
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+    cast,
+)
+
+from ..types import BlindpayApiResponse, PaginationLimit
+from .exceptions import BlindPayApiError, BlindPayError
+
+# Largest page the list endpoints accept, fewer round trips for a full history sync.
+MAX_PAGE_LIMIT: PaginationLimit = "1000"
+
+ListPage = Callable[[Any], Awaitable[BlindpayApiResponse[Any]]]
+ListPageSync = Callable[[Any], BlindpayApiResponse[Any]]
+
+Page = Dict[str, Any]
+
+_DONE = object()
+
+
+def _first_page_params(params: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+    return {"limit": MAX_PAGE_LIMIT, **{k: v for k, v in (params or {}).items() if v is not None}}
+
+
+def _page(response: BlindpayApiResponse[Any]) -> Page:
+    if response["error"] is not None:
+        raise BlindPayApiError(response["error"])
+    data = response["data"]
+    # Some list endpoints answer with a bare list when the instance has too few items to paginate.
+    if isinstance(data, list):
+        return {"data": data, "pagination": {"has_more": False, "next_page": None, "prev_page": None}}
+    page: Page = data
+    return page
+
+
+def _next_page_params(params: Dict[str, Any], page: Page) -> Optional[Dict[str, Any]]:
+    """Params of the page after `page`, or None if it was the last one"""
+    items = page["data"]
+    if not items or not page["pagination"]["has_more"]:
+        return None
+    # The cursor replaces the offset, which only positions the first page.
+    next_params = {k: v for k, v in params.items() if k != "offset"}
+    next_params["starting_after"] = items[-1]["id"]
+    return next_params
+
+
+def _check_prefetch(prefetch: int) -> None:
+    if prefetch < 0:
+        raise BlindPayError("prefetch must be a non-negative number of pages")
+
+
+async def iter_pages(list_page: ListPage, params: Optional[Mapping[str, Any]]) -> AsyncIterator[Page]:
+    page_params: Optional[Dict[str, Any]] = _first_page_params(params)
+    while page_params is not None:
+        page = _page(await list_page(page_params))
+        yield page
+        page_params = _next_page_params(page_params, page)
+
+
+def iter_pages_sync(list_page: ListPageSync, params: Optional[Mapping[str, Any]]) -> Iterator[Page]:
+    page_params: Optional[Dict[str, Any]] = _first_page_params(params)
+    while page_params is not None:
+        page = _page(list_page(page_params))
+        yield page
+        page_params = _next_page_params(page_params, page)
+
+
+async def prefetch_pages(pages: AsyncIterator[Page], depth: int) -> AsyncIterator[Page]:
+    """Fetches up to `depth` pages ahead of the one being consumed, in a background task"""
+    fetched: "asyncio.Queue[Union[Page, BaseException, object]]" = asyncio.Queue()
+    slots = asyncio.Semaphore(depth)
+
+    async def produce() -> None:
+        try:
+            while True:
+                await slots.acquire()
+                page = await anext(pages, _DONE)
+                await fetched.put(page)
+                if page is _DONE:
+                    return
+        except Exception as e:
+            await fetched.put(e)
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        while True:
+            page = await fetched.get()
+            slots.release()
+            if page is _DONE:
+                return
+            if isinstance(page, BaseException):
+                raise page
+            yield cast(Page, page)
+    finally:
+        producer.cancel()
+
+
+def prefetch_pages_sync(pages: Iterator[Page], depth: int) -> Iterator[Page]:
+    """Sync version of prefetch_pages(), fetching in a background thread"""
+    fetched: "queue.Queue[Union[Page, BaseException, object]]" = queue.Queue()
+    slots = threading.Semaphore(depth)
+    stopped = threading.Event()
+
+    def produce() -> None:
+        try:
+            while True:
+                slots.acquire()
+                if stopped.is_set():
+                    return
+                page = next(pages, _DONE)
+                fetched.put(page)
+                if page is _DONE:
+                    return
+        except Exception as e:
+            fetched.put(e)
+
+    threading.Thread(target=produce, name="blindpay-prefetch", daemon=True).start()
+    try:
+        while True:
+            page = fetched.get()
+            slots.release()
+            if page is _DONE:
+                return
+            if isinstance(page, BaseException):
+                raise page
+            yield cast(Page, page)
+    finally:
+        # Wakes the producer if it is waiting for a slot; a page already in flight is dropped.
+        stopped.set()
+        slots.release()
+
+
+async def paginate(
+    list_page: ListPage, params: Optional[Mapping[str, Any]] = None, prefetch: int = 0
+) -> AsyncGenerator[Any, None]:
+    """
+    Yields the items of every page returned by `list_page`, following the `starting_after` cursor.
+
+    Args:
+        list_page: Fetches one page given its query params, e.g. `PayoutsResource.list`
+        params: Filters and page size; `limit` defaults to the largest page allowed
+        prefetch: Pages fetched ahead of the one being iterated, 0 fetches each page only when it is reached
+
+    Raises:
+        BlindPayApiError: If a page cannot be fetched
+    """
+    _check_prefetch(prefetch)
+    pages = iter_pages(list_page, params)
+    if prefetch:
+        pages = prefetch_pages(pages, prefetch)
+    async for page in pages:
+        for item in page["data"]:
+            yield item
+
+
+def paginate_sync(
+    list_page: ListPageSync, params: Optional[Mapping[str, Any]] = None, prefetch: int = 0
+) -> Generator[Any, None, None]:
+    """Sync version of paginate(), prefetching from a background thread"""
+    _check_prefetch(prefetch)
+    pages = iter_pages_sync(list_page, params)
+    if prefetch:
+        pages = prefetch_pages_sync(pages, prefetch)
+    for page in pages:
+        yield from page["data"]
+
+
+def _check_concurrency(concurrency: int) -> None:
+    if concurrency < 1:
+        raise BlindPayError("concurrency must be at least 1")
+
+
+async def paginate_shards(
+    list_page: ListPage, shards: Sequence[Mapping[str, Any]], concurrency: int
+) -> AsyncGenerator[Any, None]:
+    """
+    Yields the items of several paginated lists at once, one list per shard of params, merged as pages arrive.
+
+    Up to `concurrency` shards are walked at the same time, each following its own cursor. Items of a shard keep
+    their order, but items of different shards are interleaved.
+
+    Raises:
+        BlindPayApiError: If a page cannot be fetched
+    """
+    _check_concurrency(concurrency)
+    # Bounded, so walkers pause instead of buffering whole shards while the consumer is busy.
+    fetched: "asyncio.Queue[Union[Page, BaseException, object]]" = asyncio.Queue(maxsize=concurrency)
+    pending = iter(shards)
+
+    async def walk() -> None:
+        try:
+            for params in pending:
+                async for page in iter_pages(list_page, params):
+                    await fetched.put(page)
+            await fetched.put(_DONE)
+        except Exception as e:
+            await fetched.put(e)
+
+    walkers = [asyncio.ensure_future(walk()) for _ in range(min(concurrency, len(shards)))]
+    running = len(walkers)
+    try:
+        while running:
+            page = await fetched.get()
+            if page is _DONE:
+                running -= 1
+                continue
+            if isinstance(page, BaseException):
+                raise page
+            for item in cast(Page, page)["data"]:
+                yield item
+    finally:
+        for walker in walkers:
+            walker.cancel()
+
+
+def paginate_shards_sync(
+    list_page: ListPageSync, shards: Sequence[Mapping[str, Any]], concurrency: int
+) -> Generator[Any, None, None]:
+    """Sync version of paginate_shards(), walking the shards from a pool of background threads"""
+    _check_concurrency(concurrency)
+    fetched: "queue.Queue[Union[Page, BaseException, object]]" = queue.Queue(maxsize=concurrency)
+    pending = iter(shards)
+    pending_lock = threading.Lock()
+    stopped = threading.Event()
+
+    def next_shard() -> Optional[Mapping[str, Any]]:
+        with pending_lock:
+            return next(pending, None)
+
+    def walk() -> None:
+        try:
+            while (params := next_shard()) is not None:
+                for page in iter_pages_sync(list_page, params):
+                    fetched.put(page)
+                    if stopped.is_set():
+                        return
+            fetched.put(_DONE)
+        except Exception as e:
+            fetched.put(e)
+
+    walkers = min(concurrency, len(shards))
+    for _ in range(walkers):
+        threading.Thread(target=walk, name="blindpay-shard", daemon=True).start()
+    running = walkers
+    try:
+        while running:
+            page = fetched.get()
+            if page is _DONE:
+                running -= 1
+                continue
+            if isinstance(page, BaseException):
+                raise page
+            yield from cast(Page, page)["data"]
+    finally:
+        stopped.set()
+        # Frees every walker blocked on a full queue; each then sees `stopped` before fetching again.
+        while True:
+            try:
+                fetched.get_nowait()
+            except queue.Empty:
+                break
@@ -0,0 +1,110 @@
+import copy
+import heapq
+import json
+import threading
+import time
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .exceptions import BlindPayError
+
+# `expires_at` is documented in epoch seconds; anything this large can only be milliseconds.
+_MILLISECONDS_THRESHOLD = 1e12
+
+
+def quote_key(kind: str, data: Mapping[str, Any]) -> str:
+    """Key of a quote request: fields left unset or None do not change it, and neither does their order"""
+    fields = {k: v for k, v in data.items() if v is not None}
+    if isinstance(fields.get("request_amount"), int):
+        fields["request_amount"] = float(fields["request_amount"])
+    return f"{kind}:{json.dumps(fields, sort_keys=True, separators=(',', ':'))}"
+
+
+def _expiry(quote: Mapping[str, Any]) -> Optional[float]:
+    expires_at = quote.get("expires_at")
+    if not isinstance(expires_at, (int, float)):
+        return None
+    return expires_at / 1000 if expires_at > _MILLISECONDS_THRESHOLD else float(expires_at)
+
+
+class QuoteCache:
+    """
+    Reuses a quote for identical quote requests while it is still valid.
+
+    `quotes.create` and `payins.quotes.create` look up the request here first. Quotes can only be used once, so a
+    cached quote is handed out to one later caller at most, and it is dropped as soon as `payouts.create_*` or
+    `payins.create_evm` uses it. Quotes are handed out until `margin` seconds before their `expires_at`, leaving
+    the caller time to use them; expired quotes are evicted.
+
+    Args:
+        margin: Seconds before `expires_at` from which a quote is no longer handed out
+        max_size: Quotes kept at most, the ones closest to expiring are evicted first
+    """
+
+    def __init__(self, margin: float = 10.0, max_size: int = 1000):
+        if margin < 0:
+            raise BlindPayError("Quote cache margin must not be negative")
+        if max_size < 1:
+            raise BlindPayError("Quote cache max_size must be at least 1")
+
+        self.margin = margin
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._quotes: Dict[str, Tuple[float, Any]] = {}
+        self._expiries: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    def _evict_expired(self, now: float) -> None:
+        while self._expiries and self._expiries[0][0] <= now:
+            usable_until, key = heapq.heappop(self._expiries)
+            entry = self._quotes.get(key)
+            if entry is not None and entry[0] == usable_until:
+                del self._quotes[key]
+
+    def get(self, key: str) -> Optional[Any]:
+        """Takes the cached quote for `key` out of the cache, or returns None if there is none usable long enough"""
+        with self._lock:
+            self._evict_expired(time.time())
+            entry = self._quotes.pop(key, None)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, quote: Mapping[str, Any]) -> None:
+        """Caches `quote`, unless it has no expiry or is already too close to it"""
+        expiry = _expiry(quote)
+        if expiry is None:
+            return
+        usable_until = expiry - self.margin
+        with self._lock:
+            now = time.time()
+            if usable_until <= now:
+                return
+            self._evict_expired(now)
+            while len(self._quotes) >= self.max_size and key not in self._quotes:
+                evicted_until, evicted = heapq.heappop(self._expiries)
+                entry = self._quotes.get(evicted)
+                # Heap entries of replaced or discarded quotes are skipped.
+                if entry is not None and entry[0] == evicted_until:
+                    del self._quotes[evicted]
+            self._quotes[key] = (usable_until, copy.deepcopy(quote))
+            heapq.heappush(self._expiries, (usable_until, key))
+
+    def discard(self, quote_id: str) -> None:
+        """Stops handing out the quote with this id, once a payout or payin is created from it"""
+        with self._lock:
+            for key, (_, quote) in list(self._quotes.items()):
+                if quote.get("id") == quote_id:
+                    del self._quotes[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._quotes = {}
+            self._expiries = []
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._evict_expired(time.time())
+            return len(self._quotes)
@@ -0,0 +1,133 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Mapping, Optional
+
+from .endpoints import endpoint_family
+from .exceptions import BlindPayError
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """
+    A sustained request rate with room for short bursts.
+
+    Args:
+        rate: Requests per second allowed on average
+        burst: Requests that may be sent back to back after an idle period, defaults to `rate`
+    """
+
+    rate: float
+    burst: Optional[float] = None
+
+
+class TokenBucket:
+    """
+    Token bucket that hands out reservations instead of rejecting callers.
+
+    A reservation always succeeds and tells the caller how long to wait before sending, so
+    concurrent callers queue up in order rather than polling for free tokens.
+    """
+
+    def __init__(self, limit: RateLimit, clock: Callable[[], float] = time.monotonic):
+        if limit.rate <= 0:
+            raise BlindPayError("Rate limit must be a positive number of requests per second")
+        self.rate = limit.rate
+        self.capacity = limit.burst if limit.burst is not None else limit.rate
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Takes `tokens` from the bucket and returns the seconds to wait until they are available"""
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def try_take(self, tokens: float = 1.0) -> bool:
+        """Takes `tokens` from the bucket only if they are available right now"""
+        with self._lock:
+            self._refill()
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def give_back(self, tokens: float = 1.0) -> None:
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + tokens)
+
+    @property
+    def remaining(self) -> float:
+        with self._lock:
+            self._refill()
+            return max(0.0, self._tokens)
+
+
+class RateLimiter:
+    """
+    Client side rate limiter shared by every resource of a client.
+
+    Every request takes a token from the `default` bucket, if one is configured. Requests to an
+    endpoint family listed in `families` (e.g. `"payouts"`, `"quotes"`, `"customers"`) also take
+    a token from that family's own bucket.
+
+    Args:
+        default: Limit applied to all requests
+        families: Additional limits keyed by endpoint family
+    """
+
+    def __init__(
+        self,
+        default: Optional[RateLimit] = None,
+        families: Optional[Mapping[str, RateLimit]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._default = TokenBucket(default, clock) if default is not None else None
+        self._families: Dict[str, TokenBucket] = {
+            family: TokenBucket(limit, clock) for family, limit in (families or {}).items()
+        }
+
+    def _buckets(self, family: str) -> List[TokenBucket]:
+        buckets = [self._default] if self._default is not None else []
+        if family in self._families:
+            buckets.append(self._families[family])
+        return buckets
+
+    def reserve(self, path: str) -> float:
+        """Reserves a request to `path` and returns the seconds to wait before sending it"""
+        return max((bucket.reserve() for bucket in self._buckets(endpoint_family(path))), default=0.0)
+
+    def try_reserve(self, path: str) -> bool:
+        """Reserves a request to `path` only if it can be sent right now, for requests that are optional"""
+        taken: List[TokenBucket] = []
+        for bucket in self._buckets(endpoint_family(path)):
+            if not bucket.try_take():
+                for other in taken:
+                    other.give_back()
+                return False
+            taken.append(bucket)
+        return True
+
+    def remaining(self, family: Optional[str] = None) -> float:
+        """
+        Requests that can be sent right now without waiting.
+
+        Args:
+            family: Endpoint family to check, or None for the default bucket only
+
+        Returns:
+            The smallest token count of the buckets that apply, or infinity if none do
+        """
+        if family is None:
+            buckets = [self._default] if self._default is not None else []
+        else:
+            buckets = self._buckets(family)
+        return min((bucket.remaining for bucket in buckets), default=float("inf"))
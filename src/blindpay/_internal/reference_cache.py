@@ -0,0 +1,149 @@
+import copy
+import json
+import math
+import os
+import threading
+import time
+from typing import Any, Dict, Literal, Optional, Set, Tuple, Union
+
+from .cache_backend import CacheBackend
+from .exceptions import BlindPayError
+
+CacheState = Literal["fresh", "stale", "miss"]
+
+_FORMAT_VERSION = 1
+
+
+class ReferenceDataCache:
+    """
+    Cache for the near-static reference data served by `available`: rails, bank details, NAICS codes and SWIFT
+    lookups.
+
+    An entry is served from memory for `ttl` seconds. For `stale_ttl` seconds after that it is still served, while
+    a refresh runs in the background; past that it is fetched again before answering. Only successful responses are
+    cached. With a `path`, entries are also kept in a JSON file, so a new process starts warm. With a `backend`,
+    such as a `SqliteCache`, entries are kept there instead, and worker processes sharing it share the entries.
+
+    Args:
+        ttl: Seconds an entry is served without being refreshed
+        stale_ttl: Seconds past `ttl` an entry is still served while it is refreshed in the background
+        path: JSON file the entries are loaded from and saved to, or None to keep them in memory only
+        backend: Cache backend to keep the entries in, instead of memory or `path`
+    """
+
+    def __init__(
+        self,
+        ttl: float = 3600.0,
+        stale_ttl: float = 86400.0,
+        path: Optional[Union[str, "os.PathLike[str]"]] = None,
+        backend: Optional[CacheBackend] = None,
+    ):
+        if ttl < 0 or stale_ttl < 0:
+            raise BlindPayError("Cache ttl and stale_ttl must not be negative")
+        if path is not None and backend is not None:
+            raise BlindPayError("Pass either a path or a backend to the reference data cache, not both")
+
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.path = os.fspath(path) if path is not None else None
+        self.backend = backend
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._refreshing: Set[str] = set()
+        self._lock = threading.Lock()
+        # Saves take turns, and one that finds nothing new since the last save skips the write.
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if self.path is None:
+            return
+        try:
+            with open(self.path) as f:
+                saved = json.load(f)
+            if saved.get("version") == _FORMAT_VERSION:
+                self._entries = {key: (entry["stored_at"], entry["data"]) for key, entry in saved["entries"].items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            # A missing or unreadable cache file only means a cold start.
+            self._entries = {}
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                self._dirty = False
+                entries = dict(self._entries)
+            saved = {
+                "version": _FORMAT_VERSION,
+                "entries": {key: {"stored_at": stored_at, "data": data} for key, (stored_at, data) in entries.items()},
+            }
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(saved, f)
+            os.replace(tmp_path, self.path)
+
+    def lookup(self, key: str) -> Tuple[CacheState, Any]:
+        """Returns how fresh the entry for `key` is and a copy of its data, counting the hit or miss"""
+        with self._lock:
+            entry = self._entry(key)
+            age = time.time() - entry[0] if entry is not None else math.inf
+            if entry is None or age >= self.ttl + self.stale_ttl:
+                self.misses += 1
+                return "miss", None
+            if age < self.ttl:
+                self.hits += 1
+                state: CacheState = "fresh"
+            else:
+                self.stale_hits += 1
+                state = "stale"
+            return state, copy.deepcopy(entry[1])
+
+    def _entry(self, key: str) -> Optional[Tuple[float, Any]]:
+        if self.backend is None:
+            return self._entries.get(key)
+        # Stored as a [stored_at, data] list, so any backend can encode it.
+        stored = self.backend.get(f"reference:{key}")
+        return (stored[0], stored[1]) if stored is not None else None
+
+    def store(self, key: str, data: Any) -> None:
+        """Keeps `data` for `key`, writing it to `path` or the backend; the async client calls it off the loop"""
+        if self.backend is not None:
+            self.backend.set(f"reference:{key}", [time.time(), data], self.ttl + self.stale_ttl)
+            return
+        with self._lock:
+            self._entries[key] = (time.time(), copy.deepcopy(data))
+            self._dirty = True
+        self._save()
+
+    def start_refresh(self, key: str) -> bool:
+        """Claims the background refresh of `key`, False if one is already running"""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def end_refresh(self, key: str) -> None:
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def clear(self) -> None:
+        """Drops every entry, including the ones saved to `path`; with a `backend`, the whole backend is cleared"""
+        if self.backend is not None:
+            self.backend.clear()
+            return
+        with self._lock:
+            self._entries = {}
+            self._dirty = True
+        self._save()
+
+    def stats(self) -> Dict[str, int]:
+        size = self.backend.stats()["size"] if self.backend is not None else len(self._entries)
+        with self._lock:
+            return {"hits": self.hits, "stale_hits": self.stale_hits, "misses": self.misses, "size": size}
@@ -0,0 +1,69 @@
+from typing import Any, Collection, Optional
+
+from .cache_backend import CacheBackend, MemoryCache
+from .endpoints import path_segments, path_template
+from .exceptions import BlindPayError
+
+# Instance settings that are read on most requests and only change through the dashboard or these endpoints.
+DEFAULT_CACHED_ENDPOINTS = frozenset(
+    {
+        "/instances/{id}/billing/fees",
+        "/instances/{id}/partner-fees",
+        "/instances/{id}/partner-fees/{id}",
+    }
+)
+
+
+class ResponseCache:
+    """
+    Serves GETs of selected endpoints from a cache backend for `ttl` seconds.
+
+    Only successful responses are cached. A successful write through the same client (POST, PUT, PATCH or
+    DELETE) drops the cached responses of its path and of the collection above it, whatever their query string,
+    so e.g. creating a partner fee is seen by the next `partner_fees.list()`. Changes made elsewhere show up once
+    the TTL runs out. The async client calls the backend from a worker thread, so a `SqliteCache` does not block
+    the event loop.
+
+    Args:
+        backend: Where responses are stored, an in-memory LRU by default. Pass a `SqliteCache` to share them
+            between the worker processes of a host.
+        ttl: Seconds a response is served from the cache
+        endpoints: Path templates, e.g. "/instances/{id}/billing/fees", whose GETs are cached
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttl: float = 300.0,
+        endpoints: Collection[str] = DEFAULT_CACHED_ENDPOINTS,
+    ):
+        if ttl < 0:
+            raise BlindPayError("Response cache ttl must not be negative")
+
+        self.backend: CacheBackend = backend if backend is not None else MemoryCache()
+        self.ttl = ttl
+        self.endpoints = frozenset(endpoints)
+
+    def applies_to(self, path: str) -> bool:
+        return path_template(path) in self.endpoints
+
+    def get(self, path: str) -> Optional[Any]:
+        return self.backend.get(_key(path))
+
+    def store(self, path: str, data: Any) -> None:
+        if data is not None:
+            self.backend.set(_key(path), data, self.ttl)
+
+    def invalidate(self, path: str) -> None:
+        """Drops the cached responses a write to `path` may have changed, with or without a query string"""
+        segments = path_segments(path)
+        for depth in (len(segments), len(segments) - 1):
+            key = _key(f"/{'/'.join(segments[:depth])}")
+            self.backend.delete(key)
+            self.backend.delete_prefix(f"{key}?")
+
+
+def _key(path: str) -> str:
+    """Keys a response by its path, followed by its query string if it has one"""
+    base, _, query = path.partition("?")
+    return f"response:{base}?{query}" if query else f"response:{base}"
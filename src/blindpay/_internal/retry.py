@@ -0,0 +1,129 @@
+import random
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import FrozenSet, Optional
+
+import httpx
+
+from .error_codes import error_retry_class
+
+# Methods that can be repeated without changing the outcome. POST and PATCH are only
+# replayed when the request carries an Idempotency-Key header.
+IDEMPOTENT_METHODS: FrozenSet[str] = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+RETRYABLE_STATUS_CODES: FrozenSet[int] = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Controls how failed requests are retried.
+
+    Retries wait with exponential backoff and full jitter, i.e. a random delay between zero and
+    `backoff_base * 2 ** retry`, capped at `backoff_max`. A `Retry-After` header on the response
+    takes precedence; if it asks for more than `max_retry_after` seconds the error is returned
+    instead of waiting.
+
+    Args:
+        max_retries: Retries after the first attempt, 0 disables retrying
+        backoff_base: Upper bound in seconds of the first backoff delay
+        backoff_max: Upper bound in seconds of any backoff delay
+        max_retry_after: Longest `Retry-After` in seconds that will be waited for
+        retry_statuses: HTTP status codes that are retried, for errors without a documented `code`. An error
+            with one is retried if the API documents it as retryable, whatever its status.
+    """
+
+    max_retries: int = 2
+    backoff_base: float = 0.5
+    backoff_max: float = 8.0
+    max_retry_after: float = 60.0
+    retry_statuses: FrozenSet[int] = RETRYABLE_STATUS_CODES
+
+    def backoff(self, retry: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**retry))
+
+    def delay_for_response(self, request: httpx.Request, response: httpx.Response, retry: int) -> Optional[float]:
+        """Seconds to wait before retrying after `response`, or None if it should not be retried"""
+        if retry >= self.max_retries or not is_replayable(request):
+            return None
+        if not _is_retryable_error(response.status_code, error_code(response), self.retry_statuses):
+            return None
+
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is None:
+            return self.backoff(retry)
+        if retry_after > self.max_retry_after:
+            return None
+        return retry_after
+
+    def delay_for_exception(self, request: httpx.Request, exc: Exception, retry: int) -> Optional[float]:
+        """Seconds to wait before retrying after `exc`, or None if it should not be retried"""
+        if retry >= self.max_retries or not is_retryable_exception(request, exc):
+            return None
+        return self.backoff(retry)
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+def generate_idempotency_key() -> str:
+    return str(uuid.uuid4())
+
+
+def is_replayable(request: httpx.Request) -> bool:
+    return request.method in IDEMPOTENT_METHODS or IDEMPOTENCY_KEY_HEADER in request.headers
+
+
+def error_code(response: httpx.Response) -> Optional[str]:
+    """The `code` of the error envelope `response` carries, if its body was read and has one"""
+    try:
+        data = response.json()
+    except Exception:
+        return None
+    code = data.get("code") if isinstance(data, dict) else None
+    return code if isinstance(code, str) else None
+
+
+def _is_retryable_error(status_code: int, code: Optional[str], retry_statuses: FrozenSet[int]) -> bool:
+    # The status a code responds with varies per endpoint, the documented retry class of the code does not.
+    retry_class = error_retry_class(code)
+    if retry_class is not None:
+        return retry_class == "retryable"
+    return status_code in retry_statuses
+
+
+def is_retryable_error(request: httpx.Request, status_code: int, code: Optional[str]) -> bool:
+    """Whether sending `request` again may succeed where it failed with `status_code` and error `code`"""
+    return _is_retryable_error(status_code, code, RETRYABLE_STATUS_CODES) and is_replayable(request)
+
+
+def is_retryable_exception(request: httpx.Request, exc: Exception) -> bool:
+    """Whether sending `request` again may succeed where it failed with `exc`"""
+    # The request never reached the server, so it is safe to send again whatever the method.
+    if isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+        return True
+    return isinstance(exc, httpx.TransportError) and is_replayable(request)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a `Retry-After` header given either as delay seconds or as an HTTP date"""
+    if not value:
+        return None
+
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
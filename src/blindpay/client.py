@@ -1,14 +1,63 @@
+import asyncio
 import base64
+import copy
 import hashlib
 import hmac
+import time
+from contextlib import aclosing
 from functools import cached_property
-from typing import TYPE_CHECKING, Any, Dict, Literal, Mapping, Optional, TypeVar
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    Dict,
+    Generator,
+    Iterable,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+)
 
 import httpx
 
-from ._internal.exceptions import BlindPayError
+from ._internal.circuit_breaker import CIRCUIT_OPEN_ERROR_CODE, CircuitBreaker, response_health
+from ._internal.coalescing import CoalescePolicy
+from ._internal.concurrency import OVERLOAD_STATUS_CODES, AdaptiveConcurrencyLimiter
+from ._internal.endpoints import path_template
+from ._internal.exceptions import BlindPayApiError, BlindPayError
+from ._internal.fan_out import (
+    CUSTOMER_RESOURCES,
+    CustomerRef,
+    CustomerResource,
+    CustomerResourceItems,
+    ListForCustomer,
+    ListForCustomerSync,
+    fan_out,
+    fan_out_sync,
+)
+from ._internal.fx_cache import FxRateCache
+from ._internal.hedging import HedgePolicy
+from ._internal.http_cache import CachedResponse, HttpCache
+from ._internal.json_stream import JsonArrayParser
+from ._internal.mirror import MIRRORED_RESOURCES, LocalMirror, MirroredResource, sync_mirror, sync_mirror_sync
+from ._internal.quote_cache import QuoteCache
+from ._internal.rate_limit import RateLimiter
+from ._internal.reference_cache import ReferenceDataCache
+from ._internal.response_cache import ResponseCache
+from ._internal.retry import (
+    DEFAULT_RETRY_POLICY,
+    IDEMPOTENCY_KEY_HEADER,
+    RetryPolicy,
+    is_retryable_error,
+    is_retryable_exception,
+    parse_retry_after,
+)
 from ._version import __version__
-from .types import BlindpayApiResponse
+from .types import BlindpayApiResponse, ErrorResponse
 
 if TYPE_CHECKING:
     from blindpay.resources.available.available import AvailableResource, AvailableResourceSync
@@ -43,16 +92,158 @@ if TYPE_CHECKING:
 
 T = TypeVar("T")
 
+DEFAULT_BASE_URL = "https://api.blindpay.com/v1"
+
+# Exports can take a while to render server side, so reads get a longer budget than connects.
+DEFAULT_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+# Connections are kept alive between calls so consecutive requests skip the TCP connect and TLS handshake.
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+
+HTTP2_NOT_INSTALLED_MESSAGE = "HTTP/2 support requires the h2 package, install it with `pip install blindpay[http2]`"
+
+
+# Codes of errors raised while sending a request, before any response was received.
+TIMEOUT_ERROR_CODE = "timeout"
+CONNECTION_ERROR_CODE = "connection_error"
+NETWORK_ERROR_CODE = "network_error"
+
+REQUEST_ID_HEADER = "X-Request-Id"
+
+
+def _exception_code(e: Exception) -> Optional[str]:
+    if isinstance(e, httpx.TimeoutException):
+        return TIMEOUT_ERROR_CODE
+    if isinstance(e, httpx.ConnectError):
+        return CONNECTION_ERROR_CODE
+    if isinstance(e, httpx.TransportError):
+        return NETWORK_ERROR_CODE
+    return None
+
+
+def _exception_error(e: Exception, request: Optional[httpx.Request] = None) -> ErrorResponse:
+    error: ErrorResponse = {
+        "message": str(e) if str(e) else "Unknown error",
+        "is_retryable": request is not None and is_retryable_exception(request, e),
+    }
+    code = _exception_code(e)
+    if code is not None:
+        error["code"] = code
+    return error
+
+
+def _error_from_exception(e: Exception, request: Optional[httpx.Request] = None) -> BlindpayApiResponse[Any]:
+    return {"data": None, "error": _exception_error(e, request)}
+
+
+def _circuit_open_error(path: str) -> ErrorResponse:
+    return {
+        "message": f"Circuit breaker is open for {path_template(path)}, the request was not sent",
+        "code": CIRCUIT_OPEN_ERROR_CODE,
+        "is_retryable": True,
+    }
+
+
+def _response_error(response: httpx.Response) -> ErrorResponse:
+    error: ErrorResponse = {
+        "message": "Unknown error",
+        "status": response.status_code,
+        "is_retryable": False,
+    }
+    try:
+        error_data = response.json()
+    except Exception:
+        error_data = None
+
+    request_id = response.headers.get(REQUEST_ID_HEADER)
+    if isinstance(error_data, dict):
+        error["message"] = error_data.get("message", "Unknown error")
+        if isinstance(error_data.get("code"), str):
+            error["code"] = error_data["code"]
+        # The error envelope identifies the request with `trace_id`, support asks for it.
+        if isinstance(error_data.get("trace_id"), str):
+            request_id = error_data["trace_id"]
+    if request_id:
+        error["request_id"] = request_id
+    error["is_retryable"] = is_retryable_error(response.request, response.status_code, error.get("code"))
+
+    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+    if retry_after is not None:
+        error["retry_after"] = retry_after
+    return error
+
+
+def _parse_response(response: httpx.Response) -> BlindpayApiResponse[Any]:
+    if response.status_code >= 400:
+        return {"data": None, "error": _response_error(response)}
+
+    try:
+        return {"data": response.json(), "error": None}
+    except Exception as e:
+        return _error_from_exception(e)
+
+
+def _parse_cacheable_response(
+    http_cache: HttpCache, path: str, response: httpx.Response, cached: Optional[CachedResponse]
+) -> BlindpayApiResponse[Any]:
+    if cached is not None and response.status_code == 304:
+        return {"data": http_cache.not_modified(cached), "error": None}
+    result = _parse_response(response)
+    if result["error"] is None:
+        http_cache.store(path, response, result["data"])
+    return result
+
 
 class ApiClientImpl:
-    def __init__(self, base_url: str, headers: Dict[str, str]):
+    def __init__(
+        self,
+        base_url: str,
+        headers: Dict[str, str],
+        *,
+        timeout: Union[float, httpx.Timeout] = DEFAULT_TIMEOUT,
+        limits: httpx.Limits = DEFAULT_LIMITS,
+        http2: bool = False,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        retry: RetryPolicy = DEFAULT_RETRY_POLICY,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        hedging: Optional[HedgePolicy] = None,
+        coalescing: Optional[CoalescePolicy] = None,
+        http_cache: Optional[HttpCache] = None,
+        response_cache: Optional[ResponseCache] = None,
+    ):
         self.base_url = base_url
         self.headers = headers
+        self.retry = retry
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.concurrency_limiter = concurrency_limiter
+        self.hedging = hedging
+        self.coalescing = coalescing
+        self.http_cache = http_cache
+        self.response_cache = response_cache
+        self._in_flight: Dict[str, "asyncio.Task[BlindpayApiResponse[Any]]"] = {}
+        try:
+            self.client = httpx.AsyncClient(
+                base_url=base_url,
+                headers=headers,
+                timeout=timeout,
+                limits=limits,
+                http2=http2,
+                transport=transport,
+            )
+        except ImportError as e:
+            raise BlindPayError(HTTP2_NOT_INSTALLED_MESSAGE) from e
 
     async def get(self, path: str) -> BlindpayApiResponse[T]:
         return await self._request("GET", path)
 
-    async def post(self, path: str, body: Mapping[str, Any]) -> BlindpayApiResponse[T]:
+    async def post(
+        self, path: str, body: Mapping[str, Any], idempotency_key: Optional[str] = None
+    ) -> BlindpayApiResponse[T]:
+        if idempotency_key is not None:
+            return await self._request("POST", path, body, idempotency_key=idempotency_key)
         return await self._request("POST", path, body)
 
     async def put(self, path: str, body: Mapping[str, Any]) -> BlindpayApiResponse[T]:
@@ -69,43 +260,243 @@ class ApiClientImpl:
         method: Literal["GET", "POST", "PUT", "DELETE", "PATCH"],
         path: str,
         body: Optional[Mapping[str, Any]] = None,
+        idempotency_key: Optional[str] = None,
     ) -> BlindpayApiResponse[T]:
-        url = f"{self.base_url}{path}"
-
+        cache = self.response_cache
+        # The cache backend may do blocking I/O, e.g. a SqliteCache, so it is called from a worker thread.
+        if method != "GET":
+            response = await self._fetch(method, path, body, idempotency_key)
+            if cache is not None and response["error"] is None:
+                await asyncio.to_thread(cache.invalidate, path)
+            return response
+        if cache is None or not cache.applies_to(path):
+            return await self._get(path)
+
+        cached = await asyncio.to_thread(cache.get, path)
+        if cached is not None:
+            return {"data": cached, "error": None}
+        response = await self._get(path)
+        if response["error"] is None:
+            await asyncio.to_thread(cache.store, path, response["data"])
+        return response
+
+    async def _get(self, path: str) -> BlindpayApiResponse[Any]:
+        if self.coalescing is not None and self.coalescing.applies_to(path):
+            return await self._coalesced_get(path)
+        return await self._fetch("GET", path)
+
+    async def _coalesced_get(self, path: str) -> BlindpayApiResponse[Any]:
+        shared = self._in_flight.get(path)
+        if shared is None:
+            shared = asyncio.ensure_future(self._fetch("GET", path))
+            self._in_flight[path] = shared
+
+            def forget(task: "asyncio.Task[BlindpayApiResponse[Any]]") -> None:
+                if self._in_flight.get(path) is task:
+                    del self._in_flight[path]
+
+            shared.add_done_callback(forget)
+        # Shielded, so cancelling the caller that started the request does not cancel it for the others. Every
+        # caller, the one that started it included, gets its own copy, so mutating a result cannot affect another.
+        return copy.deepcopy(await asyncio.shield(shared))
+
+    async def _fetch(
+        self,
+        method: Literal["GET", "POST", "PUT", "DELETE", "PATCH"],
+        path: str,
+        body: Optional[Mapping[str, Any]] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> BlindpayApiResponse[Any]:
+        # The key is fixed before the first attempt so every retry replays the same logical call.
+        headers = {IDEMPOTENCY_KEY_HEADER: idempotency_key} if idempotency_key is not None else None
+        http_cache = self.http_cache if method == "GET" else None
+        if http_cache is not None and not http_cache.applies_to(path):
+            http_cache = None
+        cached = http_cache.lookup(path) if http_cache is not None else None
+        if http_cache is not None and cached is not None:
+            headers = http_cache.validators(cached)
         try:
-            async with httpx.AsyncClient() as client:
-                if body is not None:
-                    response = await client.request(method=method, url=url, headers=self.headers, json=body)
-                else:
-                    response = await client.request(method=method, url=url, headers=self.headers)
+            request = self.client.build_request(method=method, url=path, json=body, headers=headers)
+        except Exception as e:
+            return _error_from_exception(e)
 
-                if response.status_code >= 400:
-                    try:
-                        error_data = response.json()
-                        error_message = error_data.get("message", "Unknown error")
-                    except Exception:
-                        error_message = "Unknown error"
+        outcome = await self._send_with_retries(path, request)
+        if not isinstance(outcome, httpx.Response):
+            return {"data": None, "error": outcome}
+        if http_cache is not None:
+            return _parse_cacheable_response(http_cache, path, outcome, cached)
+        return _parse_response(outcome)
 
-                    return {"data": None, "error": {"message": error_message}}
+    async def stream(self, path: str) -> AsyncGenerator[Any, None]:
+        """
+        Makes a GET request and yields the elements of the JSON array it returns as the body arrives.
 
-                data = response.json()
-                return {"data": data, "error": None}
+        Raises:
+            BlindPayApiError: If the request fails or the body is not a complete JSON array
+        """
+        request = self.client.build_request(method="GET", url=path)
+        outcome = await self._send_with_retries(path, request, stream=True)
+        if not isinstance(outcome, httpx.Response):
+            raise BlindPayApiError(outcome)
 
-        except Exception as e:
-            error_message = str(e) if str(e) else "Unknown error"
-            return {"data": None, "error": {"message": error_message}}
+        try:
+            if outcome.status_code >= 400:
+                await outcome.aread()
+                raise BlindPayApiError(_response_error(outcome))
+            parser = JsonArrayParser()
+            async for chunk in outcome.aiter_text():
+                for item in parser.feed(chunk):
+                    yield item
+            parser.close()
+        except (httpx.TransportError, ValueError) as e:
+            raise BlindPayApiError(_exception_error(e)) from e
+        finally:
+            await outcome.aclose()
+
+    async def _send_with_retries(
+        self, path: str, request: httpx.Request, *, stream: bool = False
+    ) -> Union[httpx.Response, ErrorResponse]:
+        """Sends `request` until it succeeds or cannot be retried, returning the last response or an error result"""
+        retry = 0
+        while True:
+            if self.rate_limiter is not None:
+                wait = self.rate_limiter.reserve(path)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            if self.circuit_breaker is not None and not self.circuit_breaker.allow(path):
+                return _circuit_open_error(path)
+            try:
+                # A streamed body is consumed by the caller, so there is nothing to hedge against.
+                if stream:
+                    response = await self._send(path, request, stream=True)
+                else:
+                    response = await self._dispatch(path, request)
+            except Exception as e:
+                delay = self.retry.delay_for_exception(request, e, retry)
+                if delay is None:
+                    return _exception_error(e, request)
+            else:
+                delay = self.retry.delay_for_response(request, response, retry)
+                if delay is None:
+                    return response
+                await response.aclose()
+
+            await asyncio.sleep(delay)
+            retry += 1
+
+    async def _dispatch(self, path: str, request: httpx.Request) -> httpx.Response:
+        hedging = self.hedging
+        if hedging is None or request.method != "GET" or not hedging.applies_to(path):
+            return await self._send(path, request)
+
+        hedging.record_request()
+        attempts = {asyncio.ensure_future(self._send_timed(hedging, path, request))}
+        done, _ = await asyncio.wait(attempts, timeout=hedging.delay(path))
+        # The hedge is a request of its own, so it needs a rate limit token and the circuit breaker's permission too.
+        # It is skipped rather than delayed when no token is free.
+        if (
+            not done
+            and hedging.try_spend()
+            and (self.rate_limiter is None or self.rate_limiter.try_reserve(path))
+            and (self.circuit_breaker is None or self.circuit_breaker.allow(path))
+        ):
+            attempts.add(asyncio.ensure_future(self._send_timed(hedging, path, request)))
+
+        try:
+            while True:
+                done, pending = await asyncio.wait(attempts, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    # A failed attempt only decides the outcome once there is nothing left to wait for.
+                    if attempt.exception() is None or not pending:
+                        return attempt.result()
+                attempts = pending
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+            # Wait for the cancelled attempts to unwind, so they release their concurrency slot before returning.
+            await asyncio.gather(*attempts, return_exceptions=True)
+
+    async def _send_timed(self, hedging: HedgePolicy, path: str, request: httpx.Request) -> httpx.Response:
+        started_at = time.monotonic()
+        response = await self._send(path, request)
+        hedging.record_latency(path, time.monotonic() - started_at)
+        return response
+
+    async def _send(self, path: str, request: httpx.Request, *, stream: bool = False) -> httpx.Response:
+        limiter = self.concurrency_limiter
+        started_at = await limiter.acquire() if limiter is not None else 0.0
+        # Both stay None for a request that ends without an outcome, e.g. a hedge cancelled once the other won.
+        overloaded: Optional[bool] = None
+        healthy: Optional[bool] = None
+        try:
+            response = await self.client.send(request, stream=stream)
+            overloaded = response.status_code in OVERLOAD_STATUS_CODES
+            healthy = response_health(response.status_code)
+            return response
+        except httpx.TransportError as e:
+            overloaded = isinstance(e, httpx.TimeoutException)
+            healthy = False
+            raise
+        finally:
+            if limiter is not None:
+                limiter.release(started_at, overloaded=overloaded)
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record(path, healthy)
+
+    def with_options(self, *, retry: Optional[RetryPolicy] = None) -> "ApiClientImpl":
+        """Returns a copy that shares this client's connection pool but uses the given options"""
+        client = copy.copy(self)
+        if retry is not None:
+            client.retry = retry
+        # The copy may retry differently, so it does not join requests sent by this client.
+        client._in_flight = {}
+        return client
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
 
 
 class ApiClientImplSync:
-    def __init__(self, base_url: str, headers: Dict[str, str]):
+    def __init__(
+        self,
+        base_url: str,
+        headers: Dict[str, str],
+        *,
+        timeout: Union[float, httpx.Timeout] = DEFAULT_TIMEOUT,
+        limits: httpx.Limits = DEFAULT_LIMITS,
+        http2: bool = False,
+        transport: Optional[httpx.BaseTransport] = None,
+        retry: RetryPolicy = DEFAULT_RETRY_POLICY,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        http_cache: Optional[HttpCache] = None,
+        response_cache: Optional[ResponseCache] = None,
+    ):
         self.base_url = base_url
         self.headers = headers
-        self.client = httpx.Client(base_url=base_url, headers=headers)
+        self.retry = retry
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.http_cache = http_cache
+        self.response_cache = response_cache
+        try:
+            self.client = httpx.Client(
+                base_url=base_url,
+                headers=headers,
+                timeout=timeout,
+                limits=limits,
+                http2=http2,
+                transport=transport,
+            )
+        except ImportError as e:
+            raise BlindPayError(HTTP2_NOT_INSTALLED_MESSAGE) from e
 
     def get(self, path: str) -> BlindpayApiResponse[T]:
         return self._request("GET", path)
 
-    def post(self, path: str, body: Mapping[str, Any]) -> BlindpayApiResponse[T]:
+    def post(self, path: str, body: Mapping[str, Any], idempotency_key: Optional[str] = None) -> BlindpayApiResponse[T]:
+        if idempotency_key is not None:
+            return self._request("POST", path, body, idempotency_key=idempotency_key)
         return self._request("POST", path, body)
 
     def put(self, path: str, body: Mapping[str, Any]) -> BlindpayApiResponse[T]:
@@ -122,28 +513,123 @@ class ApiClientImplSync:
         method: Literal["GET", "POST", "PUT", "DELETE", "PATCH"],
         path: str,
         body: Optional[Mapping[str, Any]] = None,
+        idempotency_key: Optional[str] = None,
     ) -> BlindpayApiResponse[T]:
+        cache = self.response_cache
+        if method != "GET":
+            response = self._fetch(method, path, body, idempotency_key)
+            if cache is not None and response["error"] is None:
+                cache.invalidate(path)
+            return response
+        if cache is None or not cache.applies_to(path):
+            return self._fetch("GET", path)
+
+        cached = cache.get(path)
+        if cached is not None:
+            return {"data": cached, "error": None}
+        response = self._fetch("GET", path)
+        if response["error"] is None:
+            cache.store(path, response["data"])
+        return response
+
+    def _fetch(
+        self,
+        method: Literal["GET", "POST", "PUT", "DELETE", "PATCH"],
+        path: str,
+        body: Optional[Mapping[str, Any]] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> BlindpayApiResponse[Any]:
+        # The key is fixed before the first attempt so every retry replays the same logical call.
+        headers = {IDEMPOTENCY_KEY_HEADER: idempotency_key} if idempotency_key is not None else None
+        http_cache = self.http_cache if method == "GET" else None
+        if http_cache is not None and not http_cache.applies_to(path):
+            http_cache = None
+        cached = http_cache.lookup(path) if http_cache is not None else None
+        if http_cache is not None and cached is not None:
+            headers = http_cache.validators(cached)
         try:
-            if body is not None:
-                response = self.client.request(method=method, url=path, json=body)
-            else:
-                response = self.client.request(method=method, url=path)
+            request = self.client.build_request(method=method, url=path, json=body, headers=headers)
+        except Exception as e:
+            return _error_from_exception(e)
 
-            if response.status_code >= 400:
-                try:
-                    error_data = response.json()
-                    error_message = error_data.get("message", "Unknown error")
-                except Exception:
-                    error_message = "Unknown error"
+        outcome = self._send_with_retries(path, request)
+        if not isinstance(outcome, httpx.Response):
+            return {"data": None, "error": outcome}
+        if http_cache is not None:
+            return _parse_cacheable_response(http_cache, path, outcome, cached)
+        return _parse_response(outcome)
 
-                return {"data": None, "error": {"message": error_message}}
+    def stream(self, path: str) -> Generator[Any, None, None]:
+        """
+        Makes a GET request and yields the elements of the JSON array it returns as the body arrives.
 
-            data = response.json()
-            return {"data": data, "error": None}
+        Raises:
+            BlindPayApiError: If the request fails or the body is not a complete JSON array
+        """
+        request = self.client.build_request(method="GET", url=path)
+        outcome = self._send_with_retries(path, request, stream=True)
+        if not isinstance(outcome, httpx.Response):
+            raise BlindPayApiError(outcome)
 
-        except Exception as e:
-            error_message = str(e) if str(e) else "Unknown error"
-            return {"data": None, "error": {"message": error_message}}
+        try:
+            if outcome.status_code >= 400:
+                outcome.read()
+                raise BlindPayApiError(_response_error(outcome))
+            parser = JsonArrayParser()
+            for chunk in outcome.iter_text():
+                yield from parser.feed(chunk)
+            parser.close()
+        except (httpx.TransportError, ValueError) as e:
+            raise BlindPayApiError(_exception_error(e)) from e
+        finally:
+            outcome.close()
+
+    def _send_with_retries(
+        self, path: str, request: httpx.Request, *, stream: bool = False
+    ) -> Union[httpx.Response, ErrorResponse]:
+        """Sends `request` until it succeeds or cannot be retried, returning the last response or an error result"""
+        retry = 0
+        while True:
+            if self.rate_limiter is not None:
+                wait = self.rate_limiter.reserve(path)
+                if wait > 0:
+                    time.sleep(wait)
+            if self.circuit_breaker is not None and not self.circuit_breaker.allow(path):
+                return _circuit_open_error(path)
+            try:
+                response = self._send(path, request, stream=stream)
+            except Exception as e:
+                delay = self.retry.delay_for_exception(request, e, retry)
+                if delay is None:
+                    return _exception_error(e, request)
+            else:
+                delay = self.retry.delay_for_response(request, response, retry)
+                if delay is None:
+                    return response
+                response.close()
+
+            time.sleep(delay)
+            retry += 1
+
+    def _send(self, path: str, request: httpx.Request, *, stream: bool = False) -> httpx.Response:
+        healthy: Optional[bool] = None
+        try:
+            response = self.client.send(request, stream=stream)
+            healthy = response_health(response.status_code)
+            return response
+        except httpx.TransportError:
+            healthy = False
+            raise
+        finally:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record(path, healthy)
+
+    def with_options(self, *, retry: Optional[RetryPolicy] = None) -> "ApiClientImplSync":
+        """Returns a copy that shares this client's connection pool but uses the given options"""
+        client = copy.copy(self)
+        if retry is not None:
+            client.retry = retry
+        return client
 
     def close(self) -> None:
         self.client.close()
@@ -177,21 +663,29 @@ class _InstancesNamespace:
 
 
 class _PayinsNamespace:
-    def __init__(self, instance_id: str, api_client: ApiClientImpl) -> None:
+    def __init__(
+        self,
+        instance_id: str,
+        api_client: ApiClientImpl,
+        quote_cache: Optional[QuoteCache],
+        fx_cache: Optional[FxRateCache],
+    ) -> None:
         self._instance_id = instance_id
         self._api = api_client
+        self._quote_cache = quote_cache
+        self._fx_cache = fx_cache
 
     @cached_property
     def _base(self) -> "PayinsResource":
         from blindpay.resources.payins.payins import create_payins_resource
 
-        return create_payins_resource(self._instance_id, self._api)
+        return create_payins_resource(self._instance_id, self._api, self._quote_cache)
 
     @cached_property
     def quotes(self) -> "PayinQuotesResource":
         from blindpay.resources.payins.quotes import create_payin_quotes_resource
 
-        return create_payin_quotes_resource(self._instance_id, self._api)
+        return create_payin_quotes_resource(self._instance_id, self._api, self._quote_cache, self._fx_cache)
 
     def __getattr__(self, name: str) -> Any:
         return getattr(self._base, name)
@@ -246,8 +740,32 @@ class BlindPay:
     _api_key: str
     _instance_id: str
     _base_url: str
+    _reference_cache: Optional[ReferenceDataCache]
+    _quote_cache: Optional[QuoteCache]
+    _fx_cache: Optional[FxRateCache]
 
-    def __init__(self, *, api_key: str, instance_id: str):
+    def __init__(
+        self,
+        *,
+        api_key: str,
+        instance_id: str,
+        base_url: str = DEFAULT_BASE_URL,
+        timeout: Union[float, httpx.Timeout] = DEFAULT_TIMEOUT,
+        pool_limits: httpx.Limits = DEFAULT_LIMITS,
+        http2: bool = False,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        retry: RetryPolicy = DEFAULT_RETRY_POLICY,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        hedging: Optional[HedgePolicy] = None,
+        coalescing: Optional[CoalescePolicy] = None,
+        reference_cache: Optional[ReferenceDataCache] = None,
+        quote_cache: Optional[QuoteCache] = None,
+        fx_cache: Optional[FxRateCache] = None,
+        http_cache: Optional[HttpCache] = None,
+        response_cache: Optional[ResponseCache] = None,
+    ):
         if not api_key:
             raise BlindPayError("Api key not provided, get your api key on blindpay dashboard")
 
@@ -256,7 +774,10 @@ class BlindPay:
 
         self._api_key = api_key
         self._instance_id = instance_id
-        self._base_url = "https://api.blindpay.com/v1"
+        self._base_url = base_url.rstrip("/")
+        self._reference_cache = reference_cache
+        self._quote_cache = quote_cache
+        self._fx_cache = fx_cache
 
         self._headers = {
             "Content-Type": "application/json",
@@ -265,13 +786,48 @@ class BlindPay:
             "Authorization": f"Bearer {self._api_key}",
         }
 
-        self._api = ApiClientImpl(self._base_url, self._headers)
+        self._api = ApiClientImpl(
+            self._base_url,
+            self._headers,
+            timeout=timeout,
+            limits=pool_limits,
+            http2=http2,
+            transport=transport,
+            retry=retry,
+            rate_limiter=rate_limiter,
+            circuit_breaker=circuit_breaker,
+            concurrency_limiter=concurrency_limiter,
+            hedging=hedging,
+            coalescing=coalescing,
+            http_cache=http_cache,
+            response_cache=response_cache,
+        )
+
+    def with_options(self, *, retry: Optional[RetryPolicy] = None) -> "BlindPay":
+        """
+        Returns a copy of the client with some options overridden, e.g. to change the retry policy for a few calls
+
+        The copy shares the connection pool of this client, so only the original needs to be closed.
+
+        Args:
+            retry: Retry policy to use instead of the one the client was created with
+        """
+        client = object.__new__(BlindPay)
+        client._api_key = self._api_key
+        client._instance_id = self._instance_id
+        client._base_url = self._base_url
+        client._reference_cache = self._reference_cache
+        client._quote_cache = self._quote_cache
+        client._fx_cache = self._fx_cache
+        client._headers = self._headers
+        client._api = self._api.with_options(retry=retry)
+        return client
 
     @cached_property
     def available(self) -> "AvailableResource":
         from blindpay.resources.available import create_available_resource
 
-        return create_available_resource(self._api)
+        return create_available_resource(self._api, self._reference_cache)
 
     @cached_property
     def instances(self) -> _InstancesNamespace:
@@ -291,19 +847,19 @@ class BlindPay:
 
     @cached_property
     def payins(self) -> _PayinsNamespace:
-        return _PayinsNamespace(self._instance_id, self._api)
+        return _PayinsNamespace(self._instance_id, self._api, self._quote_cache, self._fx_cache)
 
     @cached_property
     def quotes(self) -> "QuotesResource":
         from blindpay.resources.quotes import create_quotes_resource
 
-        return create_quotes_resource(self._instance_id, self._api)
+        return create_quotes_resource(self._instance_id, self._api, self._quote_cache, self._fx_cache)
 
     @cached_property
     def payouts(self) -> "PayoutsResource":
         from blindpay.resources.payouts import create_payouts_resource
 
-        return create_payouts_resource(self._instance_id, self._api)
+        return create_payouts_resource(self._instance_id, self._api, self._quote_cache)
 
     @cached_property
     def customers(self) -> _CustomersNamespace:
@@ -349,6 +905,75 @@ class BlindPay:
 
         return create_terms_of_service_resource(self._instance_id, self._api)
 
+    async def list_customer_resources(
+        self,
+        customers: Union[AsyncIterable[CustomerRef], Iterable[CustomerRef]],
+        resources: Sequence[CustomerResource] = CUSTOMER_RESOURCES,
+        *,
+        concurrency: int = 8,
+    ) -> AsyncGenerator[CustomerResourceItems, None]:
+        """
+        Lists bank accounts, wallets and virtual accounts for many customers at once
+
+        Customers are taken from `customers` as slots free up, so a customer stream such as
+        `customers.list_all()` is never read far ahead and memory stays bounded.
+
+        Args:
+            customers: Customers or customer ids
+            resources: Sub-resources to list for every customer, all of them by default
+            concurrency: Customers whose sub-resources are being listed at the same time
+
+        Yields:
+            `(customer_id, resource, items)` for every customer and resource, in the order of `customers`
+
+        Raises:
+            BlindPayApiError: If a list cannot be fetched
+        """
+        lists: Dict[CustomerResource, ListForCustomer] = {
+            "bank_accounts": self.customers.bank_accounts.list,
+            "blockchain_wallets": self.wallets.blockchain.list,
+            "custodial_wallets": self.wallets.custodial.list,
+            "virtual_accounts": self.virtual_accounts.list,
+        }
+
+        async def list_offramp_wallets(customer_id: str, bank_account_id: str) -> BlindpayApiResponse[Any]:
+            return await self.wallets.offramp.list({"customer_id": customer_id, "bank_account_id": bank_account_id})
+
+        # Closed along with this generator, so stopping early cancels the lists still in flight right away.
+        async with aclosing(fan_out(customers, resources, concurrency, lists, list_offramp_wallets)) as results:
+            async for result in results:
+                yield result
+
+    async def sync_mirror(
+        self, mirror: LocalMirror, resources: Iterable[MirroredResource] = MIRRORED_RESOURCES, *, full: bool = False
+    ) -> Dict[MirroredResource, int]:
+        """
+        Brings a local mirror of payouts, payins, transfers and customers up to date
+
+        Pages are fetched newest first until one holds no record updated since the last sync, so after the first
+        sync a run costs a few requests. Changes to records older than that page, e.g. a refund of an old payout,
+        are only picked up with `full=True`. Each resource is written in one transaction: a failed sync leaves it
+        as it was.
+
+        Args:
+            mirror: Mirror to update
+            resources: Resources to sync, all of them by default
+            full: Walk every page, to also pick up changes to older records
+
+        Returns:
+            The number of new or changed records per resource
+
+        Raises:
+            BlindPayApiError: If a page cannot be fetched
+        """
+        lists = {
+            "payouts": self.payouts.list,
+            "payins": self.payins.list,
+            "transfers": self.transfers.list,
+            "customers": self.customers.list,
+        }
+        return await sync_mirror(mirror, {resource: lists[resource] for resource in resources}, full)
+
     def verify_webhook_signature(
         self, *, secret: str, id: str, timestamp: str, payload: str, svix_signature: str
     ) -> bool:
@@ -384,6 +1009,18 @@ class BlindPay:
             svix_signature, expected_signature
         )
 
+    async def aclose(self) -> None:
+        if hasattr(self, "_api"):
+            await self._api.aclose()
+
+    async def __aenter__(self) -> "BlindPay":
+        return self
+
+    async def __aexit__(
+        self, exc_type: Optional[type], exc_val: Optional[BaseException], exc_tb: Optional[Any]
+    ) -> None:
+        await self.aclose()
+
 
 class _InstancesNamespaceSync:
     def __init__(self, instance_id: str, api_client: ApiClientImplSync) -> None:
@@ -413,21 +1050,29 @@ class _InstancesNamespaceSync:
 
 
 class _PayinsNamespaceSync:
-    def __init__(self, instance_id: str, api_client: ApiClientImplSync) -> None:
+    def __init__(
+        self,
+        instance_id: str,
+        api_client: ApiClientImplSync,
+        quote_cache: Optional[QuoteCache],
+        fx_cache: Optional[FxRateCache],
+    ) -> None:
         self._instance_id = instance_id
         self._api = api_client
+        self._quote_cache = quote_cache
+        self._fx_cache = fx_cache
 
     @cached_property
     def _base(self) -> "PayinsResourceSync":
         from blindpay.resources.payins.payins import create_payins_resource_sync
 
-        return create_payins_resource_sync(self._instance_id, self._api)
+        return create_payins_resource_sync(self._instance_id, self._api, self._quote_cache)
 
     @cached_property
     def quotes(self) -> "PayinQuotesResourceSync":
         from blindpay.resources.payins.quotes import create_payin_quotes_resource_sync
 
-        return create_payin_quotes_resource_sync(self._instance_id, self._api)
+        return create_payin_quotes_resource_sync(self._instance_id, self._api, self._quote_cache, self._fx_cache)
 
     def __getattr__(self, name: str) -> Any:
         return getattr(self._base, name)
@@ -482,8 +1127,29 @@ class BlindPaySync:
     _api_key: str
     _instance_id: str
     _base_url: str
+    _reference_cache: Optional[ReferenceDataCache]
+    _quote_cache: Optional[QuoteCache]
+    _fx_cache: Optional[FxRateCache]
 
-    def __init__(self, *, api_key: str, instance_id: str):
+    def __init__(
+        self,
+        *,
+        api_key: str,
+        instance_id: str,
+        base_url: str = DEFAULT_BASE_URL,
+        timeout: Union[float, httpx.Timeout] = DEFAULT_TIMEOUT,
+        pool_limits: httpx.Limits = DEFAULT_LIMITS,
+        http2: bool = False,
+        transport: Optional[httpx.BaseTransport] = None,
+        retry: RetryPolicy = DEFAULT_RETRY_POLICY,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        reference_cache: Optional[ReferenceDataCache] = None,
+        quote_cache: Optional[QuoteCache] = None,
+        fx_cache: Optional[FxRateCache] = None,
+        http_cache: Optional[HttpCache] = None,
+        response_cache: Optional[ResponseCache] = None,
+    ):
         if not api_key:
             raise BlindPayError("Api key not provided, get your api key on blindpay dashboard")
 
@@ -492,7 +1158,10 @@ class BlindPaySync:
 
         self._api_key = api_key
         self._instance_id = instance_id
-        self._base_url = "https://api.blindpay.com/v1"
+        self._base_url = base_url.rstrip("/")
+        self._reference_cache = reference_cache
+        self._quote_cache = quote_cache
+        self._fx_cache = fx_cache
 
         self._headers = {
             "Content-Type": "application/json",
@@ -501,13 +1170,45 @@ class BlindPaySync:
             "Authorization": f"Bearer {self._api_key}",
         }
 
-        self._api = ApiClientImplSync(self._base_url, self._headers)
+        self._api = ApiClientImplSync(
+            self._base_url,
+            self._headers,
+            timeout=timeout,
+            limits=pool_limits,
+            http2=http2,
+            transport=transport,
+            retry=retry,
+            rate_limiter=rate_limiter,
+            circuit_breaker=circuit_breaker,
+            http_cache=http_cache,
+            response_cache=response_cache,
+        )
+
+    def with_options(self, *, retry: Optional[RetryPolicy] = None) -> "BlindPaySync":
+        """
+        Returns a copy of the client with some options overridden, e.g. to change the retry policy for a few calls
+
+        The copy shares the connection pool of this client, so only the original needs to be closed.
+
+        Args:
+            retry: Retry policy to use instead of the one the client was created with
+        """
+        client = object.__new__(BlindPaySync)
+        client._api_key = self._api_key
+        client._instance_id = self._instance_id
+        client._base_url = self._base_url
+        client._reference_cache = self._reference_cache
+        client._quote_cache = self._quote_cache
+        client._fx_cache = self._fx_cache
+        client._headers = self._headers
+        client._api = self._api.with_options(retry=retry)
+        return client
 
     @cached_property
     def available(self) -> "AvailableResourceSync":
         from blindpay.resources.available import create_available_resource_sync
 
-        return create_available_resource_sync(self._api)
+        return create_available_resource_sync(self._api, self._reference_cache)
 
     @cached_property
     def instances(self) -> _InstancesNamespaceSync:
@@ -527,19 +1228,19 @@ class BlindPaySync:
 
     @cached_property
     def payins(self) -> _PayinsNamespaceSync:
-        return _PayinsNamespaceSync(self._instance_id, self._api)
+        return _PayinsNamespaceSync(self._instance_id, self._api, self._quote_cache, self._fx_cache)
 
     @cached_property
     def quotes(self) -> "QuotesResourceSync":
         from blindpay.resources.quotes import create_quotes_resource_sync
 
-        return create_quotes_resource_sync(self._instance_id, self._api)
+        return create_quotes_resource_sync(self._instance_id, self._api, self._quote_cache, self._fx_cache)
 
     @cached_property
     def payouts(self) -> "PayoutsResourceSync":
         from blindpay.resources.payouts import create_payouts_resource_sync
 
-        return create_payouts_resource_sync(self._instance_id, self._api)
+        return create_payouts_resource_sync(self._instance_id, self._api, self._quote_cache)
 
     @cached_property
     def customers(self) -> _CustomersNamespaceSync:
@@ -585,6 +1286,72 @@ class BlindPaySync:
 
         return create_terms_of_service_resource_sync(self._instance_id, self._api)
 
+    def list_customer_resources(
+        self,
+        customers: Iterable[CustomerRef],
+        resources: Sequence[CustomerResource] = CUSTOMER_RESOURCES,
+        *,
+        concurrency: int = 8,
+    ) -> Generator[CustomerResourceItems, None, None]:
+        """
+        Lists bank accounts, wallets and virtual accounts for many customers at once
+
+        Customers are listed from a thread pool and taken from `customers` as slots free up, so a customer stream
+        such as `customers.list_all()` is never read far ahead and memory stays bounded.
+
+        Args:
+            customers: Customers or customer ids
+            resources: Sub-resources to list for every customer, all of them by default
+            concurrency: Customers whose sub-resources are being listed at the same time
+
+        Yields:
+            `(customer_id, resource, items)` for every customer and resource, in the order of `customers`
+
+        Raises:
+            BlindPayApiError: If a list cannot be fetched
+        """
+        lists: Dict[CustomerResource, ListForCustomerSync] = {
+            "bank_accounts": self.customers.bank_accounts.list,
+            "blockchain_wallets": self.wallets.blockchain.list,
+            "custodial_wallets": self.wallets.custodial.list,
+            "virtual_accounts": self.virtual_accounts.list,
+        }
+
+        def list_offramp_wallets(customer_id: str, bank_account_id: str) -> BlindpayApiResponse[Any]:
+            return self.wallets.offramp.list({"customer_id": customer_id, "bank_account_id": bank_account_id})
+
+        yield from fan_out_sync(customers, resources, concurrency, lists, list_offramp_wallets)
+
+    def sync_mirror(
+        self, mirror: LocalMirror, resources: Iterable[MirroredResource] = MIRRORED_RESOURCES, *, full: bool = False
+    ) -> Dict[MirroredResource, int]:
+        """
+        Brings a local mirror of payouts, payins, transfers and customers up to date
+
+        Pages are fetched newest first until one holds no record updated since the last sync, so after the first
+        sync a run costs a few requests. Changes to records older than that page, e.g. a refund of an old payout,
+        are only picked up with `full=True`. Each resource is written in one transaction: a failed sync leaves it
+        as it was.
+
+        Args:
+            mirror: Mirror to update
+            resources: Resources to sync, all of them by default
+            full: Walk every page, to also pick up changes to older records
+
+        Returns:
+            The number of new or changed records per resource
+
+        Raises:
+            BlindPayApiError: If a page cannot be fetched
+        """
+        lists = {
+            "payouts": self.payouts.list,
+            "payins": self.payins.list,
+            "transfers": self.transfers.list,
+            "customers": self.customers.list,
+        }
+        return sync_mirror_sync(mirror, {resource: lists[resource] for resource in resources}, full)
+
     def verify_webhook_signature(
         self, *, secret: str, id: str, timestamp: str, payload: str, svix_signature: str
     ) -> bool:
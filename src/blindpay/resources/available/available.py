@@ -1,9 +1,12 @@
-from typing import List, Literal, Optional
+import asyncio
+import threading
+from typing import Any, List, Literal, Optional, Set
 
 from typing_extensions import TypedDict
 
 from ..._internal.api_client import InternalApiClient, InternalApiClientSync
-from ...types import BlindpayApiResponse, Rail
+from ..._internal.reference_cache import ReferenceDataCache
+from ...types import BlindpayApiResponse, ErrorResponse, Rail
 
 BankDetailKey = Literal[
     "type",
@@ -104,44 +107,132 @@ GetNaicsCodesResponse = List[NaicsCode]
 
 
 class AvailableResource:
-    def __init__(self, client: InternalApiClient):
+    def __init__(self, client: InternalApiClient, cache: Optional[ReferenceDataCache] = None):
         self._client = client
+        self._cache = cache
+        self._refreshes: Set["asyncio.Task[None]"] = set()
+
+    async def _get(self, path: str) -> BlindpayApiResponse[Any]:
+        if self._cache is None:
+            return await self._client.get(path)
+
+        # A lookup may read a cache backend, e.g. a SqliteCache, so it runs in a thread like `store`.
+        state, data = await asyncio.to_thread(self._cache.lookup, path)
+        if state == "miss":
+            return await self._fetch(path)
+        if state == "stale" and self._cache.start_refresh(path):
+            refresh = asyncio.ensure_future(self._refresh(path))
+            # The loop only keeps weak references to tasks.
+            self._refreshes.add(refresh)
+            refresh.add_done_callback(self._refreshes.discard)
+        return {"data": data, "error": None}
+
+    async def _fetch(self, path: str) -> BlindpayApiResponse[Any]:
+        response: BlindpayApiResponse[Any] = await self._client.get(path)
+        if self._cache is not None and response["error"] is None:
+            # Storing writes a file or a cache backend, so it runs in a thread to keep the loop free.
+            await asyncio.to_thread(self._cache.store, path, response["data"])
+        return response
+
+    async def _refresh(self, path: str) -> None:
+        try:
+            await self._fetch(path)
+        finally:
+            if self._cache is not None:
+                self._cache.end_refresh(path)
+
+    async def warm(self) -> Optional[ErrorResponse]:
+        """
+        Loads the rails, the bank details of every rail and the NAICS codes into the cache, e.g. at startup
+
+        Returns:
+            The first error met, or None if everything was loaded
+        """
+        rails, naics = await asyncio.gather(self._fetch("/available/rails"), self._fetch("/available/naics"))
+        responses = [rails, naics]
+        if rails["data"] is not None:
+            responses += await asyncio.gather(
+                *(self._fetch(f"/available/bank-details?rail={rail['value']}") for rail in rails["data"])
+            )
+        return next((response["error"] for response in responses if response["error"] is not None), None)
 
     async def get_bank_details(self, rail: Rail) -> BlindpayApiResponse[GetBankDetailsResponse]:
-        return await self._client.get(f"/available/bank-details?rail={rail}")
+        return await self._get(f"/available/bank-details?rail={rail}")
 
     async def get_rails(self) -> BlindpayApiResponse[GetRailsResponse]:
-        return await self._client.get("/available/rails")
+        return await self._get("/available/rails")
 
     async def get_swift_code_bank_details(self, swift: str) -> BlindpayApiResponse[GetSwiftCodeBankDetailsResponse]:
-        return await self._client.get(f"/available/swift/{swift}")
+        return await self._get(f"/available/swift/{swift}")
 
     async def get_naics_codes(self) -> BlindpayApiResponse[GetNaicsCodesResponse]:
-        return await self._client.get("/available/naics")
+        return await self._get("/available/naics")
 
 
 class AvailableResourceSync:
     """Synchronous version of AvailableResource"""
 
-    def __init__(self, client: InternalApiClientSync):
+    def __init__(self, client: InternalApiClientSync, cache: Optional[ReferenceDataCache] = None):
         self._client = client
+        self._cache = cache
+
+    def _get(self, path: str) -> BlindpayApiResponse[Any]:
+        if self._cache is None:
+            return self._client.get(path)
+
+        state, data = self._cache.lookup(path)
+        if state == "miss":
+            return self._fetch(path)
+        if state == "stale" and self._cache.start_refresh(path):
+            threading.Thread(target=self._refresh, args=(path,), name="blindpay-cache-refresh", daemon=True).start()
+        return {"data": data, "error": None}
+
+    def _fetch(self, path: str) -> BlindpayApiResponse[Any]:
+        response: BlindpayApiResponse[Any] = self._client.get(path)
+        if self._cache is not None and response["error"] is None:
+            self._cache.store(path, response["data"])
+        return response
+
+    def _refresh(self, path: str) -> None:
+        try:
+            self._fetch(path)
+        finally:
+            if self._cache is not None:
+                self._cache.end_refresh(path)
+
+    def warm(self) -> Optional[ErrorResponse]:
+        """
+        Loads the rails, the bank details of every rail and the NAICS codes into the cache, e.g. at startup
+
+        Returns:
+            The first error met, or None if everything was loaded
+        """
+        rails = self._fetch("/available/rails")
+        responses = [rails, self._fetch("/available/naics")]
+        if rails["data"] is not None:
+            responses += [self._fetch(f"/available/bank-details?rail={rail['value']}") for rail in rails["data"]]
+        return next((response["error"] for response in responses if response["error"] is not None), None)
 
     def get_bank_details(self, rail: Rail) -> BlindpayApiResponse[GetBankDetailsResponse]:
-        return self._client.get(f"/available/bank-details?rail={rail}")
+        return self._get(f"/available/bank-details?rail={rail}")
 
     def get_rails(self) -> BlindpayApiResponse[GetRailsResponse]:
-        return self._client.get("/available/rails")
+        return self._get("/available/rails")
 
     def get_swift_code_bank_details(self, swift: str) -> BlindpayApiResponse[GetSwiftCodeBankDetailsResponse]:
-        return self._client.get(f"/available/swift/{swift}")
+        return self._get(f"/available/swift/{swift}")
 
     def get_naics_codes(self) -> BlindpayApiResponse[GetNaicsCodesResponse]:
-        return self._client.get("/available/naics")
+        return self._get("/available/naics")
 
 
-def create_available_resource(client: InternalApiClient) -> AvailableResource:
-    return AvailableResource(client)
+def create_available_resource(
+    client: InternalApiClient, cache: Optional[ReferenceDataCache] = None
+) -> AvailableResource:
+    return AvailableResource(client, cache)
 
 
-def create_available_resource_sync(client: InternalApiClientSync) -> AvailableResourceSync:
-    return AvailableResourceSync(client)
+def create_available_resource_sync(
+    client: InternalApiClientSync, cache: Optional[ReferenceDataCache] = None
+) -> AvailableResourceSync:
+    return AvailableResourceSync(client, cache)
@@ -1,9 +1,12 @@
-from typing import List, Optional, Union
+from typing import Any, AsyncGenerator, Dict, Generator, Iterable, List, Optional, Sequence, Union, get_args
 from urllib.parse import urlencode
 
 from typing_extensions import Literal, NotRequired, TypedDict
 
 from ..._internal.api_client import InternalApiClient, InternalApiClientSync
+from ..._internal.batch import DEFAULT_BATCH_CONCURRENCY, get_many, get_many_sync
+from ..._internal.exceptions import BlindPayError
+from ..._internal.pagination import paginate, paginate_shards, paginate_shards_sync, paginate_sync
 from ...types import (
     BlindpayApiResponse,
     Country,
@@ -611,6 +614,20 @@ class ListCustomersInput(PaginationParams, total=False):
 GetCustomerResponse = Union[IndividualWithStandardKYC, IndividualWithEnhancedKYC, BusinessWithStandardKYB]
 
 
+CustomerShardKey = Literal["status", "country"]
+
+_SHARD_VALUES = {"status": get_args(CustomerStatus), "country": get_args(Country)}
+
+
+def _customer_shards(
+    shard_by: CustomerShardKey, params: Optional[ListCustomersInput], shards: Optional[Sequence[str]]
+) -> List[Dict[str, Any]]:
+    if params and params.get(shard_by) is not None:
+        raise BlindPayError(f"Cannot shard by {shard_by} while also filtering by it, pass the values as shards")
+    values = shards if shards is not None else _SHARD_VALUES[shard_by]
+    return [{**(params or {}), shard_by: value} for value in values]
+
+
 class OwnerUpdate(TypedDict):
     id: str
     first_name: str
@@ -746,6 +763,51 @@ class CustomersResource:
                 query_string = f"?{urlencode(filtered_params)}"
         return await self._client.get(f"/instances/{self._instance_id}/customers{query_string}")
 
+    async def list_all(
+        self, params: Optional[ListCustomersInput] = None, *, prefetch: int = 0
+    ) -> AsyncGenerator[GetCustomerResponse, None]:
+        """
+        Iterates over every customer across all pages.
+
+        Args:
+            params: Filters, `limit` sets the page size and defaults to "1000", `starting_after` resumes
+                after the given customer
+            prefetch: Pages to fetch ahead of the one being iterated, so the next page loads while this one is
+                processed; 0 fetches each page only once it is reached
+
+        Raises:
+            BlindPayApiError: If a page cannot be fetched
+        """
+        async for customer in paginate(self.list, params, prefetch):
+            yield customer
+
+    async def list_all_sharded(
+        self,
+        shard_by: CustomerShardKey = "status",
+        params: Optional[ListCustomersInput] = None,
+        *,
+        shards: Optional[Sequence[str]] = None,
+        concurrency: int = 4,
+    ) -> AsyncGenerator[GetCustomerResponse, None]:
+        """
+        Iterates over every customer, walking one filtered list per shard concurrently instead of a single cursor.
+
+        Every value of `shard_by` becomes a shard, e.g. one list per customer status. Customers of the same shard
+        come in list order, but shards are interleaved. A customer is only listed if its `shard_by` value is one of
+        the shards.
+
+        Args:
+            shard_by: Filter that partitions the customers, "status" or "country"
+            params: Other filters, applied to every shard
+            shards: Values of `shard_by` to walk, every status or country by default
+            concurrency: Shards walked at the same time
+
+        Raises:
+            BlindPayApiError: If a page cannot be fetched
+        """
+        async for customer in paginate_shards(self.list, _customer_shards(shard_by, params, shards), concurrency):
+            yield customer
+
     async def create_individual_with_standard_kyc(
         self, data: CreateIndividualWithStandardKYCInput
     ) -> BlindpayApiResponse[CreateIndividualWithStandardKYCResponse]:
@@ -767,6 +829,22 @@ class CustomersResource:
     async def get(self, customer_id: str) -> BlindpayApiResponse[GetCustomerResponse]:
         return await self._client.get(f"/instances/{self._instance_id}/customers/{customer_id}")
 
+    async def get_many(
+        self, customer_ids: Iterable[str], concurrency: int = DEFAULT_BATCH_CONCURRENCY
+    ) -> List[BlindpayApiResponse[GetCustomerResponse]]:
+        """
+        Fetches many customers at once, with up to `concurrency` requests in flight over the shared connection pool.
+
+        Args:
+            customer_ids: Ids to fetch, duplicates are only requested once
+            concurrency: Requests in flight at the same time
+
+        Returns:
+            One response per id, in the order of `customer_ids`; a customer that could not be fetched has its error in
+            its own response
+        """
+        return await get_many(self.get, customer_ids, concurrency)
+
     async def update(self, data: UpdateCustomerInput) -> BlindpayApiResponse[None]:
         customer_id = data["customer_id"]
         payload = {k: v for k, v in data.items() if k != "customer_id"}
@@ -808,6 +886,49 @@ class CustomersResourceSync:
                 query_string = f"?{urlencode(filtered_params)}"
         return self._client.get(f"/instances/{self._instance_id}/customers{query_string}")
 
+    def list_all(
+        self, params: Optional[ListCustomersInput] = None, *, prefetch: int = 0
+    ) -> Generator[GetCustomerResponse, None, None]:
+        """
+        Iterates over every customer across all pages.
+
+        Args:
+            params: Filters, `limit` sets the page size and defaults to "1000", `starting_after` resumes
+                after the given customer
+            prefetch: Pages to fetch ahead of the one being iterated, so the next page loads while this one is
+                processed; 0 fetches each page only once it is reached
+
+        Raises:
+            BlindPayApiError: If a page cannot be fetched
+        """
+        yield from paginate_sync(self.list, params, prefetch)
+
+    def list_all_sharded(
+        self,
+        shard_by: CustomerShardKey = "status",
+        params: Optional[ListCustomersInput] = None,
+        *,
+        shards: Optional[Sequence[str]] = None,
+        concurrency: int = 4,
+    ) -> Generator[GetCustomerResponse, None, None]:
+        """
+        Iterates over every customer, walking one filtered list per shard concurrently instead of a single cursor.
+
+        Every value of `shard_by` becomes a shard, e.g. one list per customer status. Customers of the same shard
+        come in list order, but shards are interleaved. A customer is only listed if its `shard_by` value is one of
+        the shards.
+
+        Args:
+            shard_by: Filter that partitions the customers, "status" or "country"
+            params: Other filters, applied to every shard
+            shards: Values of `shard_by` to walk, every status or country by default
+            concurrency: Shards walked at the same time
+
+        Raises:
+            BlindPayApiError: If a page cannot be fetched
+        """
+        yield from paginate_shards_sync(self.list, _customer_shards(shard_by, params, shards), concurrency)
+
     def create_individual_with_standard_kyc(
         self, data: CreateIndividualWithStandardKYCInput
     ) -> BlindpayApiResponse[CreateIndividualWithStandardKYCResponse]:
@@ -829,6 +950,22 @@ class CustomersResourceSync:
     def get(self, customer_id: str) -> BlindpayApiResponse[GetCustomerResponse]:
         return self._client.get(f"/instances/{self._instance_id}/customers/{customer_id}")
 
+    def get_many(
+        self, customer_ids: Iterable[str], concurrency: int = DEFAULT_BATCH_CONCURRENCY
+    ) -> List[BlindpayApiResponse[GetCustomerResponse]]:
+        """
+        Fetches many customers at once, with up to `concurrency` requests in flight over the shared connection pool.
+
+        Args:
+            customer_ids: Ids to fetch, duplicates are only requested once
+            concurrency: Requests in flight at the same time
+
+        Returns:
+            One response per id, in the order of `customer_ids`; a customer that could not be fetched has its error in
+            its own response
+        """
+        return get_many_sync(self.get, customer_ids, concurrency)
+
     def update(self, data: UpdateCustomerInput) -> BlindpayApiResponse[None]:
         customer_id = data["customer_id"]
         payload = {k: v for k, v in data.items() if k != "customer_id"}
@@ -1,7 +1,19 @@
-from typing import List, NotRequired, Optional, TypedDict
+from typing import AsyncGenerator, Generator, Iterable, List, NotRequired, Optional, TypedDict
 from urllib.parse import urlencode
 
 from ..._internal.api_client import InternalApiClient, InternalApiClientSync
+from ..._internal.batch import DEFAULT_BATCH_CONCURRENCY, get_many, get_many_sync
+from ..._internal.file_export import (
+    ExportFile,
+    ExportFormat,
+    ExportPath,
+    export_by_offset,
+    export_by_offset_sync,
+    record_columns,
+)
+from ..._internal.pagination import paginate, paginate_sync
+from ..._internal.quote_cache import QuoteCache
+from ..._internal.retry import generate_idempotency_key
 from ...types import (
     BlindpayApiResponse,
     ManualExecutionStatus,
@@ -199,9 +211,10 @@ class CreateEvmPayinResponse(TypedDict):
 
 
 class PayinsResource:
-    def __init__(self, instance_id: str, client: InternalApiClient):
+    def __init__(self, instance_id: str, client: InternalApiClient, quote_cache: Optional[QuoteCache] = None):
         self._instance_id = instance_id
         self._client = client
+        self._quote_cache = quote_cache
 
     async def list(self, params: Optional[ListPayinsInput] = None) -> BlindpayApiResponse[ListPayinsResponse]:
         query_string = ""
@@ -211,25 +224,120 @@ class PayinsResource:
                 query_string = f"?{urlencode(filtered_params)}"
         return await self._client.get(f"/instances/{self._instance_id}/payins{query_string}")
 
+    async def list_all(
+        self, params: Optional[ListPayinsInput] = None, *, prefetch: int = 0
+    ) -> AsyncGenerator[Payin, None]:
+        """
+        Iterates over every payin across all pages.
+
+        Args:
+            params: Filters, `limit` sets the page size and defaults to "1000", `starting_after` resumes
+                after the given payin
+            prefetch: Pages to fetch ahead of the one being iterated, so the next page loads while this one is
+                processed; 0 fetches each page only once it is reached
+
+        Raises:
+            BlindPayApiError: If a page cannot be fetched
+        """
+        async for payin in paginate(self.list, params, prefetch):
+            yield payin
+
     async def get(self, payin_id: str) -> BlindpayApiResponse[Payin]:
         return await self._client.get(f"/instances/{self._instance_id}/payins/{payin_id}")
 
+    async def get_many(
+        self, payin_ids: Iterable[str], concurrency: int = DEFAULT_BATCH_CONCURRENCY
+    ) -> List[BlindpayApiResponse[Payin]]:
+        """
+        Fetches many payins at once, with up to `concurrency` requests in flight over the shared connection pool.
+
+        Args:
+            payin_ids: Ids to fetch, duplicates are only requested once
+            concurrency: Requests in flight at the same time
+
+        Returns:
+            One response per id, in the order of `payin_ids`; a payin that could not be fetched has its error in
+            its own response
+        """
+        return await get_many(self.get, payin_ids, concurrency)
+
     async def export(self, params: ExportPayinsInput) -> BlindpayApiResponse[ExportPayinsResponse]:
         filtered_params = {k: v for k, v in params.items() if v is not None}
         query_string = f"?{urlencode(filtered_params)}" if filtered_params else ""
         return await self._client.get(f"/instances/{self._instance_id}/export/payins{query_string}")
 
+    async def export_stream(self, params: ExportPayinsInput) -> AsyncGenerator[Payin, None]:
+        """
+        Same as export(), but yields payins one at a time while the response is still downloading, so a large export
+        never has to fit in memory.
+
+        Raises:
+            BlindPayApiError: If the export fails or the response is cut off
+        """
+        filtered_params = {k: v for k, v in params.items() if v is not None}
+        query_string = f"?{urlencode(filtered_params)}" if filtered_params else ""
+        async for payin in self._client.stream(f"/instances/{self._instance_id}/export/payins{query_string}"):
+            yield payin
+
+    async def export_to_file(
+        self,
+        path: ExportPath,
+        status: TransactionStatus,
+        *,
+        format: ExportFormat = "ndjson",
+        chunk_size: int = 1000,
+        concurrency: int = 4,
+        state_path: Optional[ExportPath] = None,
+    ) -> int:
+        """
+        Writes every payin to the file at `path` as NDJSON or CSV, one chunk at a time, with each `tracking_*`
+        object flattened into `tracking_<name>_<field>` columns.
+
+        Progress is checkpointed to `state_path` (`path` + ".state" by default) after every chunk. If the export is
+        interrupted, calling this again with the same arguments resumes after the last complete chunk. The state
+        file is removed once the export completes.
+
+        Args:
+            path: Output file
+            status: Status of the payins to export
+            format: "ndjson" or "csv"
+            chunk_size: Payins per request
+            concurrency: Chunks requested at the same time, they are still written in order
+            state_path: Checkpoint file
+
+        Returns:
+            The number of payins in the file
+
+        Raises:
+            BlindPayApiError: If a chunk cannot be fetched, the file keeps every chunk written before it
+        """
+        output = ExportFile(path, format, {"endpoint": "payins", "status": status}, record_columns(Payin), state_path)
+
+        async def fetch_chunk(offset: int, limit: int) -> BlindpayApiResponse[ExportPayinsResponse]:
+            return await self.export({"limit": str(limit), "offset": str(offset), "status": status})
+
+        return await export_by_offset(output, fetch_chunk, chunk_size, concurrency)
+
     async def get_track(self, payin_id: str) -> BlindpayApiResponse[GetPayinTrackResponse]:
         return await self._client.get(f"/e/payins/{payin_id}")
 
-    async def create_evm(self, payin_quote_id: str) -> BlindpayApiResponse[CreateEvmPayinResponse]:
-        return await self._client.post(f"/instances/{self._instance_id}/payins/evm", {"payin_quote_id": payin_quote_id})
+    async def create_evm(
+        self, payin_quote_id: str, idempotency_key: Optional[str] = None
+    ) -> BlindpayApiResponse[CreateEvmPayinResponse]:
+        if self._quote_cache is not None:
+            self._quote_cache.discard(payin_quote_id)
+        return await self._client.post(
+            f"/instances/{self._instance_id}/payins/evm",
+            {"payin_quote_id": payin_quote_id},
+            idempotency_key or generate_idempotency_key(),
+        )
 
 
 class PayinsResourceSync:
-    def __init__(self, instance_id: str, client: InternalApiClientSync):
+    def __init__(self, instance_id: str, client: InternalApiClientSync, quote_cache: Optional[QuoteCache] = None):
         self._instance_id = instance_id
         self._client = client
+        self._quote_cache = quote_cache
 
     def list(self, params: Optional[ListPayinsInput] = None) -> BlindpayApiResponse[ListPayinsResponse]:
         query_string = ""
@@ -239,9 +347,40 @@ class PayinsResourceSync:
                 query_string = f"?{urlencode(filtered_params)}"
         return self._client.get(f"/instances/{self._instance_id}/payins{query_string}")
 
+    def list_all(self, params: Optional[ListPayinsInput] = None, *, prefetch: int = 0) -> Generator[Payin, None, None]:
+        """
+        Iterates over every payin across all pages.
+
+        Args:
+            params: Filters, `limit` sets the page size and defaults to "1000", `starting_after` resumes
+                after the given payin
+            prefetch: Pages to fetch ahead of the one being iterated, so the next page loads while this one is
+                processed; 0 fetches each page only once it is reached
+
+        Raises:
+            BlindPayApiError: If a page cannot be fetched
+        """
+        yield from paginate_sync(self.list, params, prefetch)
+
     def get(self, payin_id: str) -> BlindpayApiResponse[Payin]:
         return self._client.get(f"/instances/{self._instance_id}/payins/{payin_id}")
 
+    def get_many(
+        self, payin_ids: Iterable[str], concurrency: int = DEFAULT_BATCH_CONCURRENCY
+    ) -> List[BlindpayApiResponse[Payin]]:
+        """
+        Fetches many payins at once, with up to `concurrency` requests in flight over the shared connection pool.
+
+        Args:
+            payin_ids: Ids to fetch, duplicates are only requested once
+            concurrency: Requests in flight at the same time
+
+        Returns:
+            One response per id, in the order of `payin_ids`; a payin that could not be fetched has its error in
+            its own response
+        """
+        return get_many_sync(self.get, payin_ids, concurrency)
+
     def get_track(self, payin_id: str) -> BlindpayApiResponse[GetPayinTrackResponse]:
         return self._client.get(f"/e/payins/{payin_id}")
 
@@ -250,13 +389,76 @@ class PayinsResourceSync:
         query_string = f"?{urlencode(filtered_params)}" if filtered_params else ""
         return self._client.get(f"/instances/{self._instance_id}/export/payins{query_string}")
 
-    def create_evm(self, payin_quote_id: str) -> BlindpayApiResponse[CreateEvmPayinResponse]:
-        return self._client.post(f"/instances/{self._instance_id}/payins/evm", {"payin_quote_id": payin_quote_id})
+    def export_stream(self, params: ExportPayinsInput) -> Generator[Payin, None, None]:
+        """
+        Same as export(), but yields payins one at a time while the response is still downloading, so a large export
+        never has to fit in memory.
 
-
-def create_payins_resource(instance_id: str, client: InternalApiClient) -> PayinsResource:
-    return PayinsResource(instance_id, client)
-
-
-def create_payins_resource_sync(instance_id: str, client: InternalApiClientSync) -> PayinsResourceSync:
-    return PayinsResourceSync(instance_id, client)
+        Raises:
+            BlindPayApiError: If the export fails or the response is cut off
+        """
+        filtered_params = {k: v for k, v in params.items() if v is not None}
+        query_string = f"?{urlencode(filtered_params)}" if filtered_params else ""
+        yield from self._client.stream(f"/instances/{self._instance_id}/export/payins{query_string}")
+
+    def export_to_file(
+        self,
+        path: ExportPath,
+        status: TransactionStatus,
+        *,
+        format: ExportFormat = "ndjson",
+        chunk_size: int = 1000,
+        concurrency: int = 4,
+        state_path: Optional[ExportPath] = None,
+    ) -> int:
+        """
+        Writes every payin to the file at `path` as NDJSON or CSV, one chunk at a time, with each `tracking_*`
+        object flattened into `tracking_<name>_<field>` columns.
+
+        Progress is checkpointed to `state_path` (`path` + ".state" by default) after every chunk. If the export is
+        interrupted, calling this again with the same arguments resumes after the last complete chunk. The state
+        file is removed once the export completes.
+
+        Args:
+            path: Output file
+            status: Status of the payins to export
+            format: "ndjson" or "csv"
+            chunk_size: Payins per request
+            concurrency: Chunks requested at the same time, they are still written in order
+            state_path: Checkpoint file
+
+        Returns:
+            The number of payins in the file
+
+        Raises:
+            BlindPayApiError: If a chunk cannot be fetched, the file keeps every chunk written before it
+        """
+        output = ExportFile(path, format, {"endpoint": "payins", "status": status}, record_columns(Payin), state_path)
+
+        def fetch_chunk(offset: int, limit: int) -> BlindpayApiResponse[ExportPayinsResponse]:
+            return self.export({"limit": str(limit), "offset": str(offset), "status": status})
+
+        return export_by_offset_sync(output, fetch_chunk, chunk_size, concurrency)
+
+    def create_evm(
+        self, payin_quote_id: str, idempotency_key: Optional[str] = None
+    ) -> BlindpayApiResponse[CreateEvmPayinResponse]:
+        if self._quote_cache is not None:
+            self._quote_cache.discard(payin_quote_id)
+        return self._client.post(
+            f"/instances/{self._instance_id}/payins/evm",
+            {"payin_quote_id": payin_quote_id},
+            idempotency_key or generate_idempotency_key(),
+        )
+
+
+def create_payins_resource(
+    instance_id: str, client: InternalApiClient, quote_cache: Optional[QuoteCache] = None
+) -> PayinsResource:
+    return PayinsResource(instance_id, client, quote_cache)
+
+
+def create_payins_resource_sync(
+    instance_id: str, client: InternalApiClientSync, quote_cache: Optional[QuoteCache] = None
+) -> PayinsResourceSync:
+    return PayinsResourceSync(instance_id, client, quote_cache)
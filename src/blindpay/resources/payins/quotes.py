@@ -3,6 +3,8 @@ from typing import List, Literal, Optional
 from typing_extensions import TypedDict
 
 from ..._internal.api_client import InternalApiClient, InternalApiClientSync
+from ..._internal.fx_cache import FxRateCache
+from ..._internal.quote_cache import QuoteCache, quote_key
 from ...types import (
     BlindpayApiResponse,
     Currency,
@@ -57,12 +59,32 @@ class GetPayinFxRateResponse(TypedDict):
 
 
 class PayinQuotesResource:
-    def __init__(self, instance_id: str, client: InternalApiClient):
+    def __init__(
+        self,
+        instance_id: str,
+        client: InternalApiClient,
+        quote_cache: Optional[QuoteCache] = None,
+        fx_cache: Optional[FxRateCache] = None,
+    ):
         self._instance_id = instance_id
         self._client = client
+        self._quote_cache = quote_cache
+        self._fx_cache = fx_cache
 
     async def create(self, data: CreatePayinQuoteInput) -> BlindpayApiResponse[CreatePayinQuoteResponse]:
-        return await self._client.post(f"/instances/{self._instance_id}/payin-quotes", data)
+        if self._quote_cache is None:
+            return await self._client.post(f"/instances/{self._instance_id}/payin-quotes", data)
+
+        key = quote_key(f"payin-quotes:{self._instance_id}", data)
+        cached = self._quote_cache.get(key)
+        if cached is not None:
+            return {"data": cached, "error": None}
+        response: BlindpayApiResponse[CreatePayinQuoteResponse] = await self._client.post(
+            f"/instances/{self._instance_id}/payin-quotes", data
+        )
+        if response["error"] is None:
+            self._quote_cache.put(key, response["data"])
+        return response
 
     async def get_fx_rate(self, data: GetPayinFxRateInput) -> BlindpayApiResponse[GetPayinFxRateResponse]:
         # Convert 'from_currency' back to 'from' for API
@@ -72,16 +94,42 @@ class PayinQuotesResource:
             "to": data["to"],
             "request_amount": data["request_amount"],
         }
-        return await self._client.post(f"/instances/{self._instance_id}/payin-quotes/fx", payload)
+        if self._fx_cache is None:
+            return await self._client.post(f"/instances/{self._instance_id}/payin-quotes/fx", payload)
+        return await self._fx_cache.get(
+            self._fx_cache.key(f"payin-quotes-fx:{self._instance_id}", data),
+            data,
+            lambda: self._client.post(f"/instances/{self._instance_id}/payin-quotes/fx", payload),
+        )
 
 
 class PayinQuotesResourceSync:
-    def __init__(self, instance_id: str, client: InternalApiClientSync):
+    def __init__(
+        self,
+        instance_id: str,
+        client: InternalApiClientSync,
+        quote_cache: Optional[QuoteCache] = None,
+        fx_cache: Optional[FxRateCache] = None,
+    ):
         self._instance_id = instance_id
         self._client = client
+        self._quote_cache = quote_cache
+        self._fx_cache = fx_cache
 
     def create(self, data: CreatePayinQuoteInput) -> BlindpayApiResponse[CreatePayinQuoteResponse]:
-        return self._client.post(f"/instances/{self._instance_id}/payin-quotes", data)
+        if self._quote_cache is None:
+            return self._client.post(f"/instances/{self._instance_id}/payin-quotes", data)
+
+        key = quote_key(f"payin-quotes:{self._instance_id}", data)
+        cached = self._quote_cache.get(key)
+        if cached is not None:
+            return {"data": cached, "error": None}
+        response: BlindpayApiResponse[CreatePayinQuoteResponse] = self._client.post(
+            f"/instances/{self._instance_id}/payin-quotes", data
+        )
+        if response["error"] is None:
+            self._quote_cache.put(key, response["data"])
+        return response
 
     def get_fx_rate(self, data: GetPayinFxRateInput) -> BlindpayApiResponse[GetPayinFxRateResponse]:
         # Convert 'from_currency' back to 'from' for API
@@ -91,12 +139,28 @@ class PayinQuotesResourceSync:
             "to": data["to"],
             "request_amount": data["request_amount"],
         }
-        return self._client.post(f"/instances/{self._instance_id}/payin-quotes/fx", payload)
-
-
-def create_payin_quotes_resource(instance_id: str, client: InternalApiClient) -> PayinQuotesResource:
-    return PayinQuotesResource(instance_id, client)
-
-
-def create_payin_quotes_resource_sync(instance_id: str, client: InternalApiClientSync) -> PayinQuotesResourceSync:
-    return PayinQuotesResourceSync(instance_id, client)
+        if self._fx_cache is None:
+            return self._client.post(f"/instances/{self._instance_id}/payin-quotes/fx", payload)
+        return self._fx_cache.get_sync(
+            self._fx_cache.key(f"payin-quotes-fx:{self._instance_id}", data),
+            data,
+            lambda: self._client.post(f"/instances/{self._instance_id}/payin-quotes/fx", payload),
+        )
+
+
+def create_payin_quotes_resource(
+    instance_id: str,
+    client: InternalApiClient,
+    quote_cache: Optional[QuoteCache] = None,
+    fx_cache: Optional[FxRateCache] = None,
+) -> PayinQuotesResource:
+    return PayinQuotesResource(instance_id, client, quote_cache, fx_cache)
+
+
+def create_payin_quotes_resource_sync(
+    instance_id: str,
+    client: InternalApiClientSync,
+    quote_cache: Optional[QuoteCache] = None,
+    fx_cache: Optional[FxRateCache] = None,
+) -> PayinQuotesResourceSync:
+    return PayinQuotesResourceSync(instance_id, client, quote_cache, fx_cache)
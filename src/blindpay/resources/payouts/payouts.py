@@ -1,9 +1,21 @@
-from typing import List, Literal, Optional
+from typing import AsyncGenerator, Generator, Iterable, List, Literal, Optional
 from urllib.parse import urlencode
 
 from typing_extensions import TypedDict
 
 from ..._internal.api_client import InternalApiClient, InternalApiClientSync
+from ..._internal.batch import DEFAULT_BATCH_CONCURRENCY, get_many, get_many_sync
+from ..._internal.file_export import (
+    ExportFile,
+    ExportFormat,
+    ExportPath,
+    export_by_offset,
+    export_by_offset_sync,
+    record_columns,
+)
+from ..._internal.pagination import paginate, paginate_sync
+from ..._internal.quote_cache import QuoteCache
+from ..._internal.retry import generate_idempotency_key
 from ...types import (
     AccountClass,
     BankAccountType,
@@ -192,9 +204,14 @@ class SubmitPayoutDocumentsResponse(TypedDict):
 
 
 class PayoutsResource:
-    def __init__(self, instance_id: str, client: InternalApiClient):
+    def __init__(self, instance_id: str, client: InternalApiClient, quote_cache: Optional[QuoteCache] = None):
         self._instance_id = instance_id
         self._client = client
+        self._quote_cache = quote_cache
+
+    def _use_quote(self, quote_id: str) -> None:
+        if self._quote_cache is not None:
+            self._quote_cache.discard(quote_id)
 
     async def list(self, params: Optional[ListPayoutsInput] = None) -> BlindpayApiResponse[ListPayoutsResponse]:
         query_string = ""
@@ -204,6 +221,24 @@ class PayoutsResource:
                 query_string = f"?{urlencode(filtered_params)}"
         return await self._client.get(f"/instances/{self._instance_id}/payouts{query_string}")
 
+    async def list_all(
+        self, params: Optional[ListPayoutsInput] = None, *, prefetch: int = 0
+    ) -> AsyncGenerator[Payout, None]:
+        """
+        Iterates over every payout across all pages.
+
+        Args:
+            params: Filters, `limit` sets the page size and defaults to "1000", `starting_after` resumes
+                after the given payout
+            prefetch: Pages to fetch ahead of the one being iterated, so the next page loads while this one is
+                processed; 0 fetches each page only once it is reached
+
+        Raises:
+            BlindPayApiError: If a page cannot be fetched
+        """
+        async for payout in paginate(self.list, params, prefetch):
+            yield payout
+
     async def export(self, params: Optional[ExportPayoutsInput] = None) -> BlindpayApiResponse[ExportPayoutsResponse]:
         query_string = ""
         if params:
@@ -212,9 +247,78 @@ class PayoutsResource:
                 query_string = f"?{urlencode(filtered_params)}"
         return await self._client.get(f"/instances/{self._instance_id}/export/payouts{query_string}")
 
+    async def export_stream(self, params: Optional[ExportPayoutsInput] = None) -> AsyncGenerator[Payout, None]:
+        """
+        Same as export(), but yields payouts one at a time while the response is still downloading, so a large export
+        never has to fit in memory.
+
+        Raises:
+            BlindPayApiError: If the export fails or the response is cut off
+        """
+        query_string = ""
+        if params:
+            filtered_params = {k: v for k, v in params.items() if v is not None}
+            if filtered_params:
+                query_string = f"?{urlencode(filtered_params)}"
+        async for payout in self._client.stream(f"/instances/{self._instance_id}/export/payouts{query_string}"):
+            yield payout
+
+    async def export_to_file(
+        self,
+        path: ExportPath,
+        *,
+        format: ExportFormat = "ndjson",
+        chunk_size: int = 1000,
+        concurrency: int = 4,
+        state_path: Optional[ExportPath] = None,
+    ) -> int:
+        """
+        Writes every payout to the file at `path` as NDJSON or CSV, one chunk at a time, with each `tracking_*`
+        object flattened into `tracking_<name>_<field>` columns.
+
+        Progress is checkpointed to `state_path` (`path` + ".state" by default) after every chunk. If the export is
+        interrupted, calling this again with the same arguments resumes after the last complete chunk. The state
+        file is removed once the export completes.
+
+        Args:
+            path: Output file
+            format: "ndjson" or "csv"
+            chunk_size: Payouts per request
+            concurrency: Chunks requested at the same time, they are still written in order
+            state_path: Checkpoint file
+
+        Returns:
+            The number of payouts in the file
+
+        Raises:
+            BlindPayApiError: If a chunk cannot be fetched, the file keeps every chunk written before it
+        """
+        output = ExportFile(path, format, {"endpoint": "payouts"}, record_columns(Payout), state_path)
+
+        async def fetch_chunk(offset: int, limit: int) -> BlindpayApiResponse[ExportPayoutsResponse]:
+            return await self.export({"limit": str(limit), "offset": str(offset)})
+
+        return await export_by_offset(output, fetch_chunk, chunk_size, concurrency)
+
     async def get(self, payout_id: str) -> BlindpayApiResponse[Payout]:
         return await self._client.get(f"/instances/{self._instance_id}/payouts/{payout_id}")
 
+    async def get_many(
+        self, payout_ids: Iterable[str], concurrency: int = DEFAULT_BATCH_CONCURRENCY
+    ) -> List[BlindpayApiResponse[Payout]]:
+        """
+        Fetches many payouts at once, with up to `concurrency` requests in flight over the shared connection pool.
+
+        Args:
+            payout_ids: Ids to fetch, duplicates are only requested once
+            concurrency: Requests in flight at the same time
+
+        Returns:
+            One response per id, in the order of `payout_ids`; a payout that could not be fetched has its error in
+            its own response
+        """
+        return await get_many(self.get, payout_ids, concurrency)
+
     async def get_track(self, payout_id: str) -> BlindpayApiResponse[Payout]:
         return await self._client.get(f"/e/payouts/{payout_id}")
 
@@ -223,14 +327,29 @@ class PayoutsResource:
     ) -> BlindpayApiResponse[AuthorizeStellarTokenResponse]:
         return await self._client.post(f"/instances/{self._instance_id}/payouts/stellar/authorize", data)
 
-    async def create_stellar(self, data: CreateStellarPayoutInput) -> BlindpayApiResponse[CreateStellarPayoutResponse]:
-        return await self._client.post(f"/instances/{self._instance_id}/payouts/stellar", data)
-
-    async def create_evm(self, data: CreateEvmPayoutInput) -> BlindpayApiResponse[CreateEvmPayoutResponse]:
-        return await self._client.post(f"/instances/{self._instance_id}/payouts/evm", data)
-
-    async def create_solana(self, data: CreateSolanaPayoutInput) -> BlindpayApiResponse[CreateSolanaPayoutResponse]:
-        return await self._client.post(f"/instances/{self._instance_id}/payouts/solana", data)
+    async def create_stellar(
+        self, data: CreateStellarPayoutInput, idempotency_key: Optional[str] = None
+    ) -> BlindpayApiResponse[CreateStellarPayoutResponse]:
+        self._use_quote(data["quote_id"])
+        return await self._client.post(
+            f"/instances/{self._instance_id}/payouts/stellar", data, idempotency_key or generate_idempotency_key()
+        )
+
+    async def create_evm(
+        self, data: CreateEvmPayoutInput, idempotency_key: Optional[str] = None
+    ) -> BlindpayApiResponse[CreateEvmPayoutResponse]:
+        self._use_quote(data["quote_id"])
+        return await self._client.post(
+            f"/instances/{self._instance_id}/payouts/evm", data, idempotency_key or generate_idempotency_key()
+        )
+
+    async def create_solana(
+        self, data: CreateSolanaPayoutInput, idempotency_key: Optional[str] = None
+    ) -> BlindpayApiResponse[CreateSolanaPayoutResponse]:
+        self._use_quote(data["quote_id"])
+        return await self._client.post(
+            f"/instances/{self._instance_id}/payouts/solana", data, idempotency_key or generate_idempotency_key()
+        )
 
     async def submit_documents(
         self, data: SubmitPayoutDocumentsInput
@@ -241,9 +360,14 @@ class PayoutsResource:
 
 
 class PayoutsResourceSync:
-    def __init__(self, instance_id: str, client: InternalApiClientSync):
+    def __init__(self, instance_id: str, client: InternalApiClientSync, quote_cache: Optional[QuoteCache] = None):
         self._instance_id = instance_id
         self._client = client
+        self._quote_cache = quote_cache
+
+    def _use_quote(self, quote_id: str) -> None:
+        if self._quote_cache is not None:
+            self._quote_cache.discard(quote_id)
 
     def list(self, params: Optional[ListPayoutsInput] = None) -> BlindpayApiResponse[ListPayoutsResponse]:
         query_string = ""
@@ -253,6 +377,23 @@ class PayoutsResourceSync:
                 query_string = f"?{urlencode(filtered_params)}"
         return self._client.get(f"/instances/{self._instance_id}/payouts{query_string}")
 
+    def list_all(
+        self, params: Optional[ListPayoutsInput] = None, *, prefetch: int = 0
+    ) -> Generator[Payout, None, None]:
+        """
+        Iterates over every payout across all pages.
+
+        Args:
+            params: Filters, `limit` sets the page size and defaults to "1000", `starting_after` resumes
+                after the given payout
+            prefetch: Pages to fetch ahead of the one being iterated, so the next page loads while this one is
+                processed; 0 fetches each page only once it is reached
+
+        Raises:
+            BlindPayApiError: If a page cannot be fetched
+        """
+        yield from paginate_sync(self.list, params, prefetch)
+
     def export(self, params: Optional[ExportPayoutsInput] = None) -> BlindpayApiResponse[ExportPayoutsResponse]:
         query_string = ""
         if params:
@@ -261,9 +402,77 @@ class PayoutsResourceSync:
                 query_string = f"?{urlencode(filtered_params)}"
         return self._client.get(f"/instances/{self._instance_id}/export/payouts{query_string}")
 
+    def export_stream(self, params: Optional[ExportPayoutsInput] = None) -> Generator[Payout, None, None]:
+        """
+        Same as export(), but yields payouts one at a time while the response is still downloading, so a large export
+        never has to fit in memory.
+
+        Raises:
+            BlindPayApiError: If the export fails or the response is cut off
+        """
+        query_string = ""
+        if params:
+            filtered_params = {k: v for k, v in params.items() if v is not None}
+            if filtered_params:
+                query_string = f"?{urlencode(filtered_params)}"
+        yield from self._client.stream(f"/instances/{self._instance_id}/export/payouts{query_string}")
+
+    def export_to_file(
+        self,
+        path: ExportPath,
+        *,
+        format: ExportFormat = "ndjson",
+        chunk_size: int = 1000,
+        concurrency: int = 4,
+        state_path: Optional[ExportPath] = None,
+    ) -> int:
+        """
+        Writes every payout to the file at `path` as NDJSON or CSV, one chunk at a time, with each `tracking_*`
+        object flattened into `tracking_<name>_<field>` columns.
+
+        Progress is checkpointed to `state_path` (`path` + ".state" by default) after every chunk. If the export is
+        interrupted, calling this again with the same arguments resumes after the last complete chunk. The state
+        file is removed once the export completes.
+
+        Args:
+            path: Output file
+            format: "ndjson" or "csv"
+            chunk_size: Payouts per request
+            concurrency: Chunks requested at the same time, they are still written in order
+            state_path: Checkpoint file
+
+        Returns:
+            The number of payouts in the file
+
+        Raises:
+            BlindPayApiError: If a chunk cannot be fetched, the file keeps every chunk written before it
+        """
+        output = ExportFile(path, format, {"endpoint": "payouts"}, record_columns(Payout), state_path)
+
+        def fetch_chunk(offset: int, limit: int) -> BlindpayApiResponse[ExportPayoutsResponse]:
+            return self.export({"limit": str(limit), "offset": str(offset)})
+
+        return export_by_offset_sync(output, fetch_chunk, chunk_size, concurrency)
+
     def get(self, payout_id: str) -> BlindpayApiResponse[Payout]:
         return self._client.get(f"/instances/{self._instance_id}/payouts/{payout_id}")
 
+    def get_many(
+        self, payout_ids: Iterable[str], concurrency: int = DEFAULT_BATCH_CONCURRENCY
+    ) -> List[BlindpayApiResponse[Payout]]:
+        """
+        Fetches many payouts at once, with up to `concurrency` requests in flight over the shared connection pool.
+
+        Args:
+            payout_ids: Ids to fetch, duplicates are only requested once
+            concurrency: Requests in flight at the same time
+
+        Returns:
+            One response per id, in the order of `payout_ids`; a payout that could not be fetched has its error in
+            its own response
+        """
+        return get_many_sync(self.get, payout_ids, concurrency)
+
     def get_track(self, payout_id: str) -> BlindpayApiResponse[Payout]:
         return self._client.get(f"/e/payouts/{payout_id}")
 
@@ -272,14 +481,29 @@ class PayoutsResourceSync:
     ) -> BlindpayApiResponse[AuthorizeStellarTokenResponse]:
         return self._client.post(f"/instances/{self._instance_id}/payouts/stellar/authorize", data)
 
-    def create_stellar(self, data: CreateStellarPayoutInput) -> BlindpayApiResponse[CreateStellarPayoutResponse]:
-        return self._client.post(f"/instances/{self._instance_id}/payouts/stellar", data)
-
-    def create_evm(self, data: CreateEvmPayoutInput) -> BlindpayApiResponse[CreateEvmPayoutResponse]:
-        return self._client.post(f"/instances/{self._instance_id}/payouts/evm", data)
-
-    def create_solana(self, data: CreateSolanaPayoutInput) -> BlindpayApiResponse[CreateSolanaPayoutResponse]:
-        return self._client.post(f"/instances/{self._instance_id}/payouts/solana", data)
+    def create_stellar(
+        self, data: CreateStellarPayoutInput, idempotency_key: Optional[str] = None
+    ) -> BlindpayApiResponse[CreateStellarPayoutResponse]:
+        self._use_quote(data["quote_id"])
+        return self._client.post(
+            f"/instances/{self._instance_id}/payouts/stellar", data, idempotency_key or generate_idempotency_key()
+        )
+
+    def create_evm(
+        self, data: CreateEvmPayoutInput, idempotency_key: Optional[str] = None
+    ) -> BlindpayApiResponse[CreateEvmPayoutResponse]:
+        self._use_quote(data["quote_id"])
+        return self._client.post(
+            f"/instances/{self._instance_id}/payouts/evm", data, idempotency_key or generate_idempotency_key()
+        )
+
+    def create_solana(
+        self, data: CreateSolanaPayoutInput, idempotency_key: Optional[str] = None
+    ) -> BlindpayApiResponse[CreateSolanaPayoutResponse]:
+        self._use_quote(data["quote_id"])
+        return self._client.post(
+            f"/instances/{self._instance_id}/payouts/solana", data, idempotency_key or generate_idempotency_key()
+        )
 
     def submit_documents(self, data: SubmitPayoutDocumentsInput) -> BlindpayApiResponse[SubmitPayoutDocumentsResponse]:
         payout_id = data["payout_id"]
@@ -287,9 +511,13 @@ class PayoutsResourceSync:
         return self._client.post(f"/instances/{self._instance_id}/payouts/{payout_id}/documents", payload)
 
 
-def create_payouts_resource(instance_id: str, client: InternalApiClient) -> PayoutsResource:
-    return PayoutsResource(instance_id, client)
+def create_payouts_resource(
+    instance_id: str, client: InternalApiClient, quote_cache: Optional[QuoteCache] = None
+) -> PayoutsResource:
+    return PayoutsResource(instance_id, client, quote_cache)
 
 
-def create_payouts_resource_sync(instance_id: str, client: InternalApiClientSync) -> PayoutsResourceSync:
-    return PayoutsResourceSync(instance_id, client)
+def create_payouts_resource_sync(
+    instance_id: str, client: InternalApiClientSync, quote_cache: Optional[QuoteCache] = None
+) -> PayoutsResourceSync:
+    return PayoutsResourceSync(instance_id, client, quote_cache)
@@ -3,6 +3,9 @@ from typing import Any, Dict, List, Optional
 from typing_extensions import NotRequired, TypedDict
 
 from ..._internal.api_client import InternalApiClient, InternalApiClientSync
+from ..._internal.fx_cache import FxRateCache
+from ..._internal.quote_cache import QuoteCache, quote_key
+from ..._internal.retry import generate_idempotency_key
 from ...types import (
     BlindpayApiResponse,
     Currency,
@@ -72,12 +75,37 @@ class GetFxRateResponse(TypedDict):
 
 
 class QuotesResource:
-    def __init__(self, instance_id: str, client: InternalApiClient):
+    def __init__(
+        self,
+        instance_id: str,
+        client: InternalApiClient,
+        quote_cache: Optional[QuoteCache] = None,
+        fx_cache: Optional[FxRateCache] = None,
+    ):
         self._instance_id = instance_id
         self._client = client
-
-    async def create(self, data: CreateQuoteInput) -> BlindpayApiResponse[CreateQuoteResponse]:
-        return await self._client.post(f"/instances/{self._instance_id}/quotes", data)
+        self._quote_cache = quote_cache
+        self._fx_cache = fx_cache
+
+    async def create(
+        self, data: CreateQuoteInput, idempotency_key: Optional[str] = None
+    ) -> BlindpayApiResponse[CreateQuoteResponse]:
+        # An explicit idempotency key asks for this exact call to be replayed, not for any matching quote.
+        if self._quote_cache is None or idempotency_key is not None:
+            return await self._client.post(
+                f"/instances/{self._instance_id}/quotes", data, idempotency_key or generate_idempotency_key()
+            )
+
+        key = quote_key(f"quotes:{self._instance_id}", data)
+        cached = self._quote_cache.get(key)
+        if cached is not None:
+            return {"data": cached, "error": None}
+        response: BlindpayApiResponse[CreateQuoteResponse] = await self._client.post(
+            f"/instances/{self._instance_id}/quotes", data, generate_idempotency_key()
+        )
+        if response["error"] is None:
+            self._quote_cache.put(key, response["data"])
+        return response
 
     async def get_fx_rate(self, data: GetFxRateInput) -> BlindpayApiResponse[GetFxRateResponse]:
         payload = {
@@ -86,16 +114,47 @@ class QuotesResource:
             "to": data["to"],
             "request_amount": data["request_amount"],
         }
-        return await self._client.post(f"/instances/{self._instance_id}/quotes/fx", payload)
+        if self._fx_cache is None:
+            return await self._client.post(f"/instances/{self._instance_id}/quotes/fx", payload)
+        return await self._fx_cache.get(
+            self._fx_cache.key(f"quotes-fx:{self._instance_id}", data),
+            data,
+            lambda: self._client.post(f"/instances/{self._instance_id}/quotes/fx", payload),
+        )
 
 
 class QuotesResourceSync:
-    def __init__(self, instance_id: str, client: InternalApiClientSync):
+    def __init__(
+        self,
+        instance_id: str,
+        client: InternalApiClientSync,
+        quote_cache: Optional[QuoteCache] = None,
+        fx_cache: Optional[FxRateCache] = None,
+    ):
         self._instance_id = instance_id
         self._client = client
-
-    def create(self, data: CreateQuoteInput) -> BlindpayApiResponse[CreateQuoteResponse]:
-        return self._client.post(f"/instances/{self._instance_id}/quotes", data)
+        self._quote_cache = quote_cache
+        self._fx_cache = fx_cache
+
+    def create(
+        self, data: CreateQuoteInput, idempotency_key: Optional[str] = None
+    ) -> BlindpayApiResponse[CreateQuoteResponse]:
+        # An explicit idempotency key asks for this exact call to be replayed, not for any matching quote.
+        if self._quote_cache is None or idempotency_key is not None:
+            return self._client.post(
+                f"/instances/{self._instance_id}/quotes", data, idempotency_key or generate_idempotency_key()
+            )
+
+        key = quote_key(f"quotes:{self._instance_id}", data)
+        cached = self._quote_cache.get(key)
+        if cached is not None:
+            return {"data": cached, "error": None}
+        response: BlindpayApiResponse[CreateQuoteResponse] = self._client.post(
+            f"/instances/{self._instance_id}/quotes", data, generate_idempotency_key()
+        )
+        if response["error"] is None:
+            self._quote_cache.put(key, response["data"])
+        return response
 
     def get_fx_rate(self, data: GetFxRateInput) -> BlindpayApiResponse[GetFxRateResponse]:
         payload = {
@@ -104,12 +163,28 @@ class QuotesResourceSync:
             "to": data["to"],
             "request_amount": data["request_amount"],
         }
-        return self._client.post(f"/instances/{self._instance_id}/quotes/fx", payload)
-
-
-def create_quotes_resource(instance_id: str, client: InternalApiClient) -> QuotesResource:
-    return QuotesResource(instance_id, client)
-
-
-def create_quotes_resource_sync(instance_id: str, client: InternalApiClientSync) -> QuotesResourceSync:
-    return QuotesResourceSync(instance_id, client)
+        if self._fx_cache is None:
+            return self._client.post(f"/instances/{self._instance_id}/quotes/fx", payload)
+        return self._fx_cache.get_sync(
+            self._fx_cache.key(f"quotes-fx:{self._instance_id}", data),
+            data,
+            lambda: self._client.post(f"/instances/{self._instance_id}/quotes/fx", payload),
+        )
+
+
+def create_quotes_resource(
+    instance_id: str,
+    client: InternalApiClient,
+    quote_cache: Optional[QuoteCache] = None,
+    fx_cache: Optional[FxRateCache] = None,
+) -> QuotesResource:
+    return QuotesResource(instance_id, client, quote_cache, fx_cache)
+
+
+def create_quotes_resource_sync(
+    instance_id: str,
+    client: InternalApiClientSync,
+    quote_cache: Optional[QuoteCache] = None,
+    fx_cache: Optional[FxRateCache] = None,
+) -> QuotesResourceSync:
+    return QuotesResourceSync(instance_id, client, quote_cache, fx_cache)
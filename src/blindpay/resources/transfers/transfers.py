@@ -1,9 +1,20 @@
-from typing import List, Optional
+from typing import AsyncGenerator, Generator, Iterable, List, Optional
 from urllib.parse import urlencode
 
 from typing_extensions import Literal, TypedDict
 
 from ..._internal.api_client import InternalApiClient, InternalApiClientSync
+from ..._internal.batch import DEFAULT_BATCH_CONCURRENCY, get_many, get_many_sync
+from ..._internal.file_export import (
+    ExportFile,
+    ExportFormat,
+    ExportPath,
+    export_by_cursor,
+    export_by_cursor_sync,
+    record_columns,
+)
+from ..._internal.pagination import paginate, paginate_sync
+from ..._internal.retry import generate_idempotency_key
 from ...types import (
     BlindpayApiResponse,
     Network,
@@ -95,8 +106,12 @@ class TransfersResource:
     async def create_quote(self, data: CreateTransferQuoteInput) -> BlindpayApiResponse[CreateTransferQuoteResponse]:
         return await self._client.post(f"/instances/{self._instance_id}/transfer-quotes", data)
 
-    async def create(self, data: CreateTransferInput) -> BlindpayApiResponse[CreateTransferResponse]:
-        return await self._client.post(f"/instances/{self._instance_id}/transfers", data)
+    async def create(
+        self, data: CreateTransferInput, idempotency_key: Optional[str] = None
+    ) -> BlindpayApiResponse[CreateTransferResponse]:
+        return await self._client.post(
+            f"/instances/{self._instance_id}/transfers", data, idempotency_key or generate_idempotency_key()
+        )
 
     async def list(self, params: Optional[PaginationParams] = None) -> BlindpayApiResponse[ListTransfersResponse]:
         query_string = ""
@@ -106,9 +121,76 @@ class TransfersResource:
                 query_string = f"?{urlencode(filtered_params)}"
         return await self._client.get(f"/instances/{self._instance_id}/transfers{query_string}")
 
+    async def list_all(
+        self, params: Optional[PaginationParams] = None, *, prefetch: int = 0
+    ) -> AsyncGenerator[Transfer, None]:
+        """
+        Iterates over every transfer across all pages.
+
+        Args:
+            params: Filters, `limit` sets the page size and defaults to "1000", `starting_after` resumes
+                after the given transfer
+            prefetch: Pages to fetch ahead of the one being iterated, so the next page loads while this one is
+                processed; 0 fetches each page only once it is reached
+
+        Raises:
+            BlindPayApiError: If a page cannot be fetched
+        """
+        async for transfer in paginate(self.list, params, prefetch):
+            yield transfer
+
+    async def export_to_file(
+        self,
+        path: ExportPath,
+        *,
+        format: ExportFormat = "ndjson",
+        chunk_size: int = 1000,
+        concurrency: int = 2,
+        state_path: Optional[ExportPath] = None,
+    ) -> int:
+        """
+        Writes every transfer to the file at `path` as NDJSON or CSV, one chunk at a time, with each `tracking_*`
+        object flattened into `tracking_<name>_<field>` columns.
+
+        Progress is checkpointed to `state_path` (`path` + ".state" by default) after every chunk. If the export is
+        interrupted, calling this again with the same arguments resumes after the last complete chunk. The state
+        file is removed once the export completes.
+
+        Args:
+            path: Output file
+            format: "ndjson" or "csv"
+            chunk_size: Transfers per request
+            concurrency: Pages are chained by a cursor, so up to `concurrency - 1` pages are fetched ahead
+            state_path: Checkpoint file
+
+        Returns:
+            The number of transfers in the file
+
+        Raises:
+            BlindPayApiError: If a chunk cannot be fetched, the file keeps every chunk written before it
+        """
+        output = ExportFile(path, format, {"endpoint": "transfers"}, record_columns(Transfer), state_path)
+        return await export_by_cursor(output, self.list, None, chunk_size, concurrency)
+
     async def get(self, transfer_id: str) -> BlindpayApiResponse[GetTransferResponse]:
         return await self._client.get(f"/instances/{self._instance_id}/transfers/{transfer_id}")
 
+    async def get_many(
+        self, transfer_ids: Iterable[str], concurrency: int = DEFAULT_BATCH_CONCURRENCY
+    ) -> List[BlindpayApiResponse[GetTransferResponse]]:
+        """
+        Fetches many transfers at once, with up to `concurrency` requests in flight over the shared connection pool.
+
+        Args:
+            transfer_ids: Ids to fetch, duplicates are only requested once
+            concurrency: Requests in flight at the same time
+
+        Returns:
+            One response per id, in the order of `transfer_ids`; a transfer that could not be fetched has its error in
+            its own response
+        """
+        return await get_many(self.get, transfer_ids, concurrency)
+
     async def get_track(self, transfer_id: str) -> BlindpayApiResponse[GetTransferResponse]:
         return await self._client.get(f"/e/transfers/{transfer_id}")
 
@@ -121,8 +203,12 @@ class TransfersResourceSync:
     def create_quote(self, data: CreateTransferQuoteInput) -> BlindpayApiResponse[CreateTransferQuoteResponse]:
         return self._client.post(f"/instances/{self._instance_id}/transfer-quotes", data)
 
-    def create(self, data: CreateTransferInput) -> BlindpayApiResponse[CreateTransferResponse]:
-        return self._client.post(f"/instances/{self._instance_id}/transfers", data)
+    def create(
+        self, data: CreateTransferInput, idempotency_key: Optional[str] = None
+    ) -> BlindpayApiResponse[CreateTransferResponse]:
+        return self._client.post(
+            f"/instances/{self._instance_id}/transfers", data, idempotency_key or generate_idempotency_key()
+        )
 
     def list(self, params: Optional[PaginationParams] = None) -> BlindpayApiResponse[ListTransfersResponse]:
         query_string = ""
@@ -132,9 +218,75 @@ class TransfersResourceSync:
                 query_string = f"?{urlencode(filtered_params)}"
         return self._client.get(f"/instances/{self._instance_id}/transfers{query_string}")
 
+    def list_all(
+        self, params: Optional[PaginationParams] = None, *, prefetch: int = 0
+    ) -> Generator[Transfer, None, None]:
+        """
+        Iterates over every transfer across all pages.
+
+        Args:
+            params: Filters, `limit` sets the page size and defaults to "1000", `starting_after` resumes
+                after the given transfer
+            prefetch: Pages to fetch ahead of the one being iterated, so the next page loads while this one is
+                processed; 0 fetches each page only once it is reached
+
+        Raises:
+            BlindPayApiError: If a page cannot be fetched
+        """
+        yield from paginate_sync(self.list, params, prefetch)
+
+    def export_to_file(
+        self,
+        path: ExportPath,
+        *,
+        format: ExportFormat = "ndjson",
+        chunk_size: int = 1000,
+        concurrency: int = 2,
+        state_path: Optional[ExportPath] = None,
+    ) -> int:
+        """
+        Writes every transfer to the file at `path` as NDJSON or CSV, one chunk at a time, with each `tracking_*`
+        object flattened into `tracking_<name>_<field>` columns.
+
+        Progress is checkpointed to `state_path` (`path` + ".state" by default) after every chunk. If the export is
+        interrupted, calling this again with the same arguments resumes after the last complete chunk. The state
+        file is removed once the export completes.
+
+        Args:
+            path: Output file
+            format: "ndjson" or "csv"
+            chunk_size: Transfers per request
+            concurrency: Pages are chained by a cursor, so up to `concurrency - 1` pages are fetched ahead
+            state_path: Checkpoint file
+
+        Returns:
+            The number of transfers in the file
+
+        Raises:
+            BlindPayApiError: If a chunk cannot be fetched, the file keeps every chunk written before it
+        """
+        output = ExportFile(path, format, {"endpoint": "transfers"}, record_columns(Transfer), state_path)
+        return export_by_cursor_sync(output, self.list, None, chunk_size, concurrency)
+
     def get(self, transfer_id: str) -> BlindpayApiResponse[GetTransferResponse]:
         return self._client.get(f"/instances/{self._instance_id}/transfers/{transfer_id}")
 
+    def get_many(
+        self, transfer_ids: Iterable[str], concurrency: int = DEFAULT_BATCH_CONCURRENCY
+    ) -> List[BlindpayApiResponse[GetTransferResponse]]:
+        """
+        Fetches many transfers at once, with up to `concurrency` requests in flight over the shared connection pool.
+
+        Args:
+            transfer_ids: Ids to fetch, duplicates are only requested once
+            concurrency: Requests in flight at the same time
+
+        Returns:
+            One response per id, in the order of `transfer_ids`; a transfer that could not be fetched has its error in
+            its own response
+        """
+        return get_many_sync(self.get, transfer_ids, concurrency)
+
     def get_track(self, transfer_id: str) -> BlindpayApiResponse[GetTransferResponse]:
         return self._client.get(f"/e/transfers/{transfer_id}")
 
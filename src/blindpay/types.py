@@ -1,12 +1,17 @@
 from typing import Generic, Literal, Optional, TypeVar, Union
 
-from typing_extensions import TypedDict
+from typing_extensions import NotRequired, TypedDict
 
 T = TypeVar("T")
 
 
 class ErrorResponse(TypedDict):
     message: str
+    code: NotRequired[str]
+    status: NotRequired[int]
+    request_id: NotRequired[str]
+    retry_after: NotRequired[float]
+    is_retryable: NotRequired[bool]
 
 
 class BlindpayErrorResponse(TypedDict):
@@ -1,5 +1,40 @@
 import sys
 from pathlib import Path
+from typing import Any
 
 src_path = Path(__file__).parent.parent / "src"
 sys.path.insert(0, str(src_path))
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+
+from blindpay import BlindPay, BlindPaySync  # noqa: E402
+
+
+class FakeClock:
+    """A clock that only moves when a test sets `now`, for the `clock` argument of the client options"""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ClientFactory:
+    """Builds clients whose requests are answered by `handler`, configured with the client options given"""
+
+    def __call__(self, handler: Any, **options: Any) -> BlindPay:
+        return BlindPay(
+            api_key="test-key", instance_id="in_000000000000", transport=httpx.MockTransport(handler), **options
+        )
+
+    def sync(self, handler: Any, **options: Any) -> BlindPaySync:
+        return BlindPaySync(
+            api_key="test-key", instance_id="in_000000000000", transport=httpx.MockTransport(handler), **options
+        )
+
+
+@pytest.fixture
+def make_client() -> ClientFactory:
+    return ClientFactory()
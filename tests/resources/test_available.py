@@ -1,8 +1,31 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable
 from unittest.mock import patch
 
+import httpx
 import pytest
 
-from blindpay import BlindPay, BlindPaySync
+from blindpay import BlindPay, BlindPayError, BlindPaySync, ReferenceDataCache
+from tests.conftest import ClientFactory
+
+RAILS = [{"label": "PIX", "value": "pix", "country": "BR"}, {"label": "ACH", "value": "ach", "country": "US"}]
+
+
+def reference_handler(calls: list[str]) -> Callable[[httpx.Request], httpx.Response]:
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.raw_path.decode().removeprefix("/v1"))
+        if request.url.path.endswith("/rails"):
+            return httpx.Response(200, json=RAILS)
+        if request.url.path.endswith("/swift/BROKEN"):
+            return httpx.Response(404, json={"message": "Not found"})
+        return httpx.Response(200, json=[{"code": str(len(calls)), "title": "Call"}])
+
+    return handler
 
 
 class TestAvailable:
@@ -228,3 +251,126 @@ class TestAvailableSync:
             assert response["error"] is None
             assert response["data"] == mocked_bank_details
             mock_request.assert_called_once_with("GET", "/available/swift/BOFAUS3NLMA")
+
+
+class TestAvailableCaching:
+    @pytest.mark.asyncio
+    async def test_fresh_entries_are_served_from_memory(self, make_client: ClientFactory):
+        calls: list[str] = []
+        cache = ReferenceDataCache(ttl=60)
+
+        async with make_client(reference_handler(calls), reference_cache=cache) as blindpay:
+            first = await blindpay.available.get_rails()
+            second = await blindpay.available.get_rails()
+            assert second["data"] is not None
+            second["data"][0]["label"] = "changed"
+            third = await blindpay.available.get_rails()
+
+        assert first == third == {"data": RAILS, "error": None}
+        assert calls == ["/available/rails"]
+        assert cache.stats() == {"hits": 2, "stale_hits": 0, "misses": 1, "size": 1}
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self, make_client: ClientFactory):
+        calls: list[str] = []
+        cache = ReferenceDataCache()
+
+        async with make_client(reference_handler(calls), reference_cache=cache) as blindpay:
+            for _ in range(2):
+                response = await blindpay.available.get_swift_code_bank_details("BROKEN")
+                assert response["error"] is not None
+
+        assert len(calls) == 2
+        assert cache.misses == 2
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_served_while_it_is_refreshed(self, make_client: ClientFactory):
+        calls: list[str] = []
+        cache = ReferenceDataCache(ttl=0, stale_ttl=60)
+
+        async with make_client(reference_handler(calls), reference_cache=cache) as blindpay:
+            first = await blindpay.available.get_naics_codes()
+            stale = await blindpay.available.get_naics_codes()
+            await asyncio.sleep(0.01)
+            refreshed = await blindpay.available.get_naics_codes()
+
+        assert first["data"] == stale["data"] == [{"code": "1", "title": "Call"}]
+        assert refreshed["data"] == [{"code": "2", "title": "Call"}]
+        assert cache.stale_hits == 2
+
+    @pytest.mark.asyncio
+    async def test_warm_loads_every_rail_and_persists_to_disk(self, tmp_path: Path, make_client: ClientFactory):
+        calls: list[str] = []
+        path = tmp_path / "reference.json"
+
+        async with make_client(reference_handler(calls), reference_cache=ReferenceDataCache(path=path)) as blindpay:
+            assert await blindpay.available.warm() is None
+
+        assert sorted(calls) == [
+            "/available/bank-details?rail=ach",
+            "/available/bank-details?rail=pix",
+            "/available/naics",
+            "/available/rails",
+        ]
+        assert len(json.loads(path.read_text())["entries"]) == 4
+
+        calls.clear()
+        cache = ReferenceDataCache(path=path)
+        async with make_client(reference_handler(calls), reference_cache=cache) as blindpay:
+            response = await blindpay.available.get_bank_details("pix")
+
+        assert response["error"] is None
+        assert calls == []
+        assert cache.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_the_cache_file_is_written_off_the_loop_and_only_when_changed(
+        self, tmp_path: Path, make_client: ClientFactory
+    ):
+        cache = ReferenceDataCache(path=tmp_path / "reference.json")
+        writers: list[int] = []
+        replace = os.replace
+
+        def recording_replace(src: str, dst: str) -> None:
+            writers.append(threading.get_ident())
+            replace(src, dst)
+
+        with patch("blindpay._internal.reference_cache.os.replace", recording_replace):
+            async with make_client(reference_handler([]), reference_cache=cache) as blindpay:
+                assert await blindpay.available.warm() is None
+            writes = len(writers)
+            cache._save()
+
+        assert 1 <= writes <= 4
+        assert len(writers) == writes
+        assert threading.get_ident() not in writers
+
+    def test_unreadable_cache_file_starts_cold(self, tmp_path: Path):
+        path = tmp_path / "reference.json"
+        path.write_text("{not json")
+
+        assert ReferenceDataCache(path=path).stats()["size"] == 0
+
+    def test_rejects_negative_ttl(self):
+        with pytest.raises(BlindPayError):
+            ReferenceDataCache(ttl=-1)
+
+    def test_sync_client_refreshes_in_a_background_thread(self, make_client: ClientFactory):
+        calls: list[str] = []
+        threads: list[str] = []
+        handler = reference_handler(calls)
+
+        def recording_handler(request: httpx.Request) -> httpx.Response:
+            threads.append(threading.current_thread().name)
+            return handler(request)
+
+        cache = ReferenceDataCache(ttl=0, stale_ttl=60)
+        with make_client.sync(recording_handler, reference_cache=cache) as blindpay:
+            blindpay.available.get_naics_codes()
+            stale = blindpay.available.get_naics_codes()
+            deadline = time.monotonic() + 1
+            while len(calls) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        assert stale["data"] == [{"code": "1", "title": "Call"}]
+        assert threads[1] == "blindpay-cache-refresh"
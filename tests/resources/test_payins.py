@@ -1,4 +1,4 @@
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 import pytest
 
@@ -399,7 +399,10 @@ class TestPayins:
             assert response["error"] is None
             assert response["data"] == mocked_evm_payin
             mock_request.assert_called_once_with(
-                "POST", "/instances/in_000000000000/payins/evm", {"payin_quote_id": "pq_000000000000"}
+                "POST",
+                "/instances/in_000000000000/payins/evm",
+                {"payin_quote_id": "pq_000000000000"},
+                idempotency_key=ANY,
             )
 
 
@@ -894,5 +897,8 @@ class TestPayinsSync:
             assert response["error"] is None
             assert response["data"] == mocked_evm_payin
             mock_request.assert_called_once_with(
-                "POST", "/instances/in_000000000000/payins/evm", {"payin_quote_id": "pq_000000000000"}
+                "POST",
+                "/instances/in_000000000000/payins/evm",
+                {"payin_quote_id": "pq_000000000000"},
+                idempotency_key=ANY,
             )
@@ -1,8 +1,33 @@
-from unittest.mock import patch
+from unittest.mock import ANY, call, patch
 
 import pytest
 
-from blindpay import BlindPay, BlindPaySync
+from blindpay import BlindPay, BlindPayApiError, BlindPaySync
+
+PAYOUT_PAGES = [
+    {
+        "data": {
+            "data": [{"id": "pa_000000000001"}, {"id": "pa_000000000002"}],
+            "pagination": {"has_more": True, "next_page": "pa_000000000003", "prev_page": None},
+        },
+        "error": None,
+    },
+    {
+        "data": {
+            "data": [{"id": "pa_000000000003"}],
+            "pagination": {"has_more": False, "next_page": None, "prev_page": "pa_000000000002"},
+        },
+        "error": None,
+    },
+]
+
+PAYOUT_PAGE_PATHS = [
+    call("GET", "/instances/in_000000000000/payouts?limit=1000&customer_id=cu_000000000000"),
+    call(
+        "GET",
+        "/instances/in_000000000000/payouts?limit=1000&customer_id=cu_000000000000&starting_after=pa_000000000002",
+    ),
+]
 
 
 class TestPayouts:
@@ -123,6 +148,29 @@ class TestPayouts:
             assert response["data"] == mocked_payouts
             mock_request.assert_called_once_with("GET", "/instances/in_000000000000/payouts")
 
+    @pytest.mark.asyncio
+    async def test_list_all_payouts(self):
+        with patch.object(self.blindpay._api, "_request") as mock_request:
+            mock_request.side_effect = PAYOUT_PAGES
+
+            payouts = [payout async for payout in self.blindpay.payouts.list_all({"customer_id": "cu_000000000000"})]
+
+            assert [payout["id"] for payout in payouts] == ["pa_000000000001", "pa_000000000002", "pa_000000000003"]
+            assert mock_request.call_args_list == PAYOUT_PAGE_PATHS
+
+    @pytest.mark.asyncio
+    async def test_list_all_payouts_raises_on_error(self):
+        with patch.object(self.blindpay._api, "_request") as mock_request:
+            mock_request.side_effect = [PAYOUT_PAGES[0], {"data": None, "error": {"message": "Unauthorized"}}]
+
+            seen = []
+            with pytest.raises(BlindPayApiError) as exc_info:
+                async for payout in self.blindpay.payouts.list_all():
+                    seen.append(payout["id"])
+
+            assert seen == ["pa_000000000001", "pa_000000000002"]
+            assert exc_info.value.error == {"message": "Unauthorized"}
+
     @pytest.mark.asyncio
     async def test_get_payout(self):
         mocked_payout = {
@@ -526,6 +574,7 @@ class TestPayouts:
                     "sender_wallet_address": "0x123...890",
                     "signed_transaction": "signed_xdr_string",
                 },
+                idempotency_key=ANY,
             )
 
     @pytest.mark.asyncio
@@ -588,6 +637,7 @@ class TestPayouts:
                     "quote_id": "qu_000000000000",
                     "sender_wallet_address": "0x123...890",
                 },
+                idempotency_key=ANY,
             )
 
 
@@ -708,6 +758,15 @@ class TestPayoutsSync:
             assert response["data"] == mocked_payouts
             mock_request.assert_called_once_with("GET", "/instances/in_000000000000/payouts")
 
+    def test_list_all_payouts(self):
+        with patch.object(self.blindpay._api, "_request") as mock_request:
+            mock_request.side_effect = PAYOUT_PAGES
+
+            payouts = list(self.blindpay.payouts.list_all({"customer_id": "cu_000000000000"}))
+
+            assert [payout["id"] for payout in payouts] == ["pa_000000000001", "pa_000000000002", "pa_000000000003"]
+            assert mock_request.call_args_list == PAYOUT_PAGE_PATHS
+
     def test_get_payout(self):
         mocked_payout = {
             "customer_id": "re_000000000000",
@@ -1106,6 +1165,7 @@ class TestPayoutsSync:
                     "sender_wallet_address": "0x123...890",
                     "signed_transaction": "signed_xdr_string",
                 },
+                idempotency_key=ANY,
             )
 
     def test_create_evm_payout(self):
@@ -1167,4 +1227,5 @@ class TestPayoutsSync:
                     "quote_id": "qu_000000000000",
                     "sender_wallet_address": "0x123...890",
                 },
+                idempotency_key=ANY,
             )
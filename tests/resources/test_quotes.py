@@ -1,9 +1,80 @@
-from unittest.mock import patch
+import asyncio
+import json
+import threading
+import time
+from typing import Any, Awaitable, Callable
+from unittest.mock import ANY, patch
 
+import httpx
 import pytest
 
-from blindpay import BlindPay, BlindPaySync
-from blindpay.resources.quotes.quotes import CreateQuoteResponse
+from blindpay import BlindPay, BlindPayError, BlindPaySync, FxRateCache, QuoteCache
+from blindpay.resources.payins.quotes import CreatePayinQuoteInput
+from blindpay.resources.quotes.quotes import CreateQuoteInput, CreateQuoteResponse, GetFxRateInput
+from tests.conftest import ClientFactory
+
+QUOTE_INPUT: CreateQuoteInput = {
+    "bank_account_id": "ba_000000000000",
+    "currency_type": "sender",
+    "network": "base",
+    "request_amount": 1000,
+    "token": "USDC",
+    "cover_fees": None,
+    "description": None,
+    "partner_fee_id": None,
+    "transaction_document_file": None,
+    "transaction_document_id": None,
+    "transaction_document_type": "invoice",
+}
+
+PAYIN_QUOTE_INPUT: CreatePayinQuoteInput = {
+    "blockchain_wallet_id": "bw_000000000000",
+    "currency_type": "sender",
+    "payment_method": "pix",
+    "request_amount": 1000,
+    "token": "USDC",
+}
+
+
+def quote_handler(calls: list[dict[str, object]], ttl: float = 60.0) -> Callable[[httpx.Request], httpx.Response]:
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        calls.append(body)
+        if body.get("bank_account_id") == "ba_broken":
+            return httpx.Response(400, json={"message": "Invalid bank account"})
+        return httpx.Response(
+            200, json={"id": f"qu_{len(calls)}", "expires_at": int((time.time() + ttl) * 1000), "flat_fee": 1.5}
+        )
+
+    return handler
+
+
+FX_INPUT: GetFxRateInput = {"currency_type": "sender", "from_currency": "USD", "to": "BRL", "request_amount": 1000}
+
+
+def fx_response(request: httpx.Request, calls: list[dict[str, Any]], flat_fee: float = 0) -> httpx.Response:
+    body = json.loads(request.content)
+    calls.append(body)
+    if body["to"] == "MXN":
+        return httpx.Response(503, json={"message": "Unavailable"})
+    return httpx.Response(
+        200,
+        json={
+            "commercial_quotation": 5.0,
+            "blindpay_quotation": 4.9,
+            "result_amount": (body["request_amount"] - flat_fee) * 4.9,
+            "instance_flat_fee": flat_fee,
+            "instance_percentage_fee": 0,
+        },
+    )
+
+
+def fx_handler(calls: list[dict[str, Any]]) -> Callable[[httpx.Request], Awaitable[httpx.Response]]:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.01)
+        return fx_response(request, calls)
+
+    return handler
 
 
 class TestQuotes:
@@ -74,6 +145,7 @@ class TestQuotes:
                     "transaction_document_id": None,
                     "transaction_document_type": "invoice",
                 },
+                idempotency_key=ANY,
             )
 
     @pytest.mark.asyncio
@@ -179,6 +251,7 @@ class TestQuotesSync:
                     "transaction_document_id": None,
                     "transaction_document_type": "invoice",
                 },
+                idempotency_key=ANY,
             )
 
     def test_get_fx_rate(self):
@@ -214,3 +287,211 @@ class TestQuotesSync:
                     "request_amount": 1000,
                 },
             )
+
+
+class TestQuoteCaching:
+    @pytest.mark.asyncio
+    async def test_identical_requests_reuse_an_unexpired_quote(self, make_client: ClientFactory):
+        calls: list[dict[str, object]] = []
+        cache = QuoteCache(margin=10)
+
+        async with make_client(quote_handler(calls), quote_cache=cache) as blindpay:
+            first = await blindpay.quotes.create(QUOTE_INPUT)
+            second = await blindpay.quotes.create({**QUOTE_INPUT, "request_amount": 1000.0})
+            other = await blindpay.quotes.create({**QUOTE_INPUT, "request_amount": 2000})
+            payin = await blindpay.payins.quotes.create(PAYIN_QUOTE_INPUT)
+            payin_again = await blindpay.payins.quotes.create(dict(reversed(PAYIN_QUOTE_INPUT.items())))  # type: ignore[arg-type]
+
+        assert first["data"] is not None and second["data"] is not None and other["data"] is not None
+        assert second["data"]["id"] == first["data"]["id"] == "qu_1"
+        assert other["data"]["id"] == "qu_2"
+        assert payin["data"] == payin_again["data"]
+        assert len(calls) == 3
+        assert (cache.hits, cache.misses) == (2, 3)
+
+    @pytest.mark.asyncio
+    async def test_quotes_close_to_expiry_are_not_reused(self, make_client: ClientFactory):
+        calls: list[dict[str, object]] = []
+
+        async with make_client(quote_handler(calls, ttl=5), quote_cache=QuoteCache(margin=10)) as blindpay:
+            await blindpay.quotes.create(QUOTE_INPUT)
+            await blindpay.quotes.create(QUOTE_INPUT)
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_and_explicit_idempotency_keys_bypass_the_cache(self, make_client: ClientFactory):
+        calls: list[dict[str, object]] = []
+        cache = QuoteCache()
+        broken: CreateQuoteInput = {**QUOTE_INPUT, "bank_account_id": "ba_broken"}
+
+        async with make_client(quote_handler(calls), quote_cache=cache) as blindpay:
+            for _ in range(2):
+                response = await blindpay.quotes.create(broken)
+                assert response["error"] is not None
+            await blindpay.quotes.create(QUOTE_INPUT)
+            replayed = await blindpay.quotes.create(QUOTE_INPUT, idempotency_key="checkout-42")
+
+        assert len(calls) == 4
+        assert replayed["data"] is not None and replayed["data"]["id"] == "qu_4"
+        assert len(cache) == 1
+
+    @pytest.mark.asyncio
+    async def test_checkouts_never_get_a_quote_that_was_already_used(self, make_client: ClientFactory):
+        calls: list[dict[str, object]] = []
+        respond = quote_handler(calls)
+        used: set[str] = set()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if not request.url.path.endswith(("/payouts/evm", "/payins/evm")):
+                return respond(request)
+            body = json.loads(request.content)
+            quote_id = body.get("quote_id") or body["payin_quote_id"]
+            if quote_id in used:
+                return httpx.Response(409, json={"message": "Quote already used", "code": "QUOTES_ALREADY_USED"})
+            used.add(quote_id)
+            return httpx.Response(200, json={"id": f"pa_{quote_id}"})
+
+        async with make_client(handler, quote_cache=QuoteCache()) as blindpay:
+            for _ in range(2):
+                quote = await blindpay.quotes.create(QUOTE_INPUT)
+                assert quote["data"] is not None
+                payout = await blindpay.payouts.create_evm(
+                    {"quote_id": quote["data"]["id"], "sender_wallet_address": "0x0"}
+                )
+                assert payout["error"] is None
+            for _ in range(2):
+                payin_quote = await blindpay.payins.quotes.create(PAYIN_QUOTE_INPUT)
+                assert payin_quote["data"] is not None
+                payin = await blindpay.payins.create_evm(payin_quote["data"]["id"])
+                assert payin["error"] is None
+
+        assert used == {"qu_1", "qu_2", "qu_3", "qu_4"}
+
+    def test_sync_client(self, make_client: ClientFactory):
+        calls: list[dict[str, object]] = []
+        cache = QuoteCache()
+
+        with make_client.sync(quote_handler(calls), quote_cache=cache) as blindpay:
+            first = blindpay.quotes.create(QUOTE_INPUT)
+            second = blindpay.quotes.create(QUOTE_INPUT)
+            assert first["data"] is not None
+            cache.discard(first["data"]["id"])
+            third = blindpay.payins.quotes.create(PAYIN_QUOTE_INPUT)
+            fourth = blindpay.quotes.create(QUOTE_INPUT)
+
+        assert first["data"] == second["data"]
+        assert third["data"] is not None and third["data"]["id"] == "qu_2"
+        assert fourth["data"] is not None and fourth["data"]["id"] == "qu_3"
+
+
+class TestFxRateCaching:
+    @pytest.mark.asyncio
+    async def test_amounts_in_one_bucket_share_a_rate(self, make_client: ClientFactory):
+        calls: list[dict[str, Any]] = []
+        cache = FxRateCache(ttl=60)
+
+        async with make_client(fx_handler(calls), fx_cache=cache) as blindpay:
+            first = await blindpay.quotes.get_fx_rate(FX_INPUT)
+            nearby = await blindpay.quotes.get_fx_rate({**FX_INPUT, "request_amount": 1005})
+            far = await blindpay.quotes.get_fx_rate({**FX_INPUT, "request_amount": 2000})
+            other_pair = await blindpay.quotes.get_fx_rate({**FX_INPUT, "to": "COP"})
+            payin = await blindpay.payins.quotes.get_fx_rate(FX_INPUT)
+
+        assert [call["request_amount"] for call in calls] == [1000, 2000, 1000, 1000]
+        assert first["data"] is not None and nearby["data"] is not None
+        assert nearby["data"]["result_amount"] == pytest.approx(1005 * 4.9)
+        assert far["data"] is not None and far["data"]["result_amount"] == pytest.approx(2000 * 4.9)
+        assert other_pair["error"] is None and payin["error"] is None
+        assert cache.stats() == {"hits": 1, "stale_hits": 0, "misses": 4, "coalesced": 0, "size": 4}
+
+    def test_rates_in_a_bucket_are_estimated_with_the_instance_fees(self, make_client: ClientFactory):
+        calls: list[dict[str, Any]] = []
+        cache = FxRateCache(ttl=60)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return fx_response(request, calls, flat_fee=5)
+
+        with make_client.sync(handler, fx_cache=cache) as blindpay:
+            first = blindpay.quotes.get_fx_rate(FX_INPUT)
+            nearby = blindpay.quotes.get_fx_rate({**FX_INPUT, "request_amount": 1005})
+
+        assert len(calls) == 1
+        assert first["data"] is not None and first["data"]["result_amount"] == pytest.approx(995 * 4.9)
+        assert nearby["data"] is not None and nearby["data"]["result_amount"] == pytest.approx(1000 * 4.9)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_are_coalesced(self, make_client: ClientFactory):
+        calls: list[dict[str, Any]] = []
+        cache = FxRateCache(ttl=60)
+
+        async with make_client(fx_handler(calls), fx_cache=cache) as blindpay:
+            responses = await asyncio.gather(
+                *(blindpay.quotes.get_fx_rate({**FX_INPUT, "request_amount": 1000 + n}) for n in range(5))
+            )
+            failures = await asyncio.gather(*(blindpay.quotes.get_fx_rate({**FX_INPUT, "to": "MXN"}) for _ in range(3)))
+
+        assert len(calls) == 2
+        assert [response["data"]["result_amount"] for response in responses if response["data"]] == pytest.approx(
+            [(1000 + n) * 4.9 for n in range(5)]
+        )
+        assert all(failure["error"] is not None for failure in failures)
+        assert cache.coalesced == 6
+        assert len(cache.stats()) == 5 and cache.stats()["size"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_rates_are_served_while_refreshing(
+        self, monkeypatch: pytest.MonkeyPatch, make_client: ClientFactory
+    ):
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now)
+        calls: list[dict[str, Any]] = []
+        cache = FxRateCache(ttl=5, stale_ttl=10, bucket_ratio=0)
+
+        async with make_client(fx_handler(calls), fx_cache=cache) as blindpay:
+            await blindpay.quotes.get_fx_rate(FX_INPUT)
+            now += 6
+            stale = await blindpay.quotes.get_fx_rate(FX_INPUT)
+            assert stale["data"] is not None and len(calls) == 1
+            await asyncio.sleep(0.05)
+            assert len(calls) == 2
+            await blindpay.quotes.get_fx_rate(FX_INPUT)
+            now += 20
+            await blindpay.quotes.get_fx_rate(FX_INPUT)
+
+        assert len(calls) == 3
+        assert (cache.hits, cache.stale_hits, cache.misses) == (1, 1, 2)
+
+    def test_sync_client(self, make_client: ClientFactory):
+        calls: list[dict[str, Any]] = []
+        cache = FxRateCache(ttl=60, max_size=1)
+        release = threading.Event()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            release.wait(1)
+            return fx_response(request, calls)
+
+        with make_client.sync(handler, fx_cache=cache) as blindpay:
+            results: list[Any] = []
+            threads = [
+                threading.Thread(target=lambda: results.append(blindpay.payins.quotes.get_fx_rate(FX_INPUT)))
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            time.sleep(0.05)
+            release.set()
+            for thread in threads:
+                thread.join()
+            blindpay.quotes.get_fx_rate({**FX_INPUT, "to": "COP"})
+            blindpay.payins.quotes.get_fx_rate(FX_INPUT)
+
+        assert len(calls) == 3
+        assert all(result["error"] is None for result in results)
+        assert cache.stats()["size"] == 1
+
+    def test_options_are_validated(self):
+        with pytest.raises(BlindPayError):
+            FxRateCache(bucket_ratio=-0.1)
+        with pytest.raises(BlindPayError):
+            FxRateCache(max_size=0)
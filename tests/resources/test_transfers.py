@@ -1,4 +1,4 @@
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 import pytest
 
@@ -97,6 +97,7 @@ class TestTransfers:
                 "POST",
                 "/instances/in_000000000000/transfers",
                 {"transfer_quote_id": "tq_000000000000"},
+                idempotency_key=ANY,
             )
 
     @pytest.mark.asyncio
@@ -269,6 +270,7 @@ class TestTransfersSync:
                 "POST",
                 "/instances/in_000000000000/transfers",
                 {"transfer_quote_id": "tq_000000000000"},
+                idempotency_key=ANY,
             )
 
     def test_get_transfer(self):
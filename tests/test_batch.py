@@ -0,0 +1,79 @@
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from blindpay import BlindPay, BlindPayError, BlindPaySync, RetryPolicy
+
+
+class TestGetMany:
+    @pytest.mark.asyncio
+    async def test_results_follow_input_order_with_per_id_errors(self):
+        requested: list[str] = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            payout_id = request.url.path.rsplit("/", 1)[1]
+            requested.append(payout_id)
+            # Earlier ids answer last.
+            await asyncio.sleep(0.01 / len(requested))
+            if payout_id == "pa_missing":
+                return httpx.Response(404, json={"message": "Payout not found"})
+            return httpx.Response(200, json={"id": payout_id})
+
+        async with BlindPay(
+            api_key="test-key", instance_id="in_000000000000", transport=httpx.MockTransport(handler)
+        ) as blindpay:
+            results = await blindpay.payouts.get_many(["pa_1", "pa_2", "pa_missing", "pa_1", "pa_3"])
+
+        assert [r["data"]["id"] if r["data"] else None for r in results] == ["pa_1", "pa_2", None, "pa_1", "pa_3"]
+        assert results[2]["error"] == {"message": "Payout not found", "status": 404, "is_retryable": False}
+        assert sorted(requested) == ["pa_1", "pa_2", "pa_3", "pa_missing"]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self):
+        in_flight = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.005)
+            in_flight -= 1
+            return httpx.Response(200, json={"id": request.url.path.rsplit("/", 1)[1]})
+
+        async with BlindPay(
+            api_key="test-key", instance_id="in_000000000000", transport=httpx.MockTransport(handler)
+        ) as blindpay:
+            results = await blindpay.customers.get_many([f"cu_{n}" for n in range(30)], concurrency=4)
+
+        assert len(results) == 30
+        assert peak == 4
+
+    @pytest.mark.asyncio
+    async def test_empty_batch_and_invalid_concurrency(self):
+        async with BlindPay(api_key="test-key", instance_id="in_000000000000") as blindpay:
+            assert await blindpay.transfers.get_many([]) == []
+            with pytest.raises(BlindPayError):
+                await blindpay.transfers.get_many(["tr_1"], concurrency=0)
+
+    def test_sync_get_many_uses_a_thread_pool(self):
+        threads: set[str] = set()
+        lock = threading.Lock()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            with lock:
+                threads.add(threading.current_thread().name)
+            return httpx.Response(200, json={"id": request.url.path.rsplit("/", 1)[1]})
+
+        with BlindPaySync(
+            api_key="test-key",
+            instance_id="in_000000000000",
+            transport=httpx.MockTransport(handler),
+            retry=RetryPolicy(max_retries=0),
+        ) as blindpay:
+            results = blindpay.payins.get_many(["pi_2", "pi_1", "pi_2"], concurrency=2)
+
+        assert [r["data"]["id"] if r["data"] else None for r in results] == ["pi_2", "pi_1", "pi_2"]
+        assert all(name.startswith("blindpay-batch") for name in threads)
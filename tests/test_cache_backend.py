@@ -0,0 +1,263 @@
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import httpx
+import pytest
+
+from blindpay import (
+    BlindPay,
+    BlindPayError,
+    BlindPaySync,
+    MemoryCache,
+    ReferenceDataCache,
+    ResponseCache,
+    SqliteCache,
+)
+from blindpay.resources.partner_fees.partner_fees import CreatePartnerFeeInput
+
+PARTNER_FEE: CreatePartnerFeeInput = {
+    "virtual_account_set": False,
+    "evm_wallet_address": "0x0000000000000000000000000000000000000000",
+    "name": "Display Name",
+    "payin_flat_fee": 0,
+    "payin_percentage_fee": 0,
+    "payout_flat_fee": 50,
+    "payout_percentage_fee": 100,
+    "stellar_wallet_address": None,
+}
+
+
+class Clock:
+    def __init__(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        self.now = 1_700_000_000.0
+        monkeypatch.setattr(time, "time", lambda: self.now)
+
+
+def fees_handler(calls: list[str]) -> Callable[[httpx.Request], httpx.Response]:
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(f"{request.method} {request.url.path.removeprefix('/v1/instances/in_000000000000')}")
+        if request.method == "POST":
+            return httpx.Response(200, json={"id": "pf_000000000002"})
+        if request.url.path.endswith("/partner-fees"):
+            return httpx.Response(200, json=[{"id": f"pf_{len(calls)}"}])
+        if request.url.path.endswith("/customers"):
+            return httpx.Response(200, json={"data": [], "pagination": {}})
+        return httpx.Response(200, json={"id": "fe_000000000000", "calls": len(calls)})
+
+    return handler
+
+
+class TestMemoryCache:
+    def test_entries_expire_after_their_ttl(self, monkeypatch: pytest.MonkeyPatch):
+        clock = Clock(monkeypatch)
+        cache = MemoryCache(default_ttl=60)
+        cache.set("short", {"id": 1}, ttl=5)
+        cache.set("default", [1, 2, 3])
+        cache.set("none", "kept")
+
+        clock.now += 10
+        assert cache.get("short") is None
+        assert cache.get("default") == [1, 2, 3]
+        clock.now += 60
+        assert cache.get("default") is None
+        assert cache.stats()["expirations"] == 2
+
+    def test_least_recently_read_entries_are_evicted(self):
+        cache = MemoryCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert (cache.get("a"), cache.get("c")) == (1, 3)
+        assert cache.stats() == {"hits": 3, "misses": 1, "evictions": 1, "expirations": 0, "size": 2, "bytes": 2}
+
+    def test_size_is_bounded_in_bytes(self):
+        cache = MemoryCache(max_bytes=20)
+        cache.set("a", "x" * 8)
+        cache.set("b", "y" * 8)
+        cache.set("too-big", "z" * 30)
+        value = {"nested": ["v"]}
+        cache.set("c", value)
+        value["nested"].append("changed")
+
+        assert cache.get("too-big") is None
+        assert cache.get("a") is None
+        assert cache.get("c") == {"nested": ["v"]}
+        assert cache.stats()["bytes"] <= 20
+
+        with pytest.raises(BlindPayError):
+            MemoryCache(max_entries=0)
+
+
+class TestSqliteCache:
+    def test_entries_are_shared_through_the_file(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        clock = Clock(monkeypatch)
+        path = tmp_path / "cache.db"
+
+        with SqliteCache(path) as first, SqliteCache(path, default_ttl=30) as second:
+            first.set("fees", {"id": "fe_000000000000"})
+            second.set("rails", ["pix"])
+            assert second.get("fees") == {"id": "fe_000000000000"}
+            assert first.get("rails") == ["pix"]
+
+            clock.now += 31
+            assert first.get("rails") is None
+            first.delete("fees")
+            assert second.get("fees") is None
+            assert second.stats()["size"] == 0
+
+    def test_least_recently_read_entries_are_evicted(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        clock = Clock(monkeypatch)
+
+        with SqliteCache(tmp_path / "cache.db", max_entries=2) as cache:
+            for key in ("a", "b"):
+                cache.set(key, key)
+                clock.now += 60
+            assert cache.get("a") == "a"
+            clock.now += 1
+            cache.set("c", "c")
+
+            assert [cache.get(key) for key in ("a", "b", "c")] == ["a", None, "c"]
+            assert cache.stats() == {
+                "hits": 3,
+                "misses": 1,
+                "evictions": 1,
+                "expirations": 0,
+                "size": 2,
+                "bytes": 6,
+            }
+            cache.clear()
+            assert cache.stats()["size"] == 0
+
+    def test_reads_within_a_minute_do_not_write(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        clock = Clock(monkeypatch)
+
+        with SqliteCache(tmp_path / "cache.db") as cache:
+            cache.set("fees", {"id": "fe_000000000000"})
+            writes = cache._db.total_changes
+            clock.now += 59
+            assert cache.get("fees") == {"id": "fe_000000000000"}
+            assert cache._db.total_changes == writes
+
+            clock.now += 1
+            assert cache.get("fees") == {"id": "fe_000000000000"}
+            assert cache._db.total_changes == writes + 1
+
+
+class TestResponseCache:
+    @pytest.mark.asyncio
+    async def test_selected_endpoints_are_cached_until_written(self):
+        calls: list[str] = []
+        cache = ResponseCache(ttl=60)
+
+        async with BlindPay(
+            api_key="test-key",
+            instance_id="in_000000000000",
+            transport=httpx.MockTransport(fees_handler(calls)),
+            response_cache=cache,
+        ) as blindpay:
+            fees = [await blindpay.fees.get() for _ in range(3)]
+            before = await blindpay.partner_fees.list()
+            assert before == await blindpay.partner_fees.list()
+            await blindpay.partner_fees.create(PARTNER_FEE)
+            after = await blindpay.partner_fees.list()
+            await blindpay.customers.list()
+            await blindpay.customers.list()
+
+        assert fees[0] == fees[2] == {"data": {"id": "fe_000000000000", "calls": 1}, "error": None}
+        assert before != after
+        assert calls == [
+            "GET /billing/fees",
+            "GET /partner-fees",
+            "POST /partner-fees",
+            "GET /partner-fees",
+            "GET /customers",
+            "GET /customers",
+        ]
+
+    @pytest.mark.parametrize("backend", ["memory", "sqlite"])
+    def test_writes_drop_the_responses_of_every_query_string(self, backend: str, tmp_path: Path):
+        cache = ResponseCache(MemoryCache() if backend == "memory" else SqliteCache(tmp_path / "cache.db"))
+        fees = "/instances/in_000000000000/partner-fees"
+        for path in (fees, f"{fees}?limit=10", f"{fees}?limit=20", f"{fees}/pf_1", f"{fees}/pf_10"):
+            cache.store(path, {"path": path})
+
+        cache.invalidate(f"{fees}/pf_1")
+
+        assert all(cache.get(path) is None for path in (fees, f"{fees}?limit=10", f"{fees}?limit=20", f"{fees}/pf_1"))
+        assert cache.get(f"{fees}/pf_10") == {"path": f"{fees}/pf_10"}
+        if isinstance(cache.backend, SqliteCache):
+            cache.backend.close()
+
+    @pytest.mark.asyncio
+    async def test_async_client_calls_the_backend_off_the_loop(self):
+        threads: list[int] = []
+
+        class RecordingCache(MemoryCache):
+            def get(self, key: str) -> Any:
+                threads.append(threading.get_ident())
+                return super().get(key)
+
+            def set(self, key: str, value: Any, ttl: Any = None) -> None:
+                threads.append(threading.get_ident())
+                super().set(key, value, ttl)
+
+        async with BlindPay(
+            api_key="test-key",
+            instance_id="in_000000000000",
+            transport=httpx.MockTransport(fees_handler([])),
+            response_cache=ResponseCache(RecordingCache()),
+        ) as blindpay:
+            await blindpay.fees.get()
+            await blindpay.fees.get()
+
+        assert len(threads) == 3
+        assert threading.get_ident() not in threads
+
+    def test_sync_client_shares_a_sqlite_backend(self, tmp_path: Path):
+        calls: list[str] = []
+        responses: list[Any] = []
+        with SqliteCache(tmp_path / "cache.db") as backend:
+            for _ in range(2):
+                client = BlindPaySync(
+                    api_key="test-key",
+                    instance_id="in_000000000000",
+                    transport=httpx.MockTransport(fees_handler(calls)),
+                    response_cache=ResponseCache(backend),
+                )
+                responses.append(client.fees.get())
+                client.close()
+
+        assert responses[0] == responses[1]
+        assert calls == ["GET /billing/fees"]
+
+
+class TestReferenceDataCacheBackend:
+    @pytest.mark.asyncio
+    async def test_entries_live_in_the_backend(self):
+        calls: list[str] = []
+        backend = MemoryCache()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            return httpx.Response(200, json=[{"label": "PIX", "value": "pix", "country": "BR"}])
+
+        for _ in range(2):
+            async with BlindPay(
+                api_key="test-key",
+                instance_id="in_000000000000",
+                transport=httpx.MockTransport(handler),
+                reference_cache=ReferenceDataCache(ttl=60, backend=backend),
+            ) as blindpay:
+                rails = await blindpay.available.get_rails()
+                assert rails["data"] == [{"label": "PIX", "value": "pix", "country": "BR"}]
+
+        assert calls == ["/v1/available/rails"]
+        assert backend.stats()["size"] == 1
+
+        with pytest.raises(BlindPayError):
+            ReferenceDataCache(path="reference.json", backend=backend)
@@ -0,0 +1,127 @@
+import httpx
+import pytest
+
+from blindpay import BlindPay, BlindPaySync, CircuitBreaker, RetryPolicy
+from blindpay._internal.circuit_breaker import response_health
+from blindpay._internal.endpoints import path_template
+from blindpay.resources.payouts import CreateEvmPayoutInput
+from tests.conftest import FakeClock
+
+EVM_PAYOUT = "/instances/in_000000000000/payouts/evm"
+
+
+class TestPathTemplate:
+    def test_replaces_identifiers(self):
+        assert path_template("/instances/in_000000000000/payouts/evm") == "/instances/{id}/payouts/evm"
+        assert path_template("/e/payouts/pa_000000000000") == "/e/payouts/{id}"
+        assert (
+            path_template("/instances/in_000000000000/customers/re_000000000000/bank-accounts")
+            == "/instances/{id}/customers/{id}/bank-accounts"
+        )
+        assert path_template("/available/bank-details?rail=pix") == "/available/bank-details"
+        assert path_template("/instances/in_000000000000/mint-usdb-stellar") == "/instances/{id}/mint-usdb-stellar"
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker(failure_threshold=3, clock=FakeClock())
+
+        for _ in range(2):
+            assert breaker.allow(EVM_PAYOUT)
+            breaker.record(EVM_PAYOUT, False)
+        assert breaker.allow(EVM_PAYOUT)
+        breaker.record(EVM_PAYOUT, True)
+        assert breaker.state(EVM_PAYOUT) == "closed"
+
+        for _ in range(3):
+            breaker.record(EVM_PAYOUT, False)
+
+        assert breaker.state("/instances/in_000000000001/payouts/evm") == "open"
+        assert not breaker.allow(EVM_PAYOUT)
+        assert breaker.allow("/instances/in_000000000000/quotes")
+
+    def test_half_open_probe_closes_or_reopens(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record(EVM_PAYOUT, False)
+
+        clock.now = 10
+        assert breaker.state(EVM_PAYOUT) == "half_open"
+        assert breaker.allow(EVM_PAYOUT)
+        assert not breaker.allow(EVM_PAYOUT)
+        breaker.record(EVM_PAYOUT, False)
+        assert breaker.state(EVM_PAYOUT) == "open"
+
+        clock.now = 20
+        assert breaker.allow(EVM_PAYOUT)
+        breaker.record(EVM_PAYOUT, True)
+        assert breaker.state(EVM_PAYOUT) == "closed"
+
+    def test_neutral_outcome_frees_the_probe(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record(EVM_PAYOUT, False)
+        clock.now = 10
+
+        assert breaker.allow(EVM_PAYOUT)
+        breaker.record(EVM_PAYOUT, None)
+
+        assert breaker.state(EVM_PAYOUT) == "half_open"
+        assert breaker.allow(EVM_PAYOUT)
+
+    def test_response_health(self):
+        assert response_health(503) is False
+        assert response_health(429) is None
+        assert response_health(422) is True
+        assert response_health(200) is True
+
+
+class TestClientCircuitBreaking:
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast_without_affecting_other_endpoints(self):
+        calls: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            if request.url.path.endswith("/payouts/evm"):
+                return httpx.Response(503, json={"message": "Service unavailable"})
+            return httpx.Response(200, json={"id": "qu_000000000000"})
+
+        async with BlindPay(
+            api_key="test-key",
+            instance_id="in_000000000000",
+            transport=httpx.MockTransport(handler),
+            retry=RetryPolicy(max_retries=0),
+            circuit_breaker=CircuitBreaker(failure_threshold=2),
+        ) as blindpay:
+            payout: CreateEvmPayoutInput = {"quote_id": "qu_000000000000", "sender_wallet_address": "0x123...890"}
+            for _ in range(2):
+                response = await blindpay.payouts.create_evm(payout)
+                assert response["error"] == {"message": "Service unavailable", "status": 503, "is_retryable": True}
+
+            response = await blindpay.payouts.create_evm(payout)
+            quote = await blindpay.payouts.get("pa_000000000000")
+
+        assert response["error"] is not None
+        assert response["error"].get("code") == "circuit_open"
+        assert "/instances/{id}/payouts/evm" in response["error"]["message"]
+        assert quote["error"] is None
+        assert len(calls) == 3
+
+    def test_sync_client_counts_transport_errors(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("connection refused", request=request)
+
+        with BlindPaySync(
+            api_key="test-key",
+            instance_id="in_000000000000",
+            transport=httpx.MockTransport(handler),
+            retry=RetryPolicy(max_retries=0),
+            circuit_breaker=CircuitBreaker(failure_threshold=1),
+        ) as blindpay:
+            first = blindpay.fees.get()
+            second = blindpay.fees.get()
+
+        assert first["error"] == {"message": "connection refused", "code": "connection_error", "is_retryable": True}
+        assert second["error"] is not None
+        assert second["error"].get("code") == "circuit_open"
@@ -1,8 +1,12 @@
 import base64
 import hashlib
 import hmac
+import sys
 
-from blindpay import BlindPay, BlindPaySync
+import httpx
+import pytest
+
+from blindpay import BlindPay, BlindPayError, BlindPaySync, RetryPolicy
 
 
 class TestBlindPayClient:
@@ -41,6 +45,131 @@ class TestBlindPayClient:
 
         assert is_valid is False
 
+    @pytest.mark.asyncio
+    async def test_requests_share_one_pooled_client(self):
+        seen_clients = []
+        seen_paths = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_paths.append(request.url.path)
+            return httpx.Response(200, json={"id": request.url.path.rsplit("/", 1)[-1]})
+
+        client = BlindPay(api_key="test-key", instance_id="in_000000000000", transport=httpx.MockTransport(handler))
+        pooled = client._api.client
+
+        for payout_id in ("pa_000000000001", "pa_000000000002"):
+            response = await client.payouts.get(payout_id)
+            seen_clients.append(client._api.client)
+            assert response["error"] is None
+
+        assert seen_paths == [
+            "/v1/instances/in_000000000000/payouts/pa_000000000001",
+            "/v1/instances/in_000000000000/payouts/pa_000000000002",
+        ]
+        assert all(c is pooled for c in seen_clients)
+        assert not pooled.is_closed
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_async_context_manager_closes_client(self):
+        async with BlindPay(api_key="test-key", instance_id="in_000000000000") as client:
+            assert not client._api.client.is_closed
+
+        assert client._api.client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_http2_enabled_on_pooled_client(self):
+        pytest.importorskip("h2")
+        async with BlindPay(api_key="test-key", instance_id="in_000000000000", http2=True) as client:
+            transport = client._api.client._transport
+            assert isinstance(transport, (httpx.AsyncHTTPTransport, httpx.HTTPTransport))
+            assert transport._pool._http2 is True
+
+    def test_http2_without_h2_installed_raises(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "h2", None)
+        with pytest.raises(BlindPayError, match="blindpay\\[http2\\]"):
+            BlindPay(api_key="test-key", instance_id="in_000000000000", http2=True)
+
+    @pytest.mark.asyncio
+    async def test_custom_base_url_timeout_and_transport(self):
+        seen_urls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_urls.append(str(request.url))
+            return httpx.Response(200, json=[])
+
+        timeout = httpx.Timeout(5.0, connect=1.0, read=120.0, write=10.0, pool=2.0)
+        async with BlindPay(
+            api_key="test-key",
+            instance_id="in_000000000000",
+            base_url="http://localhost:8080/v1/",
+            timeout=timeout,
+            transport=httpx.MockTransport(handler),
+        ) as client:
+            response = await client.available.get_rails()
+
+            assert client._api.client.timeout == timeout
+
+        assert response["error"] is None
+        assert seen_urls == ["http://localhost:8080/v1/available/rails"]
+
+    @pytest.mark.asyncio
+    async def test_error_results_carry_status_code_and_request_id(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if "/customers/" in request.url.path:
+                return httpx.Response(
+                    404,
+                    json={"code": "CUSTOMERS_NOT_FOUND", "message": "customer_not_found", "trace_id": "0af7651916cd"},
+                )
+            return httpx.Response(
+                503,
+                json={"message": "Service unavailable"},
+                headers={"Retry-After": "7", "X-Request-Id": "req_123"},
+            )
+
+        async with BlindPay(
+            api_key="test-key",
+            instance_id="in_000000000000",
+            transport=httpx.MockTransport(handler),
+            retry=RetryPolicy(max_retries=0),
+        ) as client:
+            customer = await client.customers.get("cu_000000000000")
+            payout = await client.payouts.get("pa_000000000000")
+
+        assert customer["error"] == {
+            "message": "customer_not_found",
+            "code": "CUSTOMERS_NOT_FOUND",
+            "status": 404,
+            "request_id": "0af7651916cd",
+            "is_retryable": False,
+        }
+        assert payout["error"] == {
+            "message": "Service unavailable",
+            "status": 503,
+            "request_id": "req_123",
+            "retry_after": 7.0,
+            "is_retryable": True,
+        }
+
+    @pytest.mark.asyncio
+    async def test_error_codes_decide_whether_an_error_is_retryable(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("/payouts/evm"):
+                return httpx.Response(400, json={"code": "PAYOUTS_ALLOWANCE_NOT_CONFIRMED", "message": "allowance"})
+            return httpx.Response(500, json={"code": "BILLING_NOT_AVAILABLE", "message": "billing_not_available"})
+
+        async with BlindPay(
+            api_key="test-key",
+            instance_id="in_000000000000",
+            transport=httpx.MockTransport(handler),
+            retry=RetryPolicy(max_retries=0),
+        ) as client:
+            payout = await client.payouts.create_evm({"quote_id": "qu_000000000000", "sender_wallet_address": "0x0"})
+            fees = await client.fees.get()
+
+        assert payout["error"] is not None and payout["error"]["is_retryable"] is True
+        assert fees["error"] is not None and fees["error"]["is_retryable"] is False
+
 
 class TestBlindPaySyncClient:
     def test_sync_client_verify_webhook_signature(self):
@@ -79,3 +208,51 @@ class TestBlindPaySyncClient:
         )
 
         assert is_valid is False
+
+    def test_sync_client_http2_enabled(self):
+        pytest.importorskip("h2")
+        with BlindPaySync(api_key="test-key", instance_id="in_000000000000", http2=True) as client:
+            transport = client._api.client._transport
+            assert isinstance(transport, (httpx.AsyncHTTPTransport, httpx.HTTPTransport))
+            assert transport._pool._http2 is True
+
+    def test_sync_client_custom_base_url_and_transport(self):
+        seen_urls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_urls.append(str(request.url))
+            return httpx.Response(200, json=[])
+
+        with BlindPaySync(
+            api_key="test-key",
+            instance_id="in_000000000000",
+            base_url="http://localhost:8080/v1",
+            timeout=90.0,
+            transport=httpx.MockTransport(handler),
+        ) as client:
+            response = client.available.get_naics_codes()
+
+            assert client._api.client.timeout == httpx.Timeout(90.0)
+
+        assert response["error"] is None
+        assert seen_urls == ["http://localhost:8080/v1/available/naics"]
+
+    def test_sync_client_classifies_transport_errors(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "GET":
+                raise httpx.ReadTimeout("timed out", request=request)
+            raise httpx.RemoteProtocolError("server disconnected", request=request)
+
+        with BlindPaySync(
+            api_key="test-key",
+            instance_id="in_000000000000",
+            transport=httpx.MockTransport(handler),
+            retry=RetryPolicy(max_retries=0),
+        ) as client:
+            read = client.payouts.get("pa_000000000000")
+            write = client.payouts.authorize_stellar_token(
+                {"quote_id": "qu_000000000000", "sender_wallet_address": "G...ABC"}
+            )
+
+        assert read["error"] == {"message": "timed out", "code": "timeout", "is_retryable": True}
+        assert write["error"] == {"message": "server disconnected", "code": "network_error", "is_retryable": False}
@@ -0,0 +1,117 @@
+import asyncio
+from typing import Any
+
+import httpx
+import pytest
+
+from blindpay import BlindPay, CoalescePolicy
+
+CUSTOMER_PATH = "/v1/instances/in_000000000000/customers/cu_000000000000"
+
+
+def counting_handler(calls: list[str], delay: float = 0.01):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(f"{request.method} {request.url.path}")
+        await asyncio.sleep(delay)
+        return httpx.Response(200, json={"id": request.url.path.rsplit("/", 1)[1], "tags": []})
+
+    return handler
+
+
+def client(calls: list[str], **kwargs) -> BlindPay:
+    kwargs.setdefault("coalescing", CoalescePolicy())
+    return BlindPay(
+        api_key="test-key",
+        instance_id="in_000000000000",
+        transport=httpx.MockTransport(counting_handler(calls)),
+        **kwargs,
+    )
+
+
+class TestRequestCoalescing:
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_gets_share_one_request(self):
+        calls: list[str] = []
+
+        async with client(calls) as blindpay:
+            results = await asyncio.gather(*(blindpay.customers.get("cu_000000000000") for _ in range(20)))
+
+        assert calls == [f"GET {CUSTOMER_PATH}"]
+        assert all(result == {"data": {"id": "cu_000000000000", "tags": []}, "error": None} for result in results)
+        # Each caller owns its result.
+        results[0]["data"]["tags"].append("vip")
+        assert results[1]["data"]["tags"] == []
+
+    @pytest.mark.asyncio
+    async def test_the_first_caller_mutating_its_result_does_not_affect_the_others(self):
+        calls: list[str] = []
+
+        async with client(calls) as blindpay:
+
+            async def leader() -> None:
+                result = await blindpay.customers.get("cu_000000000000")
+                assert result["data"] is not None
+                result["data"]["tags"].append("mutated-by-leader")
+
+            async def follower() -> Any:
+                await asyncio.sleep(0)
+                return await blindpay.customers.get("cu_000000000000")
+
+            _, result = await asyncio.gather(leader(), follower())
+
+        assert calls == [f"GET {CUSTOMER_PATH}"]
+        assert result["data"] == {"id": "cu_000000000000", "tags": []}
+
+    @pytest.mark.asyncio
+    async def test_different_paths_and_sequential_calls_are_sent_separately(self):
+        calls: list[str] = []
+
+        async with client(calls) as blindpay:
+            await asyncio.gather(blindpay.customers.get("cu_000000000001"), blindpay.customers.get("cu_000000000002"))
+            await blindpay.customers.get("cu_000000000001")
+
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_writes_are_never_coalesced(self):
+        calls: list[str] = []
+
+        async with client(calls) as blindpay:
+            await asyncio.gather(*(blindpay.customers.delete("cu_000000000000") for _ in range(3)))
+
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_excluded_endpoints_and_coalescing_off_by_default(self):
+        calls: list[str] = []
+        policy = CoalescePolicy(exclude={"/instances/{id}/customers/{id}"})
+
+        async with client(calls, coalescing=policy) as blindpay:
+            await asyncio.gather(*(blindpay.customers.get("cu_000000000000") for _ in range(3)))
+            await asyncio.gather(*(blindpay.customers.get_limits("cu_000000000000") for _ in range(3)))
+
+        assert len(calls) == 4
+
+        calls.clear()
+        async with BlindPay(
+            api_key="test-key", instance_id="in_000000000000", transport=httpx.MockTransport(counting_handler(calls))
+        ) as blindpay:
+            await asyncio.gather(*(blindpay.customers.get("cu_000000000000") for _ in range(3)))
+
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_cancelling_the_first_caller_does_not_cancel_the_others(self):
+        calls: list[str] = []
+
+        async with client(calls) as blindpay:
+            first = asyncio.ensure_future(blindpay.customers.get("cu_000000000000"))
+            await asyncio.sleep(0)
+            second = asyncio.ensure_future(blindpay.customers.get("cu_000000000000"))
+            await asyncio.sleep(0)
+            first.cancel()
+
+            result = await second
+
+        assert result["error"] is None
+        assert calls == [f"GET {CUSTOMER_PATH}"]
@@ -0,0 +1,127 @@
+import asyncio
+
+import httpx
+import pytest
+
+from blindpay import AdaptiveConcurrencyLimiter, BlindPay, BlindPayError, RetryPolicy
+from tests.conftest import FakeClock
+
+
+class TestAdaptiveConcurrencyLimiter:
+    @pytest.mark.asyncio
+    async def test_healthy_responses_grow_the_limit_additively(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, clock=FakeClock())
+
+        for _ in range(4):
+            started_at = await limiter.acquire()
+            limiter.release(started_at)
+
+        assert limiter.limit == 4
+        assert limiter._limit == pytest.approx(4.95, abs=0.05)
+
+        for _ in range(2):
+            limiter.release(await limiter.acquire())
+        assert limiter.limit == 5
+
+    @pytest.mark.asyncio
+    async def test_overload_cuts_the_limit_once_per_window(self):
+        clock = FakeClock()
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=16, clock=clock)
+
+        started = [await limiter.acquire() for _ in range(3)]
+        clock.now = 1.0
+        for started_at in started:
+            limiter.release(started_at, overloaded=True)
+
+        assert limiter.limit == 8
+
+        limiter.release(await limiter.acquire(), overloaded=True)
+        assert limiter.limit == 4
+
+    @pytest.mark.asyncio
+    async def test_latency_spike_counts_as_overload(self):
+        clock = FakeClock()
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=10, latency_tolerance=2.0, clock=clock)
+
+        started_at = await limiter.acquire()
+        clock.now += 0.1
+        limiter.release(started_at)
+
+        started_at = await limiter.acquire()
+        clock.now += 0.5
+        limiter.release(started_at)
+
+        assert limiter.limit == 5
+
+    @pytest.mark.asyncio
+    async def test_never_drops_below_min_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, min_limit=2, clock=FakeClock())
+
+        limiter.release(await limiter.acquire(), overloaded=True)
+
+        assert limiter.limit == 2
+
+    @pytest.mark.asyncio
+    async def test_waits_for_a_free_slot(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, clock=FakeClock())
+        first = await limiter.acquire()
+
+        second = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        assert not second.done()
+        assert limiter.in_flight == 1
+
+        limiter.release(first)
+        await second
+        assert limiter.in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_release_without_an_outcome_only_frees_the_slot(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, clock=FakeClock())
+        first = await limiter.acquire()
+        second = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+
+        limiter.release(first, overloaded=None)
+        await second
+
+        assert limiter._limit == 1
+        assert limiter._average_latency is None
+
+    def test_rejects_inconsistent_limits(self):
+        with pytest.raises(BlindPayError):
+            AdaptiveConcurrencyLimiter(initial_limit=1, min_limit=2)
+
+
+class TestClientConcurrencyLimiting:
+    @pytest.mark.asyncio
+    async def test_429_shrinks_the_limit_and_bounds_in_flight_requests(self):
+        in_flight = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if request.url.path.endswith("pa_000000000000"):
+                return httpx.Response(429, json={"message": "Too many requests"})
+            return httpx.Response(200, json={"id": "pa_000000000001"})
+
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=4, latency_tolerance=100)
+        async with BlindPay(
+            api_key="test-key",
+            instance_id="in_000000000000",
+            transport=httpx.MockTransport(handler),
+            retry=RetryPolicy(max_retries=0),
+            concurrency_limiter=limiter,
+        ) as blindpay:
+            await asyncio.gather(*(blindpay.payouts.get("pa_000000000001") for _ in range(12)))
+            assert peak <= 4
+
+            response = await blindpay.payouts.get("pa_000000000000")
+
+        assert response["error"] == {"message": "Too many requests", "status": 429, "is_retryable": True}
+        assert limiter.in_flight == 0
+        assert limiter.limit < 4
@@ -0,0 +1,133 @@
+import json
+from typing import AsyncIterator, Iterator
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from blindpay import BlindPay, BlindPayApiError, BlindPaySync, RetryPolicy
+from blindpay._internal.json_stream import JsonArrayParser
+
+RECORDS = [{"id": f"pa_{n}", "amount": n * 1.5, "note": 'with "quotes", ] and }'} for n in range(1, 6)]
+RECORDS.append({"id": "pa_6"})
+
+
+def chunked(text: str, size: int) -> list[bytes]:
+    data = text.encode()
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+class TestJsonArrayParser:
+    @pytest.mark.parametrize("size", [1, 3, 7, 64, 4096])
+    def test_yields_every_element_whatever_the_chunking(self, size: int):
+        text = json.dumps([*RECORDS, 12345, "é", True, None, []], indent=2, ensure_ascii=False)
+        parser = JsonArrayParser()
+
+        items = [item for i in range(0, len(text), size) for item in parser.feed(text[i : i + size])]
+        parser.close()
+
+        assert items == [*RECORDS, 12345, "é", True, None, []]
+
+    def test_number_split_across_chunks_is_not_cut_short(self):
+        parser = JsonArrayParser()
+
+        assert parser.feed("[12") == []
+        assert parser.feed("34, 5") == [1234]
+        assert parser.feed("]") == [5]
+        parser.close()
+
+    def test_empty_array(self):
+        parser = JsonArrayParser()
+
+        assert parser.feed(" [ ] ") == []
+        parser.close()
+
+    def test_rejects_non_array_and_truncated_input(self):
+        with pytest.raises(ValueError):
+            JsonArrayParser().feed('{"message": "nope"}')
+
+        parser = JsonArrayParser()
+        parser.feed('[{"id": "pa_1"}, {"id": "pa_2"')
+        with pytest.raises(ValueError):
+            parser.close()
+
+    def test_a_malformed_element_raises_once_it_is_complete(self):
+        parser = JsonArrayParser()
+
+        assert parser.feed('[{"id": "pa_1"}, {"id": ') == [{"id": "pa_1"}]
+        with pytest.raises(ValueError):
+            parser.feed("}, 2]")
+
+    def test_each_element_is_decoded_once_however_it_is_chunked(self):
+        text = json.dumps([{"note": 'a "quoted" \\ back\\slash]', "items": [[1], {"a": [2]}]}, "x" * 200, 3.5])
+        parser = JsonArrayParser()
+
+        with patch("blindpay._internal.json_stream.json.loads", wraps=json.loads) as loads:
+            items = [item for char in text for item in parser.feed(char)]
+        parser.close()
+
+        assert items == json.loads(text)
+        assert loads.call_count == 3
+
+
+class TestExportStream:
+    @pytest.mark.asyncio
+    async def test_records_are_yielded_before_the_body_has_arrived(self):
+        events: list[str] = []
+
+        async def body() -> AsyncIterator[bytes]:
+            for n, chunk in enumerate(chunked(json.dumps(RECORDS), 40)):
+                events.append(f"chunk {n}")
+                yield chunk
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.url.path == "/v1/instances/in_000000000000/export/payouts"
+            assert request.url.params["limit"] == "1000"
+            return httpx.Response(200, content=body())
+
+        async with BlindPay(
+            api_key="test-key", instance_id="in_000000000000", transport=httpx.MockTransport(handler)
+        ) as blindpay:
+            async for payout in blindpay.payouts.export_stream({"limit": "1000"}):
+                events.append(f"record {payout['id']}")
+
+        assert [e for e in events if e.startswith("record")] == [f"record pa_{n}" for n in range(1, 7)]
+        assert events.index("record pa_1") < events.index("chunk 2")
+
+    @pytest.mark.asyncio
+    async def test_error_response_raises(self):
+        def handler(_: httpx.Request) -> httpx.Response:
+            return httpx.Response(503, json={"message": "Service unavailable"})
+
+        async with BlindPay(
+            api_key="test-key",
+            instance_id="in_000000000000",
+            transport=httpx.MockTransport(handler),
+            retry=RetryPolicy(max_retries=0),
+        ) as blindpay:
+            with pytest.raises(BlindPayApiError) as exc_info:
+                async for _ in blindpay.payouts.export_stream():
+                    pass
+
+        assert exc_info.value.error == {"message": "Service unavailable", "status": 503, "is_retryable": True}
+
+    def test_sync_stream_and_truncated_body(self):
+        def body(text: str) -> Iterator[bytes]:
+            yield from chunked(text, 16)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.url.params["status"] == "completed"
+            text = json.dumps(RECORDS)
+            if request.url.params.get("offset") == "1000":
+                text = text[:-10]
+            return httpx.Response(200, content=body(text))
+
+        with BlindPaySync(
+            api_key="test-key", instance_id="in_000000000000", transport=httpx.MockTransport(handler)
+        ) as blindpay:
+            payins = list(blindpay.payins.export_stream({"limit": None, "offset": None, "status": "completed"}))
+
+            with pytest.raises(BlindPayApiError):
+                list(blindpay.payins.export_stream({"limit": "1000", "offset": "1000", "status": "completed"}))
+
+        assert payins == RECORDS
@@ -0,0 +1,163 @@
+import asyncio
+import csv
+import json
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import httpx
+import pytest
+
+from blindpay import BlindPayApiError, BlindPayError, RetryPolicy
+from tests.conftest import ClientFactory
+
+
+def payout(n: int) -> dict[str, Any]:
+    return {
+        "id": f"pa_{n}",
+        "status": "completed",
+        "sender_amount": n * 100,
+        "is_otc": n % 2 == 0,
+        "tracking_payment": {"step": "completed", "provider_name": "Rail", "completed_at": None},
+        "tracking_liquidity": None,
+    }
+
+
+def export_handler(
+    total: int, requests: list[dict[str, str]], fail_at_offset: Optional[int] = None
+) -> Callable[[httpx.Request], httpx.Response]:
+    """Serves `total` payouts from the offset paginated export endpoint"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = dict(request.url.params)
+        requests.append(params)
+        offset, limit = int(params["offset"]), int(params["limit"])
+        if offset == fail_at_offset:
+            return httpx.Response(500, json={"message": "Internal error"})
+        return httpx.Response(200, json=[payout(n) for n in range(offset + 1, min(offset + limit, total) + 1)])
+
+    return handler
+
+
+class TestExportToFile:
+    def test_ndjson_export_flattens_tracking_objects(self, tmp_path: Path, make_client: ClientFactory):
+        path = tmp_path / "payouts.ndjson"
+        requests: list[dict[str, str]] = []
+
+        with make_client.sync(export_handler(7, requests)) as blindpay:
+            written = blindpay.payouts.export_to_file(path, chunk_size=3, concurrency=2)
+
+        rows = [json.loads(line) for line in path.read_text().splitlines()]
+        assert written == 7
+        assert [row["id"] for row in rows] == [f"pa_{n}" for n in range(1, 8)]
+        assert rows[0]["tracking_payment_provider_name"] == "Rail"
+        assert "tracking_payment" not in rows[0] and "tracking_liquidity" not in rows[0]
+        offsets = sorted(int(r["offset"]) for r in requests)
+        # The page after the short one is only fetched if it was started before the short page came back.
+        assert offsets in ([0, 3, 6], [0, 3, 6, 9])
+        assert not (tmp_path / "payouts.ndjson.state").exists()
+
+    def test_csv_export_has_a_column_per_tracking_field(self, tmp_path: Path, make_client: ClientFactory):
+        path = tmp_path / "payins.csv"
+        requests: list[dict[str, str]] = []
+
+        with make_client.sync(export_handler(4, requests)) as blindpay:
+            blindpay.payins.export_to_file(path, "completed", format="csv", chunk_size=10)
+
+        with open(path, newline="") as f:
+            reader = csv.DictReader(f)
+            rows = list(reader)
+        assert reader.fieldnames is not None
+        assert "tracking_payment_provider_name" in reader.fieldnames
+        assert [row["id"] for row in rows] == ["pa_1", "pa_2", "pa_3", "pa_4"]
+        assert rows[0]["tracking_payment_completed_at"] == ""
+        assert rows[1]["is_otc"] == "true"
+        assert requests[0]["status"] == "completed"
+
+    def test_interrupted_export_resumes_after_the_last_complete_chunk(self, tmp_path: Path, make_client: ClientFactory):
+        path = tmp_path / "payouts.csv"
+        requests: list[dict[str, str]] = []
+
+        with make_client.sync(
+            export_handler(10, requests, fail_at_offset=4), retry=RetryPolicy(max_retries=0)
+        ) as blindpay:
+            with pytest.raises(BlindPayApiError):
+                blindpay.payouts.export_to_file(path, format="csv", chunk_size=2, concurrency=1)
+
+        state = json.loads((tmp_path / "payouts.csv.state").read_text())
+        assert state["records"] == 4
+        # A chunk that was only partly written when the export died is dropped on resume.
+        with open(path, "a") as f:
+            f.write("pa_5,half a row")
+
+        requests.clear()
+        with make_client.sync(export_handler(10, requests)) as blindpay:
+            written = blindpay.payouts.export_to_file(path, format="csv", chunk_size=2, concurrency=1)
+
+        with open(path, newline="") as f:
+            ids = [row["id"] for row in csv.DictReader(f)]
+        assert written == 10
+        assert ids == [f"pa_{n}" for n in range(1, 11)]
+        assert requests[0]["offset"] == "4"
+        assert not (tmp_path / "payouts.csv.state").exists()
+
+    def test_state_of_another_export_is_rejected(self, tmp_path: Path, make_client: ClientFactory):
+        path = tmp_path / "export.ndjson"
+        path.write_text("")
+        (tmp_path / "export.ndjson.state").write_text(
+            json.dumps({"job": {"endpoint": "payouts", "format": "ndjson"}, "records": 0, "starting_after": None})
+        )
+
+        with make_client.sync(export_handler(1, [])) as blindpay:
+            with pytest.raises(BlindPayError):
+                blindpay.payins.export_to_file(path, "completed")
+
+    @pytest.mark.asyncio
+    async def test_concurrent_chunks_are_written_in_order(self, tmp_path: Path, make_client: ClientFactory):
+        path = tmp_path / "payouts.ndjson"
+        requests: list[dict[str, str]] = []
+        respond = export_handler(20, requests)
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            # Later chunks answer first.
+            await asyncio.sleep(0.02 - int(request.url.params["offset"]) / 1000)
+            return respond(request)
+
+        async with make_client(handler) as blindpay:
+            written = await blindpay.payouts.export_to_file(path, chunk_size=5, concurrency=4)
+
+        ids = [json.loads(line)["id"] for line in path.read_text().splitlines()]
+        assert written == 20
+        assert ids == [f"pa_{n}" for n in range(1, 21)]
+
+    @pytest.mark.asyncio
+    async def test_transfers_resume_from_the_saved_cursor(self, tmp_path: Path, make_client: ClientFactory):
+        path = tmp_path / "transfers.ndjson"
+        cursors: list[Optional[str]] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            cursor = request.url.params.get("starting_after")
+            cursors.append(cursor)
+            first = 1 if cursor is None else int(cursor.rsplit("_", 1)[1]) + 1
+            if first == 5 and len(cursors) == 3:
+                return httpx.Response(500, json={"message": "Internal error"})
+            body = {
+                "data": [{"id": f"tr_{n}", "tracking_paymaster": {"step": "on_hold"}} for n in range(first, first + 2)],
+                "pagination": {"has_more": first < 5, "next_page": None, "prev_page": None},
+            }
+            return httpx.Response(200, json=body)
+
+        async with make_client(handler, retry=RetryPolicy(max_retries=0)) as blindpay:
+            with pytest.raises(BlindPayApiError):
+                await blindpay.transfers.export_to_file(path, chunk_size=10, concurrency=1)
+            written = await blindpay.transfers.export_to_file(path, chunk_size=10, concurrency=1)
+
+        rows = [json.loads(line) for line in path.read_text().splitlines()]
+        assert written == 6
+        assert [row["id"] for row in rows] == [f"tr_{n}" for n in range(1, 7)]
+        assert rows[0]["tracking_paymaster_step"] == "on_hold"
+        assert cursors == [None, "tr_2", "tr_4", "tr_4"]
+
+    def test_cursor_export_needs_an_accepted_page_size(self, tmp_path: Path, make_client: ClientFactory):
+        with make_client.sync(export_handler(1, [])) as blindpay:
+            with pytest.raises(BlindPayError):
+                blindpay.transfers.export_to_file(tmp_path / "transfers.ndjson", chunk_size=3)
@@ -0,0 +1,143 @@
+import asyncio
+import gc
+from typing import Any, AsyncIterator
+
+import httpx
+import pytest
+
+from blindpay import BlindPayApiError, BlindPayError
+from tests.conftest import ClientFactory
+
+PREFIX = "/v1/instances/in_000000000000/customers/"
+
+
+def respond(request: httpx.Request) -> httpx.Response:
+    customer_id, *rest = request.url.path.removeprefix(PREFIX).split("/")
+    if customer_id == "cu_broken":
+        return httpx.Response(403, json={"message": "Forbidden"})
+    if rest == ["bank-accounts"]:
+        return httpx.Response(200, json=[{"id": f"ba_{customer_id}_{n}"} for n in range(2)])
+    if len(rest) == 3 and rest[0] == "bank-accounts" and rest[2] == "offramp-wallets":
+        return httpx.Response(200, json=[{"id": f"ow_{rest[1]}", "bank_account_id": rest[1]}])
+    if rest == ["virtual-accounts"]:
+        return httpx.Response(200, json={"data": [{"id": f"va_{customer_id}"}]})
+    return httpx.Response(200, json=[{"id": f"{rest[0]}_{customer_id}"}])
+
+
+class TestCustomerFanOut:
+    @pytest.mark.asyncio
+    async def test_streams_every_resource_per_customer_in_order(self, make_client: ClientFactory):
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(0.001)
+            return respond(request)
+
+        async with make_client(handler) as blindpay:
+            results = [
+                result
+                async for result in blindpay.list_customer_resources(
+                    [{"id": "cu_1"}, "cu_2"], ["virtual_accounts", "offramp_wallets", "blockchain_wallets"]
+                )
+            ]
+
+        assert results == [
+            ("cu_1", "virtual_accounts", [{"id": "va_cu_1"}]),
+            (
+                "cu_1",
+                "offramp_wallets",
+                [
+                    {"id": "ow_ba_cu_1_0", "bank_account_id": "ba_cu_1_0"},
+                    {"id": "ow_ba_cu_1_1", "bank_account_id": "ba_cu_1_1"},
+                ],
+            ),
+            ("cu_1", "blockchain_wallets", [{"id": "blockchain-wallets_cu_1"}]),
+            ("cu_2", "virtual_accounts", [{"id": "va_cu_2"}]),
+            (
+                "cu_2",
+                "offramp_wallets",
+                [
+                    {"id": "ow_ba_cu_2_0", "bank_account_id": "ba_cu_2_0"},
+                    {"id": "ow_ba_cu_2_1", "bank_account_id": "ba_cu_2_1"},
+                ],
+            ),
+            ("cu_2", "blockchain_wallets", [{"id": "blockchain-wallets_cu_2"}]),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_customers_are_read_only_as_slots_free_up(self, make_client: ClientFactory):
+        read: list[str] = []
+        customers_in_flight: set[str] = set()
+        peak = 0
+
+        async def customers() -> AsyncIterator[str]:
+            for n in range(20):
+                read.append(f"cu_{n}")
+                yield f"cu_{n}"
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal peak
+            customer_id = request.url.path.removeprefix(PREFIX).split("/")[0]
+            customers_in_flight.add(customer_id)
+            peak = max(peak, len(customers_in_flight))
+            await asyncio.sleep(0.005)
+            customers_in_flight.discard(customer_id)
+            return respond(request)
+
+        async with make_client(handler) as blindpay:
+            stream = blindpay.list_customer_resources(customers(), ["custodial_wallets"], concurrency=3)
+            first = await anext(stream)
+            assert first == ("cu_0", "custodial_wallets", [{"id": "wallets_cu_0"}])
+            assert len(read) <= 4
+            rest = [result async for result in stream]
+
+        assert len(rest) == 19
+        assert peak <= 3
+
+    @pytest.mark.asyncio
+    async def test_failed_list_raises(self, make_client: ClientFactory):
+        async with make_client(respond) as blindpay:
+            with pytest.raises(BlindPayApiError) as exc_info:
+                async for _ in blindpay.list_customer_resources(["cu_1", "cu_broken"], ["bank_accounts"]):
+                    pass
+
+            with pytest.raises(BlindPayError):
+                async for _ in blindpay.list_customer_resources(["cu_1"], ["payouts"]):  # type: ignore[list-item]
+                    pass
+
+        assert exc_info.value.error["status"] == 403
+
+    @pytest.mark.asyncio
+    async def test_stopping_early_settles_the_lists_in_flight(self, make_client: ClientFactory):
+        unhandled: list[dict[str, Any]] = []
+        loop = asyncio.get_running_loop()
+        loop.set_exception_handler(lambda _, context: unhandled.append(context))
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if not request.url.path.startswith(f"{PREFIX}cu_1/"):
+                await asyncio.sleep(0.05)
+            return respond(request)
+
+        async with make_client(handler) as blindpay:
+            stream = blindpay.list_customer_resources(["cu_1", "cu_broken", "cu_2"], ["bank_accounts"])
+            assert await anext(stream) == ("cu_1", "bank_accounts", [{"id": "ba_cu_1_0"}, {"id": "ba_cu_1_1"}])
+            await stream.aclose()  # type: ignore[attr-defined]
+
+            assert asyncio.all_tasks() == {asyncio.current_task()}
+
+        await asyncio.sleep(0.1)
+        gc.collect()
+        loop.set_exception_handler(None)
+        assert unhandled == []
+
+    def test_sync_fan_out(self, make_client: ClientFactory):
+        with make_client.sync(respond) as blindpay:
+            results = list(blindpay.list_customer_resources([f"cu_{n}" for n in range(5)], concurrency=2))
+
+        assert [(customer_id, resource) for customer_id, resource, _ in results[:5]] == [
+            ("cu_0", "bank_accounts"),
+            ("cu_0", "blockchain_wallets"),
+            ("cu_0", "offramp_wallets"),
+            ("cu_0", "custodial_wallets"),
+            ("cu_0", "virtual_accounts"),
+        ]
+        assert len(results) == 25
+        assert results[-1] == ("cu_4", "virtual_accounts", [{"id": "va_cu_4"}])
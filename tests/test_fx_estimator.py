@@ -0,0 +1,59 @@
+from typing import Any
+
+import pytest
+
+from blindpay import BlindPayError, FxEstimator
+from blindpay._internal import fx_estimator
+
+# 10.00 USD at 4.85 BRL, less a 0.50 USD flat fee and 1%.
+SENDER_RATE = {
+    "commercial_quotation": 495,
+    "blindpay_quotation": 485,
+    "result_amount": (1000 * 0.99 - 50) * 4.85,
+    "instance_flat_fee": 50,
+    "instance_percentage_fee": 100,
+}
+SENDER_INPUT = {"currency_type": "sender", "from_currency": "USD", "to": "BRL", "request_amount": 1000}
+
+
+class TestFxEstimator:
+    def test_matches_the_rate_it_was_built_from(self):
+        estimator = FxEstimator(SENDER_RATE, SENDER_INPUT)
+
+        assert estimator.estimate(1000) == pytest.approx(SENDER_RATE["result_amount"])
+        assert estimator.estimate(5000) == pytest.approx((5000 * 0.99 - 50) * 4.85)
+
+    def test_receiver_amounts_are_inverted(self):
+        rate = {**SENDER_RATE, "result_amount": (4850 / 4.85 + 50) / 0.99}
+        estimator = FxEstimator(rate, {**SENDER_INPUT, "currency_type": "receiver", "request_amount": 4850})
+
+        assert estimator.estimate(9700) == pytest.approx((9700 / 4.85 + 50) / 0.99)
+
+    def test_calibrates_to_the_observed_result(self):
+        estimator = FxEstimator({**SENDER_RATE, "result_amount": SENDER_RATE["result_amount"] * 1.01}, SENDER_INPUT)
+
+        assert estimator.estimate(1000) == pytest.approx(SENDER_RATE["result_amount"] * 1.01)
+        assert estimator.estimate(2000) == pytest.approx((2000 * 0.99 - 50) * 4.85 * 1.01)
+
+    def test_estimate_many_without_numpy(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(fx_estimator, "_numpy", lambda: None)
+        estimator = FxEstimator(SENDER_RATE, SENDER_INPUT)
+
+        amounts = [1000, 2500, 10000]
+        assert estimator.estimate_many(amounts) == [estimator.estimate(amount) for amount in amounts]
+        assert estimator.estimate_many(iter(amounts)) == estimator.estimate_many(amounts)
+
+    def test_estimate_many_with_numpy(self):
+        np: Any = pytest.importorskip("numpy")
+        estimator = FxEstimator(SENDER_RATE, SENDER_INPUT)
+        amounts = np.arange(1000, 11000, 1000)
+
+        estimates = estimator.estimate_many(amounts)
+
+        assert isinstance(estimates, np.ndarray)
+        assert estimates.tolist() == pytest.approx([estimator.estimate(amount) for amount in amounts.tolist()])
+        assert estimator.estimate_many(amounts.tolist()) == pytest.approx(estimates.tolist())
+
+    def test_rate_without_quotation(self):
+        with pytest.raises(BlindPayError):
+            FxEstimator({**SENDER_RATE, "blindpay_quotation": None}, SENDER_INPUT)
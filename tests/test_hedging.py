@@ -0,0 +1,169 @@
+import asyncio
+
+import httpx
+import pytest
+
+from blindpay import (
+    AdaptiveConcurrencyLimiter,
+    BlindPay,
+    BlindPayError,
+    CircuitBreaker,
+    HedgePolicy,
+    RateLimit,
+    RateLimiter,
+)
+from tests.conftest import FakeClock
+
+TRACK_PATH = "/e/payouts/pa_000000000000"
+
+
+def slow_first_handler(calls: list[str], delay: float = 0.5):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        attempt = len(calls)
+        if attempt == 1:
+            await asyncio.sleep(delay)
+        return httpx.Response(200, json={"id": "pa_000000000000", "attempt": attempt})
+
+    return handler
+
+
+class TestHedgePolicy:
+    def test_delay_uses_percentile_of_recent_latencies(self):
+        policy = HedgePolicy(percentile=90, initial_delay=0.5, min_samples=10)
+
+        assert policy.delay(TRACK_PATH) == 0.5
+
+        for latency in range(1, 11):
+            policy.record_latency(f"/e/payouts/pa_00000000000{latency % 10}", latency / 100)
+
+        assert policy.delay(TRACK_PATH) == pytest.approx(0.09)
+
+    def test_budget_caps_extra_requests(self):
+        policy = HedgePolicy(budget_ratio=0.5, max_budget=1)
+
+        assert not policy.try_spend()
+        for _ in range(10):
+            policy.record_request()
+        assert policy.try_spend()
+        assert not policy.try_spend()
+        assert policy.hedges_sent == 1
+
+    def test_applies_to_configured_endpoints_only(self):
+        policy = HedgePolicy()
+
+        assert policy.applies_to(TRACK_PATH)
+        assert policy.applies_to("/instances/in_000000000000/customers/re_000000000000")
+        assert not policy.applies_to("/instances/in_000000000000/payouts")
+        assert HedgePolicy(endpoints=None).applies_to("/instances/in_000000000000/payouts")
+
+    def test_rejects_invalid_percentile(self):
+        with pytest.raises(BlindPayError):
+            HedgePolicy(percentile=100)
+
+
+class TestClientHedging:
+    @pytest.mark.asyncio
+    async def test_slow_get_is_hedged_and_fastest_answer_wins(self):
+        calls: list[str] = []
+        policy = HedgePolicy(initial_delay=0.01, budget_ratio=1)
+
+        async with BlindPay(
+            api_key="test-key",
+            instance_id="in_000000000000",
+            transport=httpx.MockTransport(slow_first_handler(calls)),
+            hedging=policy,
+        ) as blindpay:
+            response = await blindpay.payouts.get_track("pa_000000000000")
+
+        assert response["data"] is not None
+        assert dict(response["data"])["attempt"] == 2
+        assert calls == ["/v1" + TRACK_PATH] * 2
+        assert policy.hedges_sent == 1
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_budget(self):
+        calls: list[str] = []
+
+        async with BlindPay(
+            api_key="test-key",
+            instance_id="in_000000000000",
+            transport=httpx.MockTransport(slow_first_handler(calls, delay=0.05)),
+            hedging=HedgePolicy(initial_delay=0.01, budget_ratio=0.01),
+        ) as blindpay:
+            response = await blindpay.payouts.get_track("pa_000000000000")
+
+        assert response["error"] is None
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_endpoints_outside_the_policy_are_not_hedged(self):
+        calls: list[str] = []
+
+        async with BlindPay(
+            api_key="test-key",
+            instance_id="in_000000000000",
+            transport=httpx.MockTransport(slow_first_handler(calls, delay=0.05)),
+            hedging=HedgePolicy(initial_delay=0.01, budget_ratio=1),
+        ) as blindpay:
+            await blindpay.payouts.get("pa_000000000000")
+
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_the_cancelled_attempt_does_not_feed_the_concurrency_limiter(self):
+        calls: list[str] = []
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, latency_tolerance=100)
+
+        async with BlindPay(
+            api_key="test-key",
+            instance_id="in_000000000000",
+            transport=httpx.MockTransport(slow_first_handler(calls)),
+            hedging=HedgePolicy(initial_delay=0.01, budget_ratio=1),
+            concurrency_limiter=limiter,
+        ) as blindpay:
+            await blindpay.payouts.get_track("pa_000000000000")
+
+        assert len(calls) == 2
+        assert limiter.in_flight == 0
+        assert limiter._limit == pytest.approx(4.25)
+
+    @pytest.mark.asyncio
+    async def test_a_half_open_circuit_lets_no_hedge_through_past_its_probes(self):
+        calls: list[str] = []
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0, half_open_max_calls=1)
+        breaker.allow(TRACK_PATH)
+        breaker.record(TRACK_PATH, False)
+
+        async with BlindPay(
+            api_key="test-key",
+            instance_id="in_000000000000",
+            transport=httpx.MockTransport(slow_first_handler(calls, delay=0.05)),
+            hedging=HedgePolicy(initial_delay=0.01, budget_ratio=1),
+            circuit_breaker=breaker,
+        ) as blindpay:
+            response = await blindpay.payouts.get_track("pa_000000000000")
+
+        assert response["error"] is None
+        assert len(calls) == 1
+        assert breaker.state(TRACK_PATH) == "closed"
+
+    @pytest.mark.asyncio
+    async def test_a_hedge_takes_a_rate_limit_token_and_is_skipped_without_one(self):
+        clock = FakeClock()
+        for burst, expected_calls in ((2, 2), (1, 1)):
+            calls: list[str] = []
+            limiter = RateLimiter(default=RateLimit(rate=1, burst=burst), clock=clock)
+
+            async with BlindPay(
+                api_key="test-key",
+                instance_id="in_000000000000",
+                transport=httpx.MockTransport(slow_first_handler(calls, delay=0.05)),
+                hedging=HedgePolicy(initial_delay=0.01, budget_ratio=1),
+                rate_limiter=limiter,
+            ) as blindpay:
+                response = await blindpay.payouts.get_track("pa_000000000000")
+
+            assert response["error"] is None
+            assert len(calls) == expected_calls
+            assert limiter.remaining() == 0
@@ -0,0 +1,86 @@
+import httpx
+import pytest
+
+from blindpay import BlindPayError, HttpCache
+from tests.conftest import ClientFactory
+
+CUSTOMER_PATH = "/v1/instances/in_000000000000/customers/cu_000000000001"
+FEES_PATH = "/v1/instances/in_000000000000/billing/fees"
+
+
+class Server:
+    """Answers with an ETag per path, and 304 when the client already has the current version"""
+
+    def __init__(self) -> None:
+        self.version = 1
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.url.path == FEES_PATH:
+            return httpx.Response(200, json={"id": "fe_000000000000"}, headers={"Cache-Control": "no-store"})
+        if request.url.path.endswith("cu_missing"):
+            return httpx.Response(404, json={"message": "Not found"}, headers={"ETag": '"missing"'})
+        etag = f'"v{self.version}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(
+            200,
+            json={"id": "cu_000000000001", "version": self.version},
+            headers={"ETag": etag, "Last-Modified": "Wed, 21 Oct 2026 07:28:00 GMT"},
+        )
+
+
+class TestHttpCache:
+    @pytest.mark.asyncio
+    async def test_not_modified_serves_the_cached_body(self, make_client: ClientFactory):
+        server = Server()
+        cache = HttpCache()
+
+        async with make_client(server, http_cache=cache) as blindpay:
+            first = await blindpay.customers.get("cu_000000000001")
+            second = await blindpay.customers.get("cu_000000000001")
+            assert first["data"] is not None and second["data"] is not None
+            second["data"]["id"] = "mutated"
+            server.version = 2
+            third = await blindpay.customers.get("cu_000000000001")
+
+        assert "If-None-Match" not in server.requests[0].headers
+        assert server.requests[1].headers["If-None-Match"] == '"v1"'
+        assert server.requests[1].headers["If-Modified-Since"] == "Wed, 21 Oct 2026 07:28:00 GMT"
+        assert second["data"]["version"] == 1
+        assert third["data"] == {"id": "cu_000000000001", "version": 2}
+        assert cache.stats() == {"hits": 1, "misses": 2, "size": 1}
+
+    @pytest.mark.asyncio
+    async def test_uncacheable_responses_are_not_stored(self, make_client: ClientFactory):
+        server = Server()
+        cache = HttpCache(exclude={"/instances/{id}/customers/{id}"})
+
+        async with make_client(server, http_cache=cache) as blindpay:
+            await blindpay.fees.get()
+            await blindpay.fees.get()
+            await blindpay.customers.get("cu_000000000001")
+            await blindpay.customers.get("cu_000000000001")
+            missing = await blindpay.customers.get("cu_missing")
+
+        assert all("If-None-Match" not in request.headers for request in server.requests)
+        assert missing["error"] is not None and missing["error"]["status"] == 404
+        assert cache.stats()["size"] == 0
+
+    def test_sync_client_and_eviction(self, make_client: ClientFactory):
+        server = Server()
+        cache = HttpCache(max_size=1)
+
+        with make_client.sync(server, http_cache=cache) as blindpay:
+            blindpay.customers.get("cu_000000000001")
+            cached = blindpay.customers.get("cu_000000000001")
+            blindpay.customers.get("cu_000000000001?expand=owners")
+            blindpay.customers.get("cu_000000000001")
+
+        assert cached["data"] == {"id": "cu_000000000001", "version": 1}
+        assert [request.headers.get("If-None-Match") for request in server.requests] == [None, '"v1"', None, None]
+        assert cache.stats() == {"hits": 1, "misses": 3, "size": 1}
+
+        with pytest.raises(BlindPayError):
+            HttpCache(max_size=0)
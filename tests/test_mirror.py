@@ -0,0 +1,154 @@
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+
+from blindpay import BlindPayApiError, LocalMirror, RetryPolicy
+from tests.conftest import ClientFactory
+
+
+class FakeApi:
+    """Serves payouts newest first, two per page, like the cursor paginated list endpoint"""
+
+    def __init__(self, count: int) -> None:
+        self.payouts = [self.payout(n, "completed") for n in range(count, 0, -1)]
+        self.requests: list[dict[str, str]] = []
+        self.fail = False
+
+    @staticmethod
+    def payout(n: int, status: str) -> dict[str, Any]:
+        return {
+            "id": f"pa_{n:03}",
+            "customer_id": f"cu_{n % 2}",
+            "status": status,
+            "created_at": f"2025-01-01T00:00:{n:02}Z",
+            "updated_at": f"2025-01-01T00:00:{n:02}Z",
+        }
+
+    def update(self, n: int, status: str) -> None:
+        payout = next(p for p in self.payouts if p["id"] == f"pa_{n:03}")
+        payout["status"] = status
+        payout["updated_at"] = "2025-02-01T00:00:00Z"
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        params = dict(request.url.params)
+        if not request.url.path.endswith("/payouts"):
+            return httpx.Response(200, json=[])
+        self.requests.append(params)
+        if self.fail and "starting_after" in params:
+            return httpx.Response(500, json={"message": "Internal error"})
+        ids = [p["id"] for p in self.payouts]
+        start = ids.index(params["starting_after"]) + 1 if "starting_after" in params else 0
+        body = {
+            "data": self.payouts[start : start + 2],
+            "pagination": {"has_more": start + 2 < len(ids), "next_page": None, "prev_page": None},
+        }
+        return httpx.Response(200, json=body)
+
+
+class TestLocalMirror:
+    def test_first_sync_mirrors_everything_and_serves_lookups(self, tmp_path: Path, make_client: ClientFactory):
+        api = FakeApi(5)
+
+        with (
+            make_client.sync(api.handler) as blindpay,
+            LocalMirror(tmp_path / "mirror.db") as mirror,
+        ):
+            changed = blindpay.sync_mirror(mirror, ["payouts", "customers"])
+
+            assert changed == {"payouts": 5, "customers": 0}
+            assert len(api.requests) == 3
+            assert mirror.get("payouts", "pa_003") == api.payouts[2]
+            assert mirror.get("payouts", "pa_999") is None
+            assert [p["id"] for p in mirror.by_customer("payouts", "cu_1")] == ["pa_005", "pa_003", "pa_001"]
+            assert len(mirror.by_status("payouts", "completed")) == 5
+            assert mirror.synced_at("payouts") is not None
+
+        with LocalMirror(tmp_path / "mirror.db") as reopened:
+            assert reopened.count("payouts") == 5
+
+    def test_incremental_sync_stops_once_nothing_is_new(self, make_client: ClientFactory):
+        api = FakeApi(10)
+
+        with make_client.sync(api.handler) as blindpay, LocalMirror() as mirror:
+            blindpay.sync_mirror(mirror, ["payouts"])
+            api.payouts.insert(0, FakeApi.payout(11, "processing"))
+            api.requests.clear()
+
+            assert blindpay.sync_mirror(mirror, ["payouts"]) == {"payouts": 1}
+            # The page with the new payout, then one unchanged page.
+            assert len(api.requests) == 2
+            assert mirror.get("payouts", "pa_011") is not None
+
+    def test_records_updated_since_the_last_sync_keep_the_walk_going(self, make_client: ClientFactory):
+        api = FakeApi(10)
+
+        with make_client.sync(api.handler) as blindpay, LocalMirror() as mirror:
+            blindpay.sync_mirror(mirror, ["payouts"])
+            api.update(9, "refunded")
+            api.requests.clear()
+
+            assert blindpay.sync_mirror(mirror, ["payouts"]) == {"payouts": 1}
+            assert len(api.requests) == 2
+            assert [p["id"] for p in mirror.by_status("payouts", "refunded")] == ["pa_009"]
+
+            api.requests.clear()
+            assert blindpay.sync_mirror(mirror, ["payouts"]) == {"payouts": 0}
+            assert len(api.requests) == 1
+
+    def test_changes_to_old_records_need_a_full_sync(self, make_client: ClientFactory):
+        api = FakeApi(10)
+
+        with make_client.sync(api.handler) as blindpay, LocalMirror() as mirror:
+            blindpay.sync_mirror(mirror, ["payouts"])
+            api.update(3, "refunded")
+            api.requests.clear()
+
+            assert blindpay.sync_mirror(mirror, ["payouts"]) == {"payouts": 0}
+            assert len(api.requests) == 1
+            assert mirror.by_status("payouts", "refunded") == []
+
+            assert blindpay.sync_mirror(mirror, ["payouts"], full=True) == {"payouts": 1}
+            assert [p["id"] for p in mirror.by_status("payouts", "refunded")] == ["pa_003"]
+
+    def test_failed_sync_leaves_the_mirror_untouched(self, make_client: ClientFactory):
+        api = FakeApi(6)
+
+        with make_client.sync(api.handler, retry=RetryPolicy(max_retries=0)) as blindpay, LocalMirror() as mirror:
+            api.fail = True
+            with pytest.raises(BlindPayApiError):
+                blindpay.sync_mirror(mirror, ["payouts"])
+
+            assert mirror.count("payouts") == 0
+            assert mirror.synced_at("payouts") is None
+
+    @pytest.mark.asyncio
+    async def test_async_sync_and_full_resync(self, make_client: ClientFactory):
+        api = FakeApi(4)
+
+        async with make_client(api.handler) as blindpay:
+            with LocalMirror() as mirror:
+                assert (await blindpay.sync_mirror(mirror, ["payouts"])) == {"payouts": 4}
+                api.requests.clear()
+
+                assert (await blindpay.sync_mirror(mirror, ["payouts"], full=True)) == {"payouts": 0}
+                assert len(api.requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_syncs_of_one_mirror_take_turns(self, make_client: ClientFactory):
+        api = FakeApi(6)
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(0.001)
+            return api.handler(request)
+
+        async with make_client(handler) as blindpay:
+            with LocalMirror() as mirror:
+                changed = await asyncio.gather(
+                    blindpay.sync_mirror(mirror, ["payouts"]), blindpay.sync_mirror(mirror, ["transfers"])
+                )
+
+                assert list(changed) == [{"payouts": 6}, {"transfers": 0}]
+                assert mirror.synced_at("payouts") is not None and mirror.synced_at("transfers") is not None
@@ -0,0 +1,226 @@
+import asyncio
+import threading
+from contextlib import aclosing, closing
+from typing import Any, Awaitable, Callable, Optional
+
+import httpx
+import pytest
+
+from blindpay import BlindPayApiError, BlindPayError
+from tests.conftest import ClientFactory
+
+PAGE_SIZE = 2
+
+
+def paged_handler(
+    prefix: str, pages: int, events: list[str], fail_on_page: Optional[int] = None
+) -> Callable[[httpx.Request], httpx.Response]:
+    """Serves `pages` pages of `PAGE_SIZE` items, recording every request as `fetch <page>`"""
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        cursor = request.url.params.get("starting_after")
+        page = 1 if cursor is None else int(cursor.rsplit("_", 1)[1]) // PAGE_SIZE + 1
+        events.append(f"fetch {page}")
+        if page == fail_on_page:
+            return httpx.Response(500, json={"message": "Internal error"})
+        first = (page - 1) * PAGE_SIZE + 1
+        body: dict[str, Any] = {
+            "data": [{"id": f"{prefix}_{n}"} for n in range(first, first + PAGE_SIZE)],
+            "pagination": {"has_more": page < pages, "next_page": None, "prev_page": None},
+        }
+        return httpx.Response(200, json=body)
+
+    return respond
+
+
+def async_handler(
+    prefix: str, pages: int, events: list[str], fail_on_page: Optional[int] = None
+) -> Callable[[httpx.Request], Awaitable[httpx.Response]]:
+    respond = paged_handler(prefix, pages, events, fail_on_page)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.001)
+        return respond(request)
+
+    return handler
+
+
+class TestAsyncPagination:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("resource", "prefix"),
+        [("payouts", "pa"), ("payins", "pi"), ("transfers", "tr"), ("customers", "cu")],
+    )
+    async def test_list_all_walks_every_page(self, resource: str, prefix: str, make_client: ClientFactory):
+        events: list[str] = []
+
+        async with make_client(async_handler(prefix, 3, events)) as blindpay:
+            ids = [item["id"] async for item in getattr(blindpay, resource).list_all(prefetch=1)]
+
+        assert ids == [f"{prefix}_{n}" for n in range(1, 7)]
+        assert events == ["fetch 1", "fetch 2", "fetch 3"]
+
+    @pytest.mark.asyncio
+    async def test_next_page_is_in_flight_while_the_current_one_is_processed(self, make_client: ClientFactory):
+        events: list[str] = []
+
+        async with make_client(async_handler("pa", 2, events)) as blindpay:
+            async for payout in blindpay.payouts.list_all(prefetch=1):
+                await asyncio.sleep(0.01)
+                events.append(f"processed {payout['id']}")
+
+        assert events.index("fetch 2") < events.index("processed pa_1")
+
+    @pytest.mark.asyncio
+    async def test_without_prefetch_pages_are_fetched_on_demand(self, make_client: ClientFactory):
+        events: list[str] = []
+
+        async with make_client(async_handler("pa", 2, events)) as blindpay:
+            async for payout in blindpay.payouts.list_all():
+                await asyncio.sleep(0.01)
+                events.append(f"processed {payout['id']}")
+
+        assert events.index("fetch 2") > events.index("processed pa_2")
+
+    @pytest.mark.asyncio
+    async def test_prefetch_depth_is_bounded(self, make_client: ClientFactory):
+        events: list[str] = []
+
+        async with make_client(async_handler("pa", 10, events)) as blindpay:
+            async with aclosing(blindpay.payouts.list_all(prefetch=2)) as payouts:
+                await anext(payouts)
+                await asyncio.sleep(0.05)
+
+                assert events == ["fetch 1", "fetch 2", "fetch 3"]
+
+    @pytest.mark.asyncio
+    async def test_prefetched_page_error_is_raised_in_order(self, make_client: ClientFactory):
+        events: list[str] = []
+        seen: list[str] = []
+
+        async with make_client(async_handler("pa", 3, events, fail_on_page=2)) as blindpay:
+            with pytest.raises(BlindPayApiError) as exc_info:
+                async for payout in blindpay.payouts.list_all(prefetch=2):
+                    seen.append(payout["id"])
+
+        assert seen == ["pa_1", "pa_2"]
+        assert exc_info.value.error["status"] == 500
+
+    @pytest.mark.asyncio
+    async def test_unpaginated_customer_list_is_a_single_page(self, make_client: ClientFactory):
+        def handler(_: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json=[{"id": "cu_1"}, {"id": "cu_2"}])
+
+        async with make_client(handler) as blindpay:
+            ids = [customer["id"] async for customer in blindpay.customers.list_all(prefetch=1)]
+
+        assert ids == ["cu_1", "cu_2"]
+
+
+class TestSyncPagination:
+    def test_list_all_prefetches_in_a_background_thread(self, make_client: ClientFactory):
+        events: list[str] = []
+        threads: set[str] = set()
+        respond = paged_handler("tr", 3, events)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            threads.add(threading.current_thread().name)
+            return respond(request)
+
+        with make_client.sync(handler) as blindpay:
+            ids = [transfer["id"] for transfer in blindpay.transfers.list_all(prefetch=1)]
+
+        assert ids == [f"tr_{n}" for n in range(1, 7)]
+        assert events == ["fetch 1", "fetch 2", "fetch 3"]
+        assert threads == {"blindpay-prefetch"}
+
+    def test_breaking_out_stops_prefetching(self, make_client: ClientFactory):
+        events: list[str] = []
+
+        with make_client.sync(paged_handler("pa", 10, events)) as blindpay:
+            with closing(blindpay.payouts.list_all(prefetch=1)) as payouts:
+                assert next(payouts)["id"] == "pa_1"
+
+        assert len(events) <= 3
+
+    def test_prefetched_page_error_is_raised(self, make_client: ClientFactory):
+        events: list[str] = []
+
+        with make_client.sync(paged_handler("pi", 3, events, fail_on_page=3)) as blindpay:
+            with pytest.raises(BlindPayApiError):
+                list(blindpay.payins.list_all(prefetch=1))
+
+
+def sharded_handler(per_shard: int, events: list[str]) -> Callable[[httpx.Request], httpx.Response]:
+    """Serves `per_shard` customers per status, `PAGE_SIZE` per page"""
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        status = request.url.params["status"]
+        cursor = request.url.params.get("starting_after")
+        start = 0 if cursor is None else int(cursor.rsplit("_", 1)[1]) + 1
+        events.append(f"fetch {status} {start}")
+        stop = min(start + PAGE_SIZE, per_shard)
+        body: dict[str, Any] = {
+            "data": [{"id": f"cu_{status}_{n}", "status": status} for n in range(start, stop)],
+            "pagination": {"has_more": stop < per_shard, "next_page": None, "prev_page": None},
+        }
+        return httpx.Response(200, json=body)
+
+    return respond
+
+
+class TestShardedListing:
+    @pytest.mark.asyncio
+    async def test_shards_are_walked_concurrently_and_merged(self, make_client: ClientFactory):
+        events: list[str] = []
+        respond = sharded_handler(3, events)
+        in_flight = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.005)
+            in_flight -= 1
+            return respond(request)
+
+        async with make_client(handler) as blindpay:
+            customers = [c async for c in blindpay.customers.list_all_sharded(concurrency=3)]
+
+        statuses = ["verifying", "approved", "rejected", "deprecated", "pending_review"]
+        assert sorted(c["id"] for c in customers) == sorted(f"cu_{s}_{n}" for s in statuses for n in range(3))
+        assert [c["id"] for c in customers if c["status"] == "approved"] == [f"cu_approved_{n}" for n in range(3)]
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_shard_values_and_shared_filters(self, make_client: ClientFactory):
+        seen: list[dict[str, str]] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(dict(request.url.params))
+            return httpx.Response(200, json=[])
+
+        async with make_client(handler) as blindpay:
+            customers = blindpay.customers.list_all_sharded("country", {"status": "approved"}, shards=["BR", "MX"])
+            assert [c async for c in customers] == []
+
+            with pytest.raises(BlindPayError):
+                async for _ in blindpay.customers.list_all_sharded("status", {"status": "approved"}):
+                    pass
+
+        assert sorted(params["country"] for params in seen) == ["BR", "MX"]
+        assert all(params["status"] == "approved" for params in seen)
+
+    def test_sync_sharded_listing_and_early_exit(self, make_client: ClientFactory):
+        events: list[str] = []
+
+        with make_client.sync(sharded_handler(4, events)) as blindpay:
+            customers = list(blindpay.customers.list_all_sharded(shards=["approved", "rejected"], concurrency=2))
+            assert len(customers) == 8
+
+            events.clear()
+            with closing(blindpay.customers.list_all_sharded(concurrency=2)) as stream:
+                next(stream)
+
+        assert len(events) <= 6
@@ -0,0 +1,48 @@
+import time
+
+import pytest
+
+from blindpay import BlindPayError, QuoteCache
+
+
+class TestQuoteCache:
+    def test_expired_quotes_are_evicted(self, monkeypatch: pytest.MonkeyPatch):
+        now = 1_700_000_000.0
+        monkeypatch.setattr(time, "time", lambda: now)
+        cache = QuoteCache(margin=5)
+        later = {"id": "qu_b", "expires_at": (now + 60) * 1000}
+        cache.put("a", {"id": "qu_a", "expires_at": now + 30})
+        cache.put("b", later)
+
+        now += 25
+        assert cache.get("a") is None
+        assert len(cache) == 1
+        assert cache.get("b") == later
+
+    def test_a_quote_is_handed_out_once(self):
+        quote = {"id": "qu_a", "expires_at": time.time() + 60}
+        cache = QuoteCache()
+        cache.put("a", quote)
+
+        assert cache.get("a") == quote
+        assert cache.get("a") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_size_is_bounded_and_quotes_can_be_discarded(self):
+        now = time.time()
+        cache = QuoteCache(max_size=2)
+        cache.put("late", {"id": "qu_late", "expires_at": now + 300})
+        cache.put("soon", {"id": "qu_soon", "expires_at": now + 60})
+        cache.put("new", {"id": "qu_new", "expires_at": now + 120})
+        cache.put("never", {"id": "qu_never"})
+
+        assert cache.get("soon") is None
+        assert cache.get("never") is None
+        assert len(cache) == 2
+
+        cache.discard("qu_late")
+        assert cache.get("late") is None
+        assert len(cache) == 1
+
+        with pytest.raises(BlindPayError):
+            QuoteCache(max_size=0)
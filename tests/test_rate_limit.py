@@ -0,0 +1,100 @@
+import asyncio
+
+import httpx
+import pytest
+
+from blindpay import BlindPay, BlindPayError, RateLimit, RateLimiter
+from blindpay._internal.endpoints import endpoint_family
+from blindpay._internal.rate_limit import TokenBucket
+from tests.conftest import FakeClock
+
+
+class TestEndpointFamily:
+    def test_strips_instance_and_tracking_prefixes(self):
+        assert endpoint_family("/instances/in_000000000000/payouts/evm") == "payouts"
+        assert endpoint_family("/e/payouts/pa_000000000000") == "payouts"
+        assert endpoint_family("/instances/in_000000000000/customers/cu_000000000000/bank-accounts") == "customers"
+        assert endpoint_family("/available/bank-details?rail=pix") == "available"
+        assert endpoint_family("/instances/in_000000000000") == "instances"
+
+
+class TestTokenBucket:
+    def test_burst_then_waits_for_refill(self):
+        clock = FakeClock()
+        bucket = TokenBucket(RateLimit(rate=2, burst=3), clock)
+
+        assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.reserve() == pytest.approx(0.5)
+        assert bucket.reserve() == pytest.approx(1.0)
+
+        clock.now = 10.0
+        assert bucket.remaining == 3
+
+    def test_rejects_non_positive_rate(self):
+        with pytest.raises(BlindPayError):
+            TokenBucket(RateLimit(rate=0))
+
+
+class TestRateLimiter:
+    def test_family_limits_apply_on_top_of_default(self):
+        clock = FakeClock()
+        limiter = RateLimiter(
+            default=RateLimit(rate=100),
+            families={"payouts": RateLimit(rate=1, burst=1)},
+            clock=clock,
+        )
+
+        assert limiter.reserve("/instances/in_000000000000/payouts/evm") == 0
+        assert limiter.reserve("/e/payouts/pa_000000000000") == pytest.approx(1.0)
+        assert limiter.reserve("/instances/in_000000000000/quotes") == 0
+
+        assert limiter.remaining() == pytest.approx(97)
+        assert limiter.remaining("payouts") == 0
+        assert limiter.remaining("quotes") == pytest.approx(97)
+
+    def test_try_reserve_takes_tokens_only_when_every_bucket_has_one(self):
+        clock = FakeClock()
+        limiter = RateLimiter(
+            default=RateLimit(rate=1, burst=2),
+            families={"payouts": RateLimit(rate=1, burst=1)},
+            clock=clock,
+        )
+
+        assert limiter.try_reserve("/e/payouts/pa_000000000000")
+        assert not limiter.try_reserve("/e/payouts/pa_000000000000")
+        # The payouts bucket was empty, so the default bucket got its token back.
+        assert limiter.remaining() == pytest.approx(1)
+        assert limiter.try_reserve("/instances/in_000000000000/quotes")
+        assert not limiter.try_reserve("/instances/in_000000000000/quotes")
+
+    def test_no_limits_never_waits(self):
+        limiter = RateLimiter()
+
+        assert limiter.reserve("/available/rails") == 0
+        assert limiter.remaining() == float("inf")
+
+
+class TestClientRateLimiting:
+    @pytest.mark.asyncio
+    async def test_limiter_is_shared_by_all_resources(self, monkeypatch):
+        delays = []
+
+        async def fake_sleep(delay):
+            delays.append(delay)
+
+        monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+        clock = FakeClock()
+        limiter = RateLimiter(default=RateLimit(rate=1, burst=2), clock=clock)
+
+        async with BlindPay(
+            api_key="test-key",
+            instance_id="in_000000000000",
+            transport=httpx.MockTransport(lambda _: httpx.Response(200, json=[])),
+            rate_limiter=limiter,
+        ) as blindpay:
+            await blindpay.payouts.get("pa_000000000000")
+            await blindpay.customers.bank_accounts.list("cu_000000000000")
+            await blindpay.wallets.blockchain.list("cu_000000000000")
+
+        assert delays == [pytest.approx(1.0)]
+        assert limiter.remaining() == 0
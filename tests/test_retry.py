@@ -0,0 +1,211 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from blindpay import BlindPay, BlindPaySync, RetryPolicy
+from blindpay._internal.retry import parse_retry_after
+
+NO_WAIT = RetryPolicy(max_retries=2, backoff_base=0)
+
+
+def flaky_handler(statuses, calls, headers=None):
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        status = statuses[min(len(calls), len(statuses)) - 1]
+        if status >= 400:
+            return httpx.Response(status, json={"message": f"status {status}"}, headers=headers)
+        return httpx.Response(status, json={"id": "pa_000000000000"})
+
+    return handler
+
+
+class TestRetryPolicy:
+    def test_backoff_is_full_jitter_within_cap(self):
+        policy = RetryPolicy(backoff_base=1.0, backoff_max=4.0)
+
+        for retry in range(6):
+            delay = policy.backoff(retry)
+            assert 0 <= delay <= min(4.0, 2**retry)
+
+    def test_get_is_retried_but_post_without_idempotency_key_is_not(self):
+        policy = RetryPolicy()
+        response = httpx.Response(503)
+
+        get = httpx.Request("GET", "https://api.blindpay.com/v1/payouts")
+        post = httpx.Request("POST", "https://api.blindpay.com/v1/payouts/evm")
+        keyed_post = httpx.Request(
+            "POST", "https://api.blindpay.com/v1/payouts/evm", headers={"Idempotency-Key": "key"}
+        )
+
+        assert policy.delay_for_response(get, response, 0) is not None
+        assert policy.delay_for_response(post, response, 0) is None
+        assert policy.delay_for_response(keyed_post, response, 0) is not None
+
+    def test_connect_errors_are_retried_for_any_method(self):
+        policy = RetryPolicy()
+        post = httpx.Request("POST", "https://api.blindpay.com/v1/payouts/evm")
+
+        assert policy.delay_for_exception(post, httpx.ConnectError("refused"), 0) is not None
+        assert policy.delay_for_exception(post, httpx.ReadTimeout("timed out"), 0) is None
+
+    def test_stops_after_max_retries_and_on_client_errors(self):
+        policy = RetryPolicy(max_retries=1)
+        get = httpx.Request("GET", "https://api.blindpay.com/v1/payouts")
+
+        assert policy.delay_for_response(get, httpx.Response(503), 1) is None
+        assert policy.delay_for_response(get, httpx.Response(422), 0) is None
+
+    def test_documented_error_codes_decide_over_the_status(self):
+        policy = RetryPolicy()
+        get = httpx.Request("GET", "https://api.blindpay.com/v1/payouts")
+
+        def error(status: int, code: str) -> httpx.Response:
+            return httpx.Response(status, json={"code": code, "message": code.lower()})
+
+        assert policy.delay_for_response(get, error(400, "BLOCKCHAIN_CALL_FAILED"), 0) is not None
+        assert policy.delay_for_response(get, error(503, "BANK_ACCOUNTS_PARTNER_NOT_SUPPORTED"), 0) is None
+        assert policy.delay_for_response(get, error(400, "NOT_A_DOCUMENTED_CODE"), 0) is None
+        assert policy.delay_for_response(get, error(503, "NOT_A_DOCUMENTED_CODE"), 0) is not None
+
+    def test_retry_after_takes_precedence_and_is_capped(self):
+        policy = RetryPolicy(max_retry_after=10)
+        get = httpx.Request("GET", "https://api.blindpay.com/v1/payouts")
+
+        assert policy.delay_for_response(get, httpx.Response(429, headers={"Retry-After": "3"}), 0) == 3
+        assert policy.delay_for_response(get, httpx.Response(429, headers={"Retry-After": "30"}), 0) is None
+
+    def test_parse_retry_after(self):
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("garbage") is None
+        assert parse_retry_after("2.5") == 2.5
+        assert parse_retry_after(format_datetime(datetime.now(timezone.utc) - timedelta(minutes=1))) == 0
+
+        in_a_minute = parse_retry_after(format_datetime(datetime.now(timezone.utc) + timedelta(minutes=1)))
+        assert in_a_minute is not None and 55 < in_a_minute <= 60
+
+
+class TestClientRetries:
+    @pytest.mark.asyncio
+    async def test_get_retries_until_success(self):
+        calls: list[httpx.Request] = []
+        async with BlindPay(
+            api_key="test-key",
+            instance_id="in_000000000000",
+            transport=httpx.MockTransport(flaky_handler([503, 502, 200], calls)),
+            retry=NO_WAIT,
+        ) as blindpay:
+            response = await blindpay.payouts.get("pa_000000000000")
+
+        assert response["error"] is None
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_post_without_idempotency_key_is_not_retried(self):
+        calls: list[httpx.Request] = []
+        async with BlindPay(
+            api_key="test-key",
+            instance_id="in_000000000000",
+            transport=httpx.MockTransport(flaky_handler([503, 200], calls)),
+            retry=NO_WAIT,
+        ) as blindpay:
+            response = await blindpay.payouts.authorize_stellar_token(
+                {"quote_id": "qu_000000000000", "sender_wallet_address": "G...ABC"}
+            )
+
+        assert response["error"] == {"message": "status 503", "status": 503, "is_retryable": False}
+        assert len(calls) == 1
+        assert "Idempotency-Key" not in calls[0].headers
+
+    @pytest.mark.asyncio
+    async def test_create_retries_reuse_one_generated_idempotency_key(self):
+        calls: list[httpx.Request] = []
+        async with BlindPay(
+            api_key="test-key",
+            instance_id="in_000000000000",
+            transport=httpx.MockTransport(flaky_handler([503, 200, 200], calls)),
+            retry=NO_WAIT,
+        ) as blindpay:
+            first = await blindpay.payouts.create_evm(
+                {"quote_id": "qu_000000000000", "sender_wallet_address": "0x123...890"}
+            )
+            second = await blindpay.payouts.create_evm(
+                {"quote_id": "qu_000000000001", "sender_wallet_address": "0x123...890"}
+            )
+
+        assert first["error"] is None
+        assert second["error"] is None
+        keys = [request.headers["Idempotency-Key"] for request in calls]
+        assert len(keys) == 3
+        assert keys[0] == keys[1]
+        assert keys[2] != keys[0]
+
+    @pytest.mark.asyncio
+    async def test_caller_supplied_idempotency_key_is_sent(self):
+        calls: list[httpx.Request] = []
+        async with BlindPay(
+            api_key="test-key",
+            instance_id="in_000000000000",
+            transport=httpx.MockTransport(flaky_handler([200], calls)),
+        ) as blindpay:
+            await blindpay.payins.create_evm("pq_000000000000", idempotency_key="order-42")
+
+        assert calls[0].headers["Idempotency-Key"] == "order-42"
+
+    @pytest.mark.asyncio
+    async def test_retry_after_is_honoured(self, monkeypatch):
+        delays = []
+
+        async def fake_sleep(delay):
+            delays.append(delay)
+
+        monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+        calls: list[httpx.Request] = []
+        async with BlindPay(
+            api_key="test-key",
+            instance_id="in_000000000000",
+            transport=httpx.MockTransport(flaky_handler([429, 200], calls, headers={"Retry-After": "7"})),
+        ) as blindpay:
+            response = await blindpay.payouts.get("pa_000000000000")
+
+        assert response["error"] is None
+        assert delays == [7.0]
+
+    @pytest.mark.asyncio
+    async def test_with_options_overrides_retry_and_shares_pool(self):
+        calls: list[httpx.Request] = []
+        async with BlindPay(
+            api_key="test-key",
+            instance_id="in_000000000000",
+            transport=httpx.MockTransport(flaky_handler([503, 200], calls)),
+            retry=NO_WAIT,
+        ) as blindpay:
+            no_retries = blindpay.with_options(retry=RetryPolicy(max_retries=0))
+            response = await no_retries.payouts.get("pa_000000000000")
+
+            assert no_retries._api.client is blindpay._api.client
+            assert blindpay._api.retry is NO_WAIT
+
+        assert response["error"] == {"message": "status 503", "status": 503, "is_retryable": True}
+        assert len(calls) == 1
+
+    def test_sync_client_retries_connect_errors(self, monkeypatch):
+        monkeypatch.setattr(time, "sleep", lambda _: None)
+        calls: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            if len(calls) == 1:
+                raise httpx.ConnectError("connection refused")
+            return httpx.Response(200, json={"id": "tr_000000000000"})
+
+        with BlindPaySync(
+            api_key="test-key", instance_id="in_000000000000", transport=httpx.MockTransport(handler)
+        ) as blindpay:
+            response = blindpay.transfers.create({"transfer_quote_id": "tq_000000000000"})
+
+        assert response["error"] is None
+        assert len(calls) == 2